@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Benchmark the JSON codecs on large label pages.
+
+Every codec decodes the listing pages and loads the data with labels from them,
+which is the work done for every page of :meth:`SegmentClient.list_data`,
+and encodes the label contents, which is the work done for uploading labels.
+
+Usage, with tensorbay installed or the repository root in ``PYTHONPATH``::
+
+    python benchmarks/json_codec.py --pages 20 --boxes 50
+
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from tensorbay.dataset import RemoteData
+from tensorbay.utility import get_json_codec, json_dumps, json_loads, set_json_codec
+
+_PAGE_SIZE = 128
+
+
+def _make_page(page_index: int, boxes: int) -> Dict[str, Any]:
+    labels = []
+    for index in range(_PAGE_SIZE):
+        box2d = []
+        for _ in range(boxes):
+            xmin, ymin = random.uniform(0, 1000), random.uniform(0, 1000)
+            box2d.append(
+                {
+                    "box2d": {
+                        "xmin": xmin,
+                        "ymin": ymin,
+                        "xmax": xmin + random.uniform(1, 100),
+                        "ymax": ymin + random.uniform(1, 100),
+                    },
+                    "category": random.choice(["car", "pedestrian", "cyclist"]),
+                    "attributes": {"occluded": random.random() < 0.5, "truncated": 0},
+                }
+            )
+        labels.append({"remotePath": f"{page_index:04}/{index:04}.jpg", "label": {"BOX2D": box2d}})
+    return {
+        "labels": labels,
+        "offset": page_index * _PAGE_SIZE,
+        "recordSize": _PAGE_SIZE,
+        "totalCount": 0,
+    }
+
+
+def _timeit(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run(documents: List[bytes], pages: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    def _decode() -> None:
+        for document in documents:
+            json_loads(document)
+
+    def _decode_and_load() -> None:
+        for document in documents:
+            for contents in json_loads(document)["labels"]:
+                RemoteData.loads(contents)
+
+    def _encode() -> None:
+        for page in pages:
+            json_dumps(page)
+
+    return {
+        "decode": _timeit(_decode, repeat),
+        "decodeAndLoad": _timeit(_decode_and_load, repeat),
+        "encode": _timeit(_encode, repeat),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the best time of every codec."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--pages", type=int, default=20, help="the number of the pages")
+    parser.add_argument("--boxes", type=int, default=50, help="the number of boxes in a label")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of the repeats")
+    parser.add_argument("--json", action="store_true", help="print the results in JSON")
+    args = parser.parse_args()
+
+    random.seed(0)
+    pages = [_make_page(index, args.boxes) for index in range(args.pages)]
+    documents = [json.dumps(page).encode("utf-8") for page in pages]
+    megabytes = sum(map(len, documents)) / 1024 ** 2
+
+    results = {}
+    for name in ("stdlib", "orjson", "ujson"):
+        try:
+            set_json_codec(name)
+        except ImportError:
+            continue
+        results[name] = _run(documents, pages, args.repeat)
+    set_json_codec()
+
+    if args.json:
+        print(json.dumps({"megabytes": megabytes, "codecs": results, "default": get_json_codec()}))
+        return
+
+    print(f"{args.pages} pages of {_PAGE_SIZE} labels, {megabytes:.1f} MiB in total")
+    print(f"{'codec':<8}{'decode':>12}{'decode+load':>14}{'encode':>12}{'speedup':>10}")
+    baseline = results["stdlib"]["decodeAndLoad"]
+    for name, result in results.items():
+        print(
+            f"{name:<8}{result['decode']:>11.3f}s{result['decodeAndLoad']:>13.3f}s"
+            f"{result['encode']:>11.3f}s{baseline / result['decodeAndLoad']:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
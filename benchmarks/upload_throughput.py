@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Benchmark the upload and the listing throughput against the fake Open API server.
+
+Every scenario generates a synthetic dataset in a temporary directory, uploads it by
+:meth:`GAS.upload_dataset` with every given ``jobs`` value and lists it back:
+
+- ``tiny``: one segment of many tiny files.
+- ``huge``: one segment of a few huge files, which are uploaded by multipart upload.
+- ``fusion``: one fusion segment of frames with several sensors.
+- ``mixed``: one segment of many tiny files with a few huge files at the end.
+
+Every run starts a new :class:`~tensorbay.client.fake.FakeServer`, and reports the files/s,
+the MB/s, the requests per file, the time to the first uploaded byte, the listing items/s,
+the time to the first listed item and the peak RSS of the process so far.
+The peak RSS includes the in-memory objects of the fake server.
+
+Usage, with tensorbay installed or the repository root in ``PYTHONPATH``::
+
+    python benchmarks/upload_throughput.py --jobs 1 8 auto --latency 0.005 --json
+
+Pass ``--order size`` to upload the largest files first.
+
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from typing_extensions import Literal
+
+from tensorbay.client import GAS
+from tensorbay.client.dataset import DatasetClient, FusionDatasetClient
+from tensorbay.client.fake import FakeServer
+from tensorbay.client.requests import default_config
+from tensorbay.dataset import Data, Dataset, Frame, FusionDataset, RemoteData
+from tensorbay.label import Classification
+from tensorbay.sensor import Camera
+
+# The resource module is unavailable on Windows.
+if sys.platform != "win32":
+    import resource
+
+_MEGABYTE = 1024 * 1024
+
+_Order = Literal["interleave", "sequential", "size"]
+
+
+class _TimingServer(FakeServer):  # pylint: disable=too-few-public-methods
+    """The fake server recording when the first object request is received.
+
+    Arguments:
+        latency: The seconds every Open API and object storage request takes.
+
+    """
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(latency=latency, object_latency=latency)
+        self.first_object_at: Optional[float] = None
+
+    def handle(self, method: str, path: str, headers: Any, body: bytes) -> Any:
+        """Record the time of the first object request and handle the request.
+
+        Arguments:
+            method: The method of the request.
+            path: The path of the request including the query.
+            headers: The headers of the request.
+            body: The decompressed body of the request.
+
+        Returns:
+            The status code, the headers and the content of the response.
+
+        """
+        if self.first_object_at is None and path.startswith("/objects/"):
+            self.first_object_at = time.perf_counter()
+        return super().handle(method, path, headers, body)
+
+
+def _get_peak_rss() -> Optional[float]:
+    if sys.platform == "win32":
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The peak RSS is in kilobytes on Linux and in bytes on macOS.
+    return peak / _MEGABYTE if sys.platform == "darwin" else peak / 1024
+
+
+def _write_file(path: str, size: int) -> None:
+    chunk = os.urandom(min(size, _MEGABYTE))
+    with open(path, "wb") as fp:
+        for offset in range(0, size, len(chunk)):
+            fp.write(chunk[: size - offset])
+
+
+def _make_segment_dataset(directory: str, count: int, size: int, *huge: int) -> Dataset:
+    dataset = Dataset("benchmark")
+    segment = dataset.create_segment("segment")
+    for index, file_size in enumerate([size] * count + list(huge)):
+        local_path = os.path.join(directory, f"{index:08}.bin")
+        _write_file(local_path, file_size)
+        data = Data(local_path)
+        data.label.classification = Classification(str(index % 10))
+        segment.append(data)
+    return dataset
+
+
+def _make_fusion_dataset(directory: str, frames: int, sensors: int, size: int) -> FusionDataset:
+    dataset = FusionDataset("benchmark")
+    segment = dataset.create_segment("segment")
+    sensor_names = [f"camera{index:02}" for index in range(sensors)]
+    for name in sensor_names:
+        camera = Camera(name)
+        camera.set_camera_matrix(fx=1, fy=1, cx=1, cy=1)
+        segment.sensors.add(camera)
+
+    for frame_index in range(frames):
+        frame = Frame()
+        for name in sensor_names:
+            local_path = os.path.join(directory, f"{frame_index:08}_{name}.bin")
+            _write_file(local_path, size)
+            frame[name] = Data(local_path, target_remote_path=f"{name}/{frame_index:08}.bin")
+        segment.append(frame)
+    return dataset
+
+
+def _time_first(iterator: Iterator[Any]) -> Dict[str, float]:
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in iterator:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "listedItems": count,
+        "listingSeconds": elapsed,
+        "itemsPerSecond": count / elapsed if elapsed else 0,
+        "timeToFirstItem": first if first is not None else elapsed,
+    }
+
+
+def _upload(
+    server: _TimingServer,
+    dataset: Union[Dataset, FusionDataset],
+    jobs: Union[int, str],
+    order: _Order,
+) -> Tuple[Union[DatasetClient, FusionDatasetClient], Dict[str, float]]:
+    gas = GAS("Accesskey-benchmark", server.url)
+    gas.create_dataset(dataset.name, is_fusion=isinstance(dataset, FusionDataset))
+
+    start = time.perf_counter()
+    dataset_client = gas.upload_dataset(dataset, jobs=jobs, order=order)
+    elapsed = time.perf_counter() - start
+    return dataset_client, {
+        "uploadSeconds": elapsed,
+        "timeToFirstByte": (server.first_object_at or start) - start,
+        "requests": sum(server.request_counts.values()),
+    }
+
+
+def _list(
+    dataset_client: Union[DatasetClient, FusionDatasetClient], jobs: Union[int, str]
+) -> Dict[str, float]:
+    dataset_client.commit("benchmark")
+    listing_jobs = jobs if isinstance(jobs, int) else 4
+    if isinstance(dataset_client, FusionDatasetClient):
+        return _time_first(dataset_client.get_segment("segment").list_frames(jobs=listing_jobs))
+    return _time_first(dataset_client.get_segment("segment").list_data(jobs=listing_jobs))
+
+
+def _run(
+    dataset: Union[Dataset, FusionDataset], jobs: Union[int, str], latency: float, order: _Order
+) -> Dict[str, Any]:
+    files = [data for segment in dataset for item in segment for data in _iter_data(item)]
+    total_bytes = sum(os.path.getsize(data.path) for data in files)
+
+    with _TimingServer(latency) as server:
+        dataset_client, upload = _upload(server, dataset, jobs, order)
+        listing = _list(dataset_client, jobs)
+
+    elapsed = upload["uploadSeconds"]
+    return {
+        "jobs": jobs,
+        "files": len(files),
+        "megabytes": total_bytes / _MEGABYTE,
+        "uploadSeconds": elapsed,
+        "filesPerSecond": len(files) / elapsed,
+        "megabytesPerSecond": total_bytes / _MEGABYTE / elapsed,
+        "requestsPerFile": upload["requests"] / len(files),
+        "timeToFirstByte": upload["timeToFirstByte"],
+        **listing,
+        "peakRSS": _get_peak_rss(),
+    }
+
+
+def _iter_data(item: Union[Data, RemoteData, Frame]) -> Iterator[Union[Data, RemoteData]]:
+    if isinstance(item, Frame):
+        yield from item.values()  # pylint: disable=no-member
+    else:
+        yield item
+
+
+def _parse_jobs(value: str) -> Union[int, str]:
+    return value if value == "auto" else int(value)
+
+
+def main() -> None:
+    """Run the benchmark and print the results of every scenario and jobs."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=("tiny", "huge", "fusion", "mixed"),
+        default=["tiny", "huge", "fusion"],
+        help="the scenarios to run",
+    )
+    parser.add_argument(
+        "--jobs", nargs="+", type=_parse_jobs, default=[1, 4, 16], help="the jobs values"
+    )
+    parser.add_argument("--latency", type=float, default=0.002, help="the seconds of a request")
+    parser.add_argument(
+        "--order",
+        choices=("interleave", "sequential", "size"),
+        default="interleave",
+        help="the order of uploading the files",
+    )
+    parser.add_argument("--tiny-files", type=int, default=1000, help="the number of tiny files")
+    parser.add_argument("--tiny-size", type=int, default=1024, help="the bytes of a tiny file")
+    parser.add_argument("--huge-files", type=int, default=4, help="the number of huge files")
+    parser.add_argument("--huge-size", type=int, default=32, help="the MiB of a huge file")
+    parser.add_argument("--frames", type=int, default=100, help="the number of fusion frames")
+    parser.add_argument("--sensors", type=int, default=12, help="the sensors of a fusion frame")
+    parser.add_argument("--sensor-size", type=int, default=16384, help="the bytes of a sensor file")
+    parser.add_argument("--json", action="store_true", help="print the results in JSON")
+    args = parser.parse_args()
+
+    # The huge files are uploaded by multipart upload, as the large files are in production.
+    default_config.multipart_threshold = args.huge_size * _MEGABYTE // 2
+    default_config.part_size = args.huge_size * _MEGABYTE // 4
+
+    makers: Dict[str, Callable[[str], Union[Dataset, FusionDataset]]] = {
+        "tiny": lambda directory: _make_segment_dataset(directory, args.tiny_files, args.tiny_size),
+        "huge": lambda directory: _make_segment_dataset(
+            directory, args.huge_files, args.huge_size * _MEGABYTE
+        ),
+        "fusion": lambda directory: _make_fusion_dataset(
+            directory, args.frames, args.sensors, args.sensor_size
+        ),
+        "mixed": lambda directory: _make_segment_dataset(
+            directory,
+            args.tiny_files,
+            args.tiny_size,
+            *[args.huge_size * _MEGABYTE] * args.huge_files,
+        ),
+    }
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for scenario in args.scenarios:
+        with tempfile.TemporaryDirectory() as directory:
+            dataset = makers[scenario](directory)
+            results[scenario] = [
+                _run(dataset, jobs, args.latency, args.order) for jobs in args.jobs
+            ]
+
+    if args.json:
+        print(json.dumps({"latency": args.latency, "order": args.order, "scenarios": results}))
+        return
+
+    print(
+        f"{'scenario':<9}{'jobs':>6}{'files/s':>10}{'MB/s':>9}{'req/file':>10}"
+        f"{'TTFB':>9}{'items/s':>10}{'TTFI':>9}{'RSS MB':>9}"
+    )
+    for scenario, runs in results.items():
+        for run in runs:
+            rss = f"{run['peakRSS']:>9.0f}" if run["peakRSS"] is not None else f"{'-':>9}"
+            print(
+                f"{scenario:<9}{run['jobs']!s:>6}{run['filesPerSecond']:>10.1f}"
+                f"{run['megabytesPerSecond']:>9.1f}{run['requestsPerFile']:>10.2f}"
+                f"{run['timeToFirstByte']:>8.3f}s{run['itemsPerSecond']:>10.1f}"
+                f"{run['timeToFirstItem']:>8.3f}s{rss}"
+            )
+
+
+if __name__ == "__main__":
+    main()
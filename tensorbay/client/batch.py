@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class Batcher and BatchSynchronizer.
+
+:class:`Batcher` collects items from multiple threads and flushes them in batches,
+which is used to merge many tiny Open API requests into multi-item requests.
+
+:class:`BatchSynchronizer` sends the batches of the upload info and the labels of a segment
+by the multi-item requests.
+
+"""
+
+import logging
+import threading
+from types import TracebackType
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Type, TypeVar
+
+from ..dataset import Data
+from .exceptions import GASResponseError
+from .requests import UNSUPPORTED_STATUS_CODES, Client
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class Batcher(Generic[_T]):  # pylint: disable=too-many-instance-attributes
+    """This class defines :class:`Batcher`.
+
+    :class:`Batcher` is thread-safe and works in two modes:
+
+        - Without ``interval``, a batch is flushed by the thread which fills it up,
+          so the batches filled by different threads are flushed concurrently.
+        - With ``interval``, the batches are flushed in order by a background thread,
+          either when a batch is full or when ``interval`` seconds have passed,
+          so the threads adding items never wait for the flushing.
+          The first flushing error is raised by the next :meth:`Batcher.add`
+          and by :meth:`Batcher.flush`.
+
+    Arguments:
+        flush_function: The function to flush a batch of items.
+        batch_size: The max number of items in a batch.
+        interval: The max seconds an item stays in the buffer in background mode,
+            None for flushing in the adding threads.
+
+    """
+
+    def __init__(
+        self,
+        flush_function: Callable[[List[_T]], None],
+        *,
+        batch_size: int = 128,
+        interval: Optional[float] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("The batch size should be a positive integer")
+
+        self._flush_function = flush_function
+        self._batch_size = batch_size
+        self._interval = interval
+        self._buffer: List[_T] = []
+        self._lock = threading.Lock()
+
+        self._condition = threading.Condition(self._lock)
+        self._error: Optional[Exception] = None
+        self._flushing = False
+        self._flush_waiters = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if interval is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> "Batcher[_T]":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        # The buffered items are flushed even if the block fails, because they belong to
+        # the work which has already been done.
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            if exc_type is None:
+                raise
+            logger.exception("Failed to flush the batcher while handling another exception")
+        finally:
+            self.close()
+
+    def _pop_batch(self) -> List[_T]:
+        batch, self._buffer = self._buffer, []
+        return batch
+
+    def _raise_error(self) -> None:
+        if self._error:
+            raise self._error
+
+    def _is_ready(self) -> bool:
+        return self._closed or self._flush_waiters > 0 or len(self._buffer) >= self._batch_size
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(self._is_ready, self._interval)
+                batch = self._buffer[: self._batch_size]
+                del self._buffer[: self._batch_size]
+                if not batch and self._closed:
+                    return
+                self._flushing = True
+
+            try:
+                if batch:
+                    self._flush_function(batch)
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Failed to flush a batch of %d items: %s", len(batch), error)
+                with self._lock:
+                    if not self._error:
+                        self._error = error
+            finally:
+                with self._condition:
+                    self._flushing = False
+                    self._condition.notify_all()
+
+    def add(self, item: _T) -> None:
+        """Add an item into the batcher, the batch is flushed when it is full.
+
+        Arguments:
+            item: The item to add.
+
+        """
+        with self._condition:
+            self._raise_error()
+            self._buffer.append(item)
+            if len(self._buffer) < self._batch_size:
+                return
+            if self._thread:
+                self._condition.notify_all()
+                return
+            batch = self._pop_batch()
+
+        self._flush_function(batch)
+
+    def flush(self) -> None:
+        """Flush all the buffered items.
+
+        In background mode, it blocks until all the buffered items are flushed.
+
+        """
+        if not self._thread or self._closed:
+            with self._lock:
+                batch = self._pop_batch()
+            if batch:
+                self._flush_function(batch)
+            return
+
+        with self._condition:
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                self._condition.wait_for(lambda: not self._buffer and not self._flushing)
+            finally:
+                self._flush_waiters -= 1
+            self._raise_error()
+
+    def close(self) -> None:
+        """Stop the background thread after flushing the buffered items."""
+        if not self._thread:
+            return
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+
+class BatchSynchronizer:
+    """This class defines :class:`BatchSynchronizer`.
+
+    When the server rejects a multi-item request as unsupported, the items are sent one by one,
+    and the following batches skip the multi-item request.
+
+    Arguments:
+        client: The client used for sending request to TensorBay.
+        dataset_id: The ID of the dataset which the segment belongs to.
+        segment_name: The name of the segment.
+
+    """
+
+    def __init__(self, client: Client, dataset_id: str, segment_name: str) -> None:
+        self._client = client
+        self._dataset_id = dataset_id
+        self._segment_name = segment_name
+        self._multi_label_supported = True
+        self._multi_callback_supported = True
+
+    def synchronize_upload_info(self, callback_bodies: List[Dict[str, Any]]) -> None:
+        """Synchronize the upload info of multiple files in one request.
+
+        Arguments:
+            callback_bodies: The callback bodies of the uploaded files.
+
+        Raises:
+            GASResponseError: When the multi-callback request fails for other reasons.
+
+        """
+        if self._multi_callback_supported and len(callback_bodies) > 1:
+            put_data = {"callbackBodies": callback_bodies}
+            try:
+                self._client.open_api_do("PUT", "multi/callback", self._dataset_id, json=put_data)
+                return
+            except GASResponseError as error:
+                if error.status_code not in UNSUPPORTED_STATUS_CODES:
+                    raise
+                logger.warning(
+                    "Multi-callback synchronization rejected, fall back to single ones: %s", error
+                )
+                self._multi_callback_supported = False
+
+        for put_data in callback_bodies:
+            self._client.open_api_do("PUT", "callback", self._dataset_id, json=put_data)
+
+    def upload_labels(self, data: Iterable[Data]) -> None:
+        """Upload the labels of multiple data in one request.
+
+        Arguments:
+            data: The data whose labels need to be uploaded.
+
+        Raises:
+            GASResponseError: When the multi-label request fails for other reasons.
+
+        """
+        objects: List[Dict[str, Any]] = []
+        for single_data in data:
+            label = single_data.label.dumps()
+            if label:
+                objects.append({"remotePath": single_data.target_remote_path, "label": label})
+
+        if not objects:
+            return
+
+        if self._multi_label_supported and len(objects) > 1:
+            put_data = {"segmentName": self._segment_name, "objects": objects}
+            try:
+                self._client.open_api_do(
+                    "PUT", "multi/data/labels", self._dataset_id, json=put_data
+                )
+                return
+            except GASResponseError as error:
+                if error.status_code not in UNSUPPORTED_STATUS_CODES:
+                    raise
+                logger.warning(
+                    "Multi-label upload rejected, fall back to single uploads: %s", error
+                )
+                self._multi_label_supported = False
+
+        for post_data in objects:
+            post_data["segmentName"] = self._segment_name
+            self._client.open_api_do("PUT", "labels", self._dataset_id, json=post_data)
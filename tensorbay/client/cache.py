@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class ContentCache.
+
+:class:`ContentCache` is a size-capped local cache of the remote files in the commits.
+A commit is immutable, so a cached file never becomes stale.
+
+The cache directory can be shared by several processes on the same node:
+
+    - Every file is written into a temporary file and renamed into the cache, so a reader
+      sees either a complete file or no file.
+    - The modification time of a file is refreshed on every hit, and the least recently used
+      files are evicted by the process holding the lock file of the cache directory.
+
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import sha1
+from typing import BinaryIO, Callable, Generator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    """Get the default directory of the content cache.
+
+    Returns:
+        The default directory of the content cache.
+
+    """
+    home = "USERPROFILE" if os.name == "nt" else "HOME"
+    return os.path.join(os.environ[home], ".gas", "cache")
+
+
+@contextmanager
+def _file_lock(path: str) -> Generator[None, None, None]:
+    with open(path, "a+b") as fp:
+        if fcntl:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+        elif msvcrt:
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore[attr-defined]
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore[attr-defined]
+
+
+class ContentCache:
+    """This class defines :class:`ContentCache`.
+
+    Arguments:
+        directory: The directory of the cache, default is :meth:`default_cache_dir`.
+        max_bytes: The max total size in bytes of the cached files.
+
+    """
+
+    _LOCK_FILENAME = ".lock"
+    _TEMP_PREFIX = "."
+    _STALE_TEMP_IN_SECOND = 3600
+    _LOW_WATERMARK = 0.9
+
+    def __init__(self, directory: Optional[str] = None, *, max_bytes: int = 10 * 1024 ** 3) -> None:
+        self.directory = directory if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_path(self, dataset_id: str, commit_id: str, remote_path: str) -> str:
+        key = sha1(remote_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, dataset_id, commit_id, key)
+
+    def _scan(self) -> Tuple[int, List[Tuple[float, int, str]]]:
+        total = 0
+        entries: List[Tuple[float, int, str]] = []
+        now = time.time()
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+                if filename.startswith(self._TEMP_PREFIX):
+                    # The temporary files left by the crashed downloads.
+                    if root != self.directory and stat.st_mtime + self._STALE_TEMP_IN_SECOND < now:
+                        self._remove(path)
+                    continue
+
+                total += stat.st_size
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return total, entries
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            # The file is removed by another process, or it is opened on Windows.
+            return False
+
+    def _evict(self, max_bytes: int) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with _file_lock(os.path.join(self.directory, self._LOCK_FILENAME)):
+            total, entries = self._scan()
+            if total > max_bytes:
+                target = max_bytes * self._LOW_WATERMARK
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    if self._remove(path):
+                        total -= size
+                logger.debug("Content cache evicted to %d bytes", total)
+        self._size = total
+
+    def _add(self, size: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._evict(self.max_bytes)
+            else:
+                self._size += size
+                if self._size > self.max_bytes:
+                    self._evict(self.max_bytes)
+
+    def get(self, dataset_id: str, commit_id: str, remote_path: str) -> Optional[BinaryIO]:
+        """Open a cached file.
+
+        Arguments:
+            dataset_id: Dataset ID.
+            commit_id: The commit ID.
+            remote_path: The remote path of the file.
+
+        Returns:
+            The opened cached file, None if the file is not cached.
+
+        """
+        path = self._get_path(dataset_id, commit_id, remote_path)
+        try:
+            fp = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return fp
+
+    def open(
+        self,
+        dataset_id: str,
+        commit_id: str,
+        remote_path: str,
+        download: Callable[[str], None],
+    ) -> BinaryIO:
+        """Open a file from the cache, and download it into the cache when it misses.
+
+        Arguments:
+            dataset_id: Dataset ID.
+            commit_id: The commit ID.
+            remote_path: The remote path of the file.
+            download: The function which downloads the file into the given path atomically.
+
+        Returns:
+            The opened cached file.
+
+        """
+        path = self._get_path(dataset_id, commit_id, remote_path)
+        while True:
+            fp = self.get(dataset_id, commit_id, remote_path)
+            if fp:
+                return fp
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            download(path)
+            try:
+                # Open the file before the eviction, so it stays readable even if it is evicted.
+                fp = open(path, "rb")
+            except FileNotFoundError:
+                # The file is evicted by another process right after it is downloaded.
+                continue
+
+            self._add(os.fstat(fp.fileno()).st_size)
+            return fp
+
+    def clear(self) -> None:
+        """Remove all the cached files."""
+        with self._lock:
+            self._evict(0)
@@ -34,6 +34,7 @@ from .. import __version__
 from ..dataset import Data, Segment
 from ..utility import TBRN, TBRNType
 from .gas import GAS
+from .names import DatasetNameCache
 from .segment import FusionSegmentClient, SegmentClient
 
 
@@ -48,6 +49,16 @@ def _config_filepath() -> str:
     return os.path.join(os.environ[home], ".gasconfig")
 
 
+def _dataset_name_cache_filepath() -> str:
+    """Get the path of the dataset name cache file, which is next to the config file.
+
+    Returns:
+        The path of the dataset name cache file.
+
+    """
+    return os.path.join(os.path.dirname(_config_filepath()), ".gasdatasets")
+
+
 def _read_config(config_filepath: str, profile_name: str) -> Tuple[str, str]:
     """Read accessKey and URL from the config file.
 
@@ -96,7 +107,27 @@ def _gas(access_key: str, url: str, profile_name: str) -> GAS:
         click.echo("accessKey should be appointed", err=True)
         sys.exit(1)
 
-    return GAS(access_key, url)
+    return GAS(access_key, url, dataset_name_cache=DatasetNameCache(_dataset_name_cache_filepath()))
+
+
+def _parse_jobs(value: str) -> Union[int, str]:
+    """Parse the value of the "--jobs" option.
+
+    Arguments:
+        value: The value of the "--jobs" option.
+
+    Returns:
+        The number of threads, or "auto" for the adaptive concurrency.
+
+    Raises:
+        BadParameter: When the value is neither a positive integer nor "auto".
+
+    """
+    if value == "auto":
+        return value
+    if not value.isdigit() or int(value) < 1:
+        raise click.BadParameter('should be a positive integer or "auto"')
+    return int(value)
 
 
 @click.group()
@@ -211,7 +242,14 @@ def delete(obj: Dict[str, str], name: str, yes: bool) -> None:
 @click.option(
     "-r", "--recursive", "is_recursive", is_flag=True, help="Copy directories recursively."
 )
-@click.option("-j", "--jobs", type=int, default=1, help="The number of threads.")
+@click.option(
+    "-j",
+    "--jobs",
+    type=str,
+    default="1",
+    callback=lambda ctx, param, value: _parse_jobs(value),
+    help='The number of threads, or "auto" to adjust it adaptively.',
+)
 @click.option(
     "-s",
     "--skip_uploaded_files",
@@ -225,7 +263,7 @@ def cp(  # pylint: disable=invalid-name, too-many-arguments
     local_paths: Iterable[str],
     tbrn: str,
     is_recursive: bool,
-    jobs: int,
+    jobs: Union[int, str],
     skip_uploaded_files: bool,
 ) -> None:
     # noqa: D415, D301
@@ -236,7 +274,7 @@ def cp(  # pylint: disable=invalid-name, too-many-arguments
         local_paths: An iterable of local paths contains data to be uploaded.
         tbrn: The path to save the uploaded data, like "tb:KITTI:seg1".
         is_recursive: Whether copy directories recursively.
-        jobs: Number of threads to upload data.
+        jobs: Number of threads to upload data, or "auto" to adjust it adaptively.
         skip_uploaded_files: Whether skip the uploaded files.
 
     """
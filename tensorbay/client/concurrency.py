@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class AdaptiveConcurrency.
+
+:class:`AdaptiveConcurrency` adjusts the number of the concurrent uploads in AIMD style
+(additive increase, multiplicative decrease) according to the throughput, the latency
+and the throttling responses of TensorBay.
+
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .exceptions import GASResponseError
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+THROTTLING_STATUS_CODES = frozenset((429, 503))
+
+# The share of the gap the base latency moves toward a higher window latency every window,
+# so the base latency follows a lasting rise of the latency instead of halving forever.
+_BASE_LATENCY_DECAY = 0.1
+
+_local = threading.local()
+
+
+def current_controller() -> Optional["AdaptiveConcurrency"]:
+    """Get the controller of the task running in the current thread.
+
+    Returns:
+        The :class:`AdaptiveConcurrency` running the current task,
+        None if the task is not run by a controller.
+
+    """
+    controller: Optional[AdaptiveConcurrency] = getattr(_local, "controller", None)
+    return controller
+
+
+class AdaptiveConcurrency:  # pylint: disable=too-many-instance-attributes
+    """This class defines :class:`AdaptiveConcurrency`.
+
+    The concurrency is adjusted after every window of completed tasks:
+
+        - It shrinks by half when a throttling response (429 or 503) is received,
+          or when the average latency exceeds ``latency_factor`` times the base latency.
+        - Otherwise it grows by one while the throughput does not fall.
+
+    The base latency is the lowest window latency, it moves slowly toward the higher
+    window latencies so a lasting change of the network is re-baselined.
+
+    The submission is paused according to the "Retry-After" header of the throttling responses.
+
+    Arguments:
+        min_jobs: The min concurrency.
+        max_jobs: The max concurrency.
+        initial_jobs: The initial concurrency.
+        latency_factor: The ratio of the latency to the base one regarded as a latency spike.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        min_jobs: int = 1,
+        max_jobs: int = 64,
+        initial_jobs: int = 4,
+        latency_factor: float = 2.0,
+    ) -> None:
+        if not 1 <= min_jobs <= max_jobs:
+            raise ValueError("The concurrency range should be 1 <= min_jobs <= max_jobs")
+
+        self.min_jobs = min_jobs
+        self.max_jobs = max_jobs
+        self._latency_factor = latency_factor
+        self._concurrency = min(max(initial_jobs, min_jobs), max_jobs)
+        self._lock = threading.Lock()
+
+        self._throughput = 0.0
+        self._base_latency = 0.0
+        self._paused_until = 0.0
+        self._throttled_count = 0
+
+        self._window_start = time.monotonic()
+        self._window_completed = 0
+        self._window_latency = 0.0
+        self._window_throttled = False
+
+    def _reset_window(self, now: float) -> None:
+        self._window_start = now
+        self._window_completed = 0
+        self._window_latency = 0.0
+        self._window_throttled = False
+
+    def _set_concurrency(self, concurrency: int, reason: str) -> None:
+        concurrency = min(max(concurrency, self.min_jobs), self.max_jobs)
+        if concurrency != self._concurrency:
+            logger.debug("Concurrency %d -> %d: %s", self._concurrency, concurrency, reason)
+            self._concurrency = concurrency
+
+    def _on_complete(self, latency: float) -> None:
+        with self._lock:
+            self._window_completed += 1
+            self._window_latency += latency
+            if self._window_completed < self._concurrency:
+                return
+
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            throughput = self._window_completed / elapsed if elapsed > 0 else float("inf")
+            latency = self._window_latency / self._window_completed
+
+            if self._window_throttled:
+                pass
+            elif self._base_latency and latency > self._base_latency * self._latency_factor:
+                self._set_concurrency(self._concurrency // 2, "latency spike")
+            elif throughput >= self._throughput:
+                self._set_concurrency(self._concurrency + 1, "throughput rising")
+
+            self._throughput = throughput
+            if not self._base_latency or latency < self._base_latency:
+                self._base_latency = latency
+            else:
+                self._base_latency += (latency - self._base_latency) * _BASE_LATENCY_DECAY
+            self._reset_window(now)
+
+    @property
+    def concurrency(self) -> int:
+        """Return the current concurrency.
+
+        Returns:
+            The current concurrency.
+
+        """
+        return self._concurrency
+
+    @property
+    def throughput(self) -> float:
+        """Return the throughput of the last window.
+
+        Returns:
+            The number of the completed tasks per second in the last window.
+
+        """
+        return self._throughput
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get the metrics of the controller.
+
+        Returns:
+            The dict of the current concurrency, the throughput of the last window,
+            the base latency and the number of the throttling responses.
+
+        """
+        with self._lock:
+            return {
+                "concurrency": self._concurrency,
+                "throughput": self._throughput,
+                "baseLatency": self._base_latency,
+                "throttledCount": self._throttled_count,
+            }
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Report a throttling response.
+
+        Arguments:
+            retry_after: The seconds in the "Retry-After" header of the response.
+
+        """
+        with self._lock:
+            self._throttled_count += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            if not self._window_throttled:
+                self._window_throttled = True
+                self._set_concurrency(self._concurrency // 2, "throttled")
+
+    def wait_ready(self) -> None:
+        """Block until the pause required by the "Retry-After" header is over."""
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self, function: Callable[[_T], None], argument: _T) -> None:
+        """Run a task and report its latency and throttling to this controller.
+
+        Arguments:
+            function: The task function.
+            argument: The argument of the task function.
+
+        Raises:
+            GASResponseError: When the task fails with a response error.
+
+        """
+        _local.controller = self
+        start = time.monotonic()
+        try:
+            function(argument)
+        except GASResponseError as error:
+            if error.status_code in THROTTLING_STATUS_CODES:
+                retry_after = error.response.headers.get("Retry-After")
+                self.on_throttle(
+                    float(retry_after) if retry_after and retry_after.isdigit() else None
+                )
+            raise
+        finally:
+            _local.controller = None
+
+        self._on_complete(time.monotonic() - start)
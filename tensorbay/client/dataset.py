@@ -23,16 +23,23 @@ Please refer to :class:`~tensorbay.dataset.dataset.FusionDataset` for more infor
 """
 
 import sys
-from typing import Any, Dict, Iterator, Optional, Tuple
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Type, Union
 
 from ..dataset import Data, Frame, FusionSegment, Segment
 from ..label import Catalog
+from ..utility import json_loads
+from .cache import ContentCache
 from .exceptions import GASSegmentError
-from .requests import Client, multithread_upload, paging_range
-from .segment import FusionSegmentClient, SegmentClient
+from .journal import UploadedFrames, UploadJournal
+from .permission import PermissionManager
+from .pipeline import UploadPipelineConfig
+from .requests import Client, default_config, multithread_upload, paging_list
+from .segment import FusionSegmentClient, SegmentClient, SegmentClientBase
+from .snapshot import MetadataSnapshot, default_snapshot_path, make_page_request
 
 
-class DatasetClientBase:
+class DatasetClientBase:  # pylint: disable=too-many-instance-attributes
     """This class defines the basic concept of the dataset client.
 
     A :class:`DatasetClientBase` contains the information needed for
@@ -45,16 +52,33 @@ class DatasetClientBase:
         dataset_id: Dataset ID.
         client: The client used for sending request to TensorBay.
         commit_id: The dataset commit ID.
+        shared_permission: Whether to share one upload permission across all the segments
+            of the dataset, only set it when the server issues dataset-wide permissions.
 
     """
 
+    _SEGMENT_CLIENT_TYPE: Type[SegmentClientBase]
+
     def __init__(
-        self, name: str, dataset_id: str, client: Client, commit_id: Optional[str] = None
+        self,
+        name: str,
+        dataset_id: str,
+        client: Client,
+        commit_id: Optional[str] = None,
+        *,
+        shared_permission: bool = False,
     ) -> None:
         self._name = name
         self._dataset_id = dataset_id
         self._client = client
         self._commit_id = commit_id
+        self._permission_manager = PermissionManager(client, dataset_id, shared=shared_permission)
+        self._content_cache: Optional[ContentCache] = None
+        self._snapshot: Optional[MetadataSnapshot] = None
+        self._segment_names: Optional[Set[str]] = None
+        # Increased by every change of the segments, which drops the listing in progress.
+        self._segment_names_version = 0
+        self._segment_names_lock = threading.Lock()
 
     def _commit(self, message: str, tag: Optional[str] = None) -> str:
         post_data = {
@@ -64,26 +88,68 @@ class DatasetClientBase:
             post_data["tag"] = tag
 
         response = self._client.open_api_do("POST", "", self.dataset_id, json=post_data)
-        return response.json()["commitId"]  # type: ignore[no-any-return]
+        return json_loads(response.content)["commitId"]  # type: ignore[no-any-return]
 
     def _create_segment(self, name: str) -> None:
         post_data = {"name": name}
         self._client.open_api_do("POST", "segments", self.dataset_id, json=post_data)
+        with self._segment_names_lock:
+            self._segment_names_version += 1
+            if self._segment_names is not None:
+                self._segment_names.add(name)
+
+    def _has_segment(self, name: str) -> bool:
+        # The segment names are listed once and kept up to date by the segment creation and
+        # deletion of this client, so checking a segment does not list all the segments again.
+        # The listing is done outside the lock, so the other threads are not blocked by it.
+        while True:
+            with self._segment_names_lock:
+                if self._segment_names is not None:
+                    return name in self._segment_names
+                version = self._segment_names_version
+
+            segment_names = set(self.list_segment_names(jobs=default_config.listing_jobs))
+            with self._segment_names_lock:
+                if self._segment_names_version == version:
+                    self._segment_names = segment_names
+                    return name in segment_names
+
+    def _get_journal(
+        self, segment_name: str, journal_dir: Union[str, bool, None]
+    ) -> Optional[UploadJournal]:
+        if journal_dir is None or journal_dir is False:
+            return None
+        directory = None if journal_dir is True else journal_dir
+        return UploadJournal(self.dataset_id, segment_name, directory)
+
+    def _invalidate_segment_names(self) -> None:
+        with self._segment_names_lock:
+            self._segment_names_version += 1
+            self._segment_names = None
 
     def _list_segments(
-        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128
+        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128, jobs: int = 1
     ) -> Iterator[Dict[str, str]]:
+        if self._snapshot:
+            segments = [{"name": name} for name in self._snapshot.segment_names]
+            return paging_list(
+                make_page_request(segments, "segments"), "segments", start=start, stop=stop
+            )
+
         params: Dict[str, Any] = {}
         if self._commit_id:
             params["commit"] = self._commit_id
 
-        for params["offset"], params["limit"] in paging_range(start, stop, page_size):
+        def _request(offset: int, limit: int) -> Dict[str, Any]:
+            page_params = {**params, "offset": offset, "limit": limit}
             response = self._client.open_api_do(
-                "GET", "segments", self.dataset_id, params=params
-            ).json()
-            yield from response["segments"]
-            if response["recordSize"] + response["offset"] >= response["totalCount"]:
-                break
+                "GET", "segments", self.dataset_id, params=page_params
+            )
+            return json_loads(response.content)  # type: ignore[no-any-return]
+
+        return paging_list(
+            _request, "segments", start=start, stop=stop, page_size=page_size, jobs=jobs
+        )
 
     @property
     def commit_id(self) -> Optional[str]:
@@ -115,19 +181,32 @@ class DatasetClientBase:
         """
         commit_id = self._commit(message, tag)
         self._commit_id = commit_id
+        self._invalidate_segment_names()
 
-    def list_segment_names(self, *, start: int = 0, stop: int = sys.maxsize) -> Iterator[str]:
+    def list_segment_names(
+        self, *, start: int = 0, stop: int = sys.maxsize, jobs: int = 1
+    ) -> Iterator[str]:
         """List all segment names in a certain commit.
 
         Arguments:
             start: The index to start.
             stop: The index to end.
+            jobs: The number of the max workers for requesting pages concurrently.
 
         Yields:
             Required segment names.
 
         """
-        yield from (segment["name"] for segment in self._list_segments(start=start, stop=stop))
+        yield from (
+            segment["name"] for segment in self._list_segments(start=start, stop=stop, jobs=jobs)
+        )
+
+    def _get_catalog_contents(self) -> Dict[str, Any]:
+        if self._snapshot:
+            return self._snapshot.catalog
+
+        response = self._client.open_api_do("GET", "labels/catalogs", self.dataset_id)
+        return json_loads(response.content)["catalog"]  # type: ignore[no-any-return]
 
     def get_catalog(self) -> Catalog:
         """Get the catalog of the certain commit.
@@ -136,8 +215,7 @@ class DatasetClientBase:
             Required :class:`~tensorbay.label.catalog.Catalog`.
 
         """
-        response = self._client.open_api_do("GET", "labels/catalogs", self.dataset_id).json()
-        return Catalog.loads(response["catalog"])
+        return Catalog.loads(self._get_catalog_contents())
 
     def upload_catalog(self, catalog: Catalog) -> None:
         """Upload a catalog to the draft.
@@ -183,6 +261,96 @@ class DatasetClientBase:
         delete_data = {"segmentName": name}
 
         self._client.open_api_do("DELETE", "segments", self.dataset_id, json=delete_data)
+        with self._segment_names_lock:
+            self._segment_names_version += 1
+            if self._segment_names is not None:
+                self._segment_names.discard(name)
+
+    def save_snapshot(self, path: Optional[str] = None, *, jobs: int = 1) -> str:
+        """Save the metadata snapshot of the commit into a local file.
+
+        The snapshot contains the segment names, the labels of the data or the frames,
+        the sensors of the fusion segments and the catalog.
+
+        Arguments:
+            path: The path of the snapshot file, default is
+                :meth:`~tensorbay.client.snapshot.default_snapshot_path`.
+            jobs: The number of the max workers for requesting pages concurrently.
+
+        Returns:
+            The path of the saved snapshot file.
+
+        Raises:
+            ValueError: When the dataset client is not bound to a commit.
+
+        """
+        if not self._commit_id:
+            raise ValueError("The metadata snapshot can only be saved from a commit")
+
+        segments = {}
+        for name in self.list_segment_names(jobs=jobs):
+            segment_client = self._SEGMENT_CLIENT_TYPE(
+                name,
+                self._dataset_id,
+                self._name,
+                self._client,
+                self._commit_id,
+                permission_manager=self._permission_manager,
+            )
+            # pylint: disable=protected-access
+            segment: Dict[str, Any] = {"labels": list(segment_client._list_labels(jobs=jobs))}
+            if isinstance(segment_client, FusionSegmentClient):
+                segment["sensors"] = segment_client._get_sensor_contents()
+            segments[name] = segment
+
+        snapshot = MetadataSnapshot(
+            self._dataset_id, self._commit_id, self._get_catalog_contents(), segments
+        )
+        if path is None:
+            path = default_snapshot_path(self._dataset_id, self._commit_id)
+        snapshot.dump(path)
+        return path
+
+    def load_snapshot(self, path: Optional[str] = None) -> None:
+        """Load the metadata snapshot of the commit from a local file.
+
+        The segment names, the catalog and the data, the frames and the sensors
+        of the segments got afterwards are served from the snapshot without requests.
+
+        Arguments:
+            path: The path of the snapshot file, default is
+                :meth:`~tensorbay.client.snapshot.default_snapshot_path`.
+
+        Raises:
+            ValueError: When the snapshot does not belong to the commit of the dataset client.
+
+        """
+        if path is None:
+            if not self._commit_id:
+                raise ValueError("The metadata snapshot can only be loaded for a commit")
+            path = default_snapshot_path(self._dataset_id, self._commit_id)
+
+        snapshot = MetadataSnapshot.load(path)
+        if (snapshot.dataset_id, snapshot.commit_id) != (self._dataset_id, self._commit_id):
+            raise ValueError(
+                f'The snapshot of commit "{snapshot.commit_id}" in dataset "{snapshot.dataset_id}"'
+                f' mismatches the commit "{self._commit_id}" in dataset "{self._dataset_id}"'
+            )
+        self._snapshot = snapshot
+        self._invalidate_segment_names()
+
+    def set_content_cache(self, content_cache: Optional[ContentCache]) -> None:
+        """Set the local cache of the remote files for the segments got afterwards.
+
+        The data listed from a segment of a commit is opened from the cache,
+        and the data missing in the cache is downloaded into it first.
+
+        Arguments:
+            content_cache: The :class:`~tensorbay.client.cache.ContentCache`,
+                None for disabling the cache.
+
+        """
+        self._content_cache = content_cache
 
 
 class DatasetClient(DatasetClientBase):
@@ -197,6 +365,8 @@ class DatasetClient(DatasetClientBase):
 
     """
 
+    _SEGMENT_CLIENT_TYPE = SegmentClient
+
     def get_or_create_segment(self, name: str = "") -> SegmentClient:
         """Create a segment with the given name to the draft.
 
@@ -207,9 +377,18 @@ class DatasetClient(DatasetClientBase):
             Created :class:`~tensorbay.client.segment.SegmentClient` with given name.
 
         """
-        if name not in self.list_segment_names():
+        if not self._has_segment(name):
             self._create_segment(name)
-        return SegmentClient(name, self._dataset_id, self._name, self._client, self.commit_id)
+        return SegmentClient(
+            name,
+            self._dataset_id,
+            self._name,
+            self._client,
+            self.commit_id,
+            permission_manager=self._permission_manager,
+            content_cache=self._content_cache,
+            snapshot=self._snapshot,
+        )
 
     def get_segment(self, name: str = "") -> SegmentClient:
         """Get a segment in a certain commit according to given name.
@@ -224,17 +403,82 @@ class DatasetClient(DatasetClientBase):
             GASSegmentError: When the required segment does not exist.
 
         """
-        if name not in self.list_segment_names():
+        if not self._has_segment(name):
             raise GASSegmentError(name)
 
-        return SegmentClient(name, self._dataset_id, self._name, self._client, self.commit_id)
+        return SegmentClient(
+            name,
+            self._dataset_id,
+            self._name,
+            self._client,
+            self.commit_id,
+            permission_manager=self._permission_manager,
+            content_cache=self._content_cache,
+            snapshot=self._snapshot,
+        )
+
+    @staticmethod
+    def _get_uploaded_paths(
+        segment_client: SegmentClient,
+        journal: Optional[UploadJournal],
+        reconcile: bool,
+        jobs: Union[int, str],
+    ) -> Set[str]:
+        if journal and journal.exists() and not reconcile:
+            return journal.load()
+
+        listing_jobs = jobs if isinstance(jobs, int) else default_config.listing_jobs
+        done_set = set(segment_client.list_data_paths(jobs=listing_jobs))
+        if journal:
+            journal.remove()
+            journal.record(done_set)
+        return done_set
+
+    def _get_local_data(  # pylint: disable=too-many-arguments
+        self,
+        segment: Segment,
+        segment_client: SegmentClient,
+        skip_uploaded_files: bool,
+        journal: Optional[UploadJournal],
+        reconcile: bool,
+        jobs: Union[int, str],
+    ) -> Iterator[Data]:
+        local_data: Iterator[Data] = filter(
+            lambda data: isinstance(data, Data), segment  # type: ignore[arg-type]
+        )
+        if not skip_uploaded_files:
+            return local_data
+
+        done_set = self._get_uploaded_paths(segment_client, journal, reconcile, jobs)
+        return filter(lambda data: data.target_remote_path not in done_set, local_data)
+
+    def _prepare_upload(
+        self, segment: Segment, *, jobs: Union[int, str], skip_uploaded_files: bool
+    ) -> Tuple[SegmentClient, Callable[[Data], None], Iterator[Data], int]:
+        segment_client = self.get_or_create_segment(segment.name)
+        done_set = (
+            self._get_uploaded_paths(segment_client, None, False, jobs)
+            if skip_uploaded_files
+            else set()
+        )
+
+        def _iter_data() -> Iterator[Data]:
+            for data in segment:
+                if isinstance(data, Data) and data.target_remote_path not in done_set:
+                    yield data
 
-    def upload_segment(
+        total = sum(1 for _ in _iter_data())
+        return segment_client, segment_client.upload_data, _iter_data(), total
+
+    def upload_segment(  # pylint: disable=too-many-arguments
         self,
         segment: Segment,
         *,
-        jobs: int = 1,
+        jobs: Union[int, str] = 1,
         skip_uploaded_files: bool = False,
+        journal_dir: Union[str, bool, None] = None,
+        reconcile: bool = False,
+        pipeline: Optional[UploadPipelineConfig] = None,
     ) -> SegmentClient:
         """Upload a :class:`~tensorbay.dataset.segment.Segment` to the dataset.
 
@@ -244,11 +488,26 @@ class DatasetClient(DatasetClientBase):
         - Create a segment using the name of input Segment.
         - Upload all Data in the Segment to the dataset.
 
+        When ``journal_dir`` is given, every uploaded data is recorded into an
+        :class:`~tensorbay.client.journal.UploadJournal` under the directory as soon as
+        its upload is finished, and ``skip_uploaded_files`` reads the uploaded files
+        from the journal instead of listing the whole remote segment.
+        The remote segment is still listed when the journal does not exist yet.
+
         Arguments:
             segment: The :class:`~tensorbay.dataset.segment.Segment`
                 contains the information needs to be upload.
-            jobs: The number of the max workers in multi-thread uploading method.
+            jobs: The number of the max workers in multi-thread uploading method,
+                or "auto" to adjust the concurrency adaptively.
             skip_uploaded_files: True for skipping the uploaded files.
+            journal_dir: The directory of the upload journal,
+                True for :func:`~tensorbay.client.journal.default_journal_dir`,
+                None for not using the journal.
+            reconcile: Whether to rebuild the journal from the remote file list
+                before skipping the uploaded files.
+            pipeline: The :class:`~tensorbay.client.pipeline.UploadPipelineConfig` for uploading
+                the data through the staged pipeline, whose stage concurrency replaces ``jobs``.
+                None for uploading every data in one worker.
 
         Returns:
             The :class:`~tensorbay.client.segment.SegmentClient`
@@ -256,18 +515,22 @@ class DatasetClient(DatasetClientBase):
 
         """
         segment_client = self.get_or_create_segment(segment.name)
-        local_data: Iterator[Data] = filter(
-            lambda data: isinstance(data, Data), segment  # type: ignore[arg-type]
+        journal = self._get_journal(segment.name, journal_dir)
+        segment_filter = self._get_local_data(
+            segment, segment_client, skip_uploaded_files, journal, reconcile, jobs
         )
-        if skip_uploaded_files:
-            done_set = set(segment_client.list_data_paths())
-            segment_filter = filter(
-                lambda data: data.target_remote_path not in done_set, local_data
-            )
-        else:
-            segment_filter = local_data
 
-        multithread_upload(segment_client.upload_data, segment_filter, jobs=jobs)
+        segment_client._journal = journal  # pylint: disable=protected-access
+        try:
+            if pipeline:
+                # pylint: disable=protected-access
+                segment_client._upload_data_pipelined(segment_filter, pipeline)
+            else:
+                with segment_client.batch_callbacks():
+                    multithread_upload(segment_client.upload_data, segment_filter, jobs=jobs)
+        finally:
+            if journal:
+                journal.close()
         return segment_client
 
 
@@ -284,6 +547,8 @@ class FusionDatasetClient(DatasetClientBase):
 
     """
 
+    _SEGMENT_CLIENT_TYPE = FusionSegmentClient
+
     def get_or_create_segment(self, name: str = "") -> FusionSegmentClient:
         """Create a fusion segment with the given name to the draft.
 
@@ -294,9 +559,18 @@ class FusionDatasetClient(DatasetClientBase):
             Created :class:`~tensorbay.client.segment.FusionSegmentClient` with given name.
 
         """
-        if name not in self.list_segment_names():
+        if not self._has_segment(name):
             self._create_segment(name)
-        return FusionSegmentClient(name, self._dataset_id, self._name, self._client, self.commit_id)
+        return FusionSegmentClient(
+            name,
+            self._dataset_id,
+            self._name,
+            self._client,
+            self.commit_id,
+            permission_manager=self._permission_manager,
+            content_cache=self._content_cache,
+            snapshot=self._snapshot,
+        )
 
     def get_segment(self, name: str = "") -> FusionSegmentClient:
         """Get a fusion segment in a certain commit according to given name.
@@ -311,16 +585,122 @@ class FusionDatasetClient(DatasetClientBase):
             GASSegmentError: When the required fusion segment does not exist.
 
         """
-        if name not in self.list_segment_names():
+        if not self._has_segment(name):
             raise GASSegmentError(name)
-        return FusionSegmentClient(name, self._dataset_id, self._name, self._client, self.commit_id)
+        return FusionSegmentClient(
+            name,
+            self._dataset_id,
+            self._name,
+            self._client,
+            self.commit_id,
+            permission_manager=self._permission_manager,
+            content_cache=self._content_cache,
+            snapshot=self._snapshot,
+        )
+
+    @staticmethod
+    def _get_uploaded_frames(
+        segment_client: FusionSegmentClient,
+        journal: Optional[UploadJournal],
+        reconcile: bool,
+        jobs: Union[int, str],
+    ) -> UploadedFrames:
+        if journal and journal.exists() and not reconcile:
+            return UploadedFrames.from_journal(journal)
+
+        listing_jobs = jobs if isinstance(jobs, int) else default_config.listing_jobs
+        uploaded = UploadedFrames(
+            (frame["frameId"], data["sensorName"])
+            # pylint: disable=protected-access
+            for frame in segment_client._list_frames(jobs=listing_jobs)
+            for data in frame["frame"]
+        )
+        if journal:
+            journal.remove()
+            journal.record(uploaded.keys())
+        return uploaded
+
+    def _create_segment_with_sensors(
+        self, segment: FusionSegment, skip_uploaded_files: bool
+    ) -> FusionSegmentClient:
+        segment_client = self.get_or_create_segment(segment.name)
+        uploaded_sensors = (
+            # pylint: disable=protected-access
+            {sensor["name"] for sensor in segment_client._get_sensor_contents()}
+            if skip_uploaded_files
+            else set()
+        )
+        for sensor in segment.sensors.values():
+            if sensor.name not in uploaded_sensors:
+                segment_client.upload_sensor(sensor)
+        return segment_client
+
+    @staticmethod
+    def _get_frame_timestamps(segment: FusionSegment) -> Iterator[Tuple[Frame, Optional[int]]]:
+        have_frame_id = hasattr(segment[0], "frame_id")
+
+        for frame in segment:
+            if not hasattr(frame, "frame_id") == have_frame_id:
+                raise TypeError(
+                    "All the frames should have the same patterns(both have frame id or not)."
+                )
+
+        if have_frame_id:
+            return ((frame, None) for frame in segment)
+        return ((frame, 10 * index + 10) for index, frame in enumerate(segment))
+
+    @staticmethod
+    def _count_frame_data(
+        frames: Iterable[Tuple[Frame, Optional[int]]], uploaded: Optional[UploadedFrames]
+    ) -> int:
+        count = 0
+        for frame, timestamp in frames:
+            frame_id = frame.frame_id if timestamp is None else None
+            if uploaded and timestamp is not None:
+                frame_id = uploaded.get_frame_id(timestamp)
+            for sensor_name, data in frame.items():
+                if not isinstance(data, Data):
+                    continue
+                if uploaded and frame_id and uploaded.contains(frame_id, sensor_name):
+                    continue
+                count += 1
+        return count
+
+    def _prepare_upload(
+        self, segment: FusionSegment, *, jobs: Union[int, str], skip_uploaded_files: bool
+    ) -> Tuple[
+        FusionSegmentClient,
+        Callable[[Tuple[Data, Dict[str, Any]]], None],
+        Iterator[Tuple[Data, Dict[str, Any]]],
+        int,
+    ]:
+        segment_client = self._create_segment_with_sensors(segment, skip_uploaded_files)
+        if not segment:
+            return segment_client, lambda _: None, iter(()), 0
+
+        uploaded = (
+            self._get_uploaded_frames(segment_client, None, False, jobs)
+            if skip_uploaded_files
+            else None
+        )
+        # pylint: disable=protected-access
+        work = (
+            frame_data
+            for frame, timestamp in self._get_frame_timestamps(segment)
+            for frame_data in segment_client._iter_frame_data(frame, timestamp, uploaded)
+        )
+        total = self._count_frame_data(self._get_frame_timestamps(segment), uploaded)
+        return segment_client, lambda args: segment_client._upload_frame_data(*args), work, total
 
-    def upload_segment(
+    def upload_segment(  # pylint: disable=too-many-arguments
         self,
         segment: FusionSegment,
         *,
-        jobs: int = 1,
-        skip_uploaded_files: bool = False,  # pylint: disable=unused-argument
+        jobs: Union[int, str] = 1,
+        skip_uploaded_files: bool = False,
+        journal_dir: Union[str, bool, None] = None,
+        reconcile: bool = False,
+        pipeline: Optional[UploadPipelineConfig] = None,
     ) -> FusionSegmentClient:
         """Upload a fusion segment object to the draft.
 
@@ -331,45 +711,63 @@ class FusionDatasetClient(DatasetClientBase):
             - Upload all sensors in the segment to the dataset.
             - Upload all frames in the segment to the dataset.
 
+        The uploaded sensor data are identified by their frame IDs and sensor names.
+        The frames without frame IDs get their frame IDs generated from the timestamps
+        ``10 * index + 10``, so a resumed upload reuses the frame IDs of the partially uploaded
+        frames found by the timestamps, as long as the order of the frames is unchanged.
+
+        When ``journal_dir`` is given, every uploaded sensor data is recorded into an
+        :class:`~tensorbay.client.journal.UploadJournal` under the directory as soon as
+        its upload is finished, and ``skip_uploaded_files`` reads the uploaded sensor data
+        from the journal instead of listing the whole remote segment.
+        The remote segment is still listed when the journal does not exist yet.
+
         Arguments:
             segment: The :class:`~tensorbay.dataset.segment.FusionSegment`.
-            jobs: The number of the max workers in multi-thread upload.
-            skip_uploaded_files: Set it to True to skip the uploaded files.
-
-        Raises:
-            TypeError: When all the frames have the same patterns(both have frame id or not).
+            jobs: The number of the max workers in multi-thread upload,
+                or "auto" to adjust the concurrency adaptively.
+                Every worker uploads one sensor data at a time,
+                so the sensor data of a frame are uploaded concurrently.
+            skip_uploaded_files: Set it to True to skip the uploaded sensor data.
+            journal_dir: The directory of the upload journal,
+                True for :func:`~tensorbay.client.journal.default_journal_dir`,
+                None for not using the journal.
+            reconcile: Whether to rebuild the journal from the remote frame list
+                before skipping the uploaded sensor data.
+            pipeline: The :class:`~tensorbay.client.pipeline.UploadPipelineConfig` for uploading
+                the data of the frames through the staged pipeline,
+                whose stage concurrency replaces ``jobs``.
+                None for uploading the sensor data by ``jobs`` workers.
+
+        All the frames should have the same patterns(both have frame id or not),
+        otherwise :class:`TypeError` is raised.
 
         Returns:
             The :class:`~tensorbay.client.segment.FusionSegmentClient`
                 used for uploading the data in the segment.
 
         """
-        segment_client = self.get_or_create_segment(segment.name)
-        for sensor in segment.sensors.values():
-            segment_client.upload_sensor(sensor)
-
-        segment_filter: Iterator[Tuple[Frame, Optional[int]]]
-
+        segment_client = self._create_segment_with_sensors(segment, skip_uploaded_files)
         if not segment:
             return segment_client
 
-        have_frame_id = hasattr(segment[0], "frame_id")
-
-        for frame in segment:
-            if not hasattr(frame, "frame_id") == have_frame_id:
-                raise TypeError(
-                    "All the frames should have the same patterns(both have frame id or not)."
-                )
-
-        if have_frame_id:
-            segment_filter = ((frame, None) for frame in segment)
-        else:
-            segment_filter = ((frame, 10 * index + 10) for index, frame in enumerate(segment))
-
-        multithread_upload(
-            lambda args: segment_client.upload_frame(*args),
-            segment_filter,
-            jobs=jobs,
+        segment_filter = self._get_frame_timestamps(segment)
+        journal = self._get_journal(segment.name, journal_dir)
+        uploaded = (
+            self._get_uploaded_frames(segment_client, journal, reconcile, jobs)
+            if skip_uploaded_files
+            else None
         )
 
+        # pylint: disable=protected-access
+        segment_client._journal = journal
+        try:
+            if pipeline:
+                segment_client._upload_frames_pipelined(segment_filter, pipeline, uploaded)
+            else:
+                with segment_client.batch_callbacks():
+                    segment_client._upload_frames(segment_filter, jobs=jobs, uploaded=uploaded)
+        finally:
+            if journal:
+                journal.close()
         return segment_client
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class Downloader.
+
+:class:`Downloader` downloads the remote files of TensorBay concurrently
+over the pooled session of :class:`~tensorbay.client.requests.Client`.
+
+Every file is written into a temporary file beside the target and then renamed to the target,
+so an interrupted download never leaves a truncated file behind.
+
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Iterable
+
+from requests.exceptions import RequestException
+
+from ..dataset import RemoteData
+from .exceptions import GASChecksumError, GASPathError, GASResponseError
+from .requests import Client, TransferSummary, default_config, multithread_upload
+
+logger = logging.getLogger(__name__)
+
+_MD5_PATTERN = re.compile("[0-9a-f]{32}")
+
+
+class Downloader:  # pylint: disable=too-few-public-methods
+    """This class defines :class:`Downloader`.
+
+    Arguments:
+        client: The client used for sending request to TensorBay.
+        jobs: The number of the max workers for downloading files concurrently.
+        verify_checksum: Whether to verify the MD5 of the downloaded content against the ETag.
+            The ETag of the objects uploaded by multipart upload is not an MD5,
+            and the check is skipped for them.
+        chunk_size: The size in bytes of the chunks read from the response.
+
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        jobs: int = 1,
+        verify_checksum: bool = False,
+        chunk_size: int = 1024 * 1024,
+    ) -> None:
+        self._client = client
+        self._jobs = jobs
+        self._verify_checksum = verify_checksum
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def _get_target_path(directory: str, remote_path: str) -> str:
+        parts = remote_path.split("/")
+        if "\\" in remote_path or any(part in ("", ".", "..") for part in parts):
+            raise GASPathError(remote_path)
+
+        return os.path.join(directory, *parts)
+
+    def _fetch(self, data: RemoteData, target_path: str) -> None:
+        with self._client.do("GET", data.get_url(), stream=True) as response:
+            etag = response.headers.get("ETag", "").strip('"').lower()
+            checksum = (
+                hashlib.md5() if self._verify_checksum and _MD5_PATTERN.fullmatch(etag) else None
+            )
+
+            descriptor, temp_path = tempfile.mkstemp(
+                prefix=".", suffix=".download", dir=os.path.dirname(target_path)
+            )
+            try:
+                with os.fdopen(descriptor, "wb") as fp:
+                    for chunk in response.iter_content(self._chunk_size):
+                        fp.write(chunk)
+                        if checksum:
+                            checksum.update(chunk)
+
+                if checksum and checksum.hexdigest() != etag:
+                    raise GASChecksumError(data.path, etag, checksum.hexdigest())
+
+                os.replace(temp_path, target_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+
+    def _download(self, data: RemoteData, directory: str) -> None:
+        target_path = self._get_target_path(directory, data.path)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        self.download_file(data, target_path)
+
+    def download_file(self, data: RemoteData, target_path: str) -> None:
+        """Download a remote file into the target path atomically.
+
+        Arguments:
+            data: The :class:`~tensorbay.dataset.data.RemoteData` to download.
+            target_path: The local path to save the file, its directory should exist.
+
+        Raises:
+            GASChecksumError: When the checksum of the file still mismatches after the retries.
+            GASResponseError: When the request still fails after the retries.
+            RequestException: When the connection still fails after the retries.
+
+        """
+        retry = default_config.max_retries
+        while True:
+            try:
+                self._fetch(data, target_path)
+                return
+            except (GASResponseError, GASChecksumError, RequestException) as error:
+                if retry <= 0:
+                    raise
+                delay = default_config.backoff_factor * 2 ** (default_config.max_retries - retry)
+                retry -= 1
+                logger.warning("Retry downloading %s in %.1fs: %s", data.path, delay, error)
+                time.sleep(delay)
+
+    def download(
+        self, data: Iterable[RemoteData], directory: str, *, fail_fast: bool = True
+    ) -> TransferSummary[RemoteData]:
+        """Download the remote files into a local directory.
+
+        The remote path of every file is kept as the relative path under the directory.
+
+        Arguments:
+            data: The :class:`~tensorbay.dataset.data.RemoteData` to download.
+            directory: The local directory to download the files into.
+            fail_fast: Whether to stop and raise the exception when the first download fails.
+                If False, the failures are collected in the returned summary.
+
+        Returns:
+            The :class:`~tensorbay.client.requests.TransferSummary` of the downloading.
+
+        """
+        return multithread_upload(
+            lambda remote_data: self._download(remote_data, directory),
+            data,
+            jobs=self._jobs,
+            fail_fast=fail_fast,
+        )
@@ -26,6 +26,8 @@
 +----------------------+-----------------------------------------------------+
 | GASFrameError        | Uploading frame has no timestamp and no frame index.|
 +----------------------+-----------------------------------------------------+
+| GASChecksumError     | The checksum of the downloaded file mismatches      |
++----------------------+-----------------------------------------------------+
 
 """
 
@@ -170,3 +172,26 @@ class GASFrameError(GASException):
 
     def __str__(self) -> str:
         return "Either data.timestamp or frame_index is required to sort frame in TensorBay"
+
+
+class GASChecksumError(GASException):
+    """This error is raised to indicate that the checksum of the downloaded file mismatches.
+
+    Arguments:
+        remote_path: The remote path of the downloaded file.
+        expected: The expected checksum.
+        actual: The checksum of the downloaded content.
+
+    """
+
+    def __init__(self, remote_path: str, expected: str, actual: str) -> None:
+        super().__init__()
+        self._remote_path = remote_path
+        self._expected = expected
+        self._actual = actual
+
+    def __str__(self) -> str:
+        return (
+            f'Checksum mismatch of "{self._remote_path}": '
+            f"expected {self._expected}, got {self._actual}"
+        )
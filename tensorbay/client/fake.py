@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class FakeServer.
+
+:class:`FakeServer` is an in-process stand-in of the TensorBay Open API and the object storage,
+which serves the requests sent by :class:`~tensorbay.client.gas.GAS` and the clients got from it
+without network access and account, so the client paths can be tested and benchmarked offline.
+
+The datasets, the segments, the data, the labels, the sensors and the uploaded objects
+are all kept in memory. The commits do not version the contents, every commit reads the draft.
+
+The latency, the error injection and the throttling of the server are configurable,
+and the random errors are reproducible with the same seed.
+
+Examples:
+    >>> with FakeServer(latency=0.01) as server:
+    ...     gas = GAS("Accesskey-fake", server.url)
+    ...     dataset_client = gas.create_dataset("test")
+
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+import zlib
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from itertools import count
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Counter, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import SplitResult, parse_qs, quote, unquote, urlsplit
+
+_OPEN_API_PREFIX = "/gateway/tensorbay-open-api/v1/datasets"
+_OBJECT_PREFIX = "/objects/"
+_DECOMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.decompress,
+    "deflate": zlib.decompress,
+}
+
+_Response = Tuple[int, Dict[str, str], Any]
+_S = TypeVar("_S", bound="FakeServer")
+_Route = Callable[["_Dataset", Dict[str, List[str]], Any], Any]
+
+
+class _FakeError(Exception):
+    def __init__(self, status_code: int, code: str, message: str = "") -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class _Segment:  # pylint: disable=too-few-public-methods
+    def __init__(self, name: str, object_prefix: str) -> None:
+        self.name = name
+        self.object_prefix = object_prefix
+        self.data: Dict[str, Dict[str, Any]] = {}
+        self.sensors: Dict[str, Dict[str, Any]] = {}
+        self._sorted: Optional[List[Dict[str, Any]]] = None
+
+    def modify(self) -> None:
+        """Drop the sorted items after the data of the segment is modified."""
+        self._sorted = None
+
+    def get_items(self, is_fusion: bool) -> List[Dict[str, Any]]:
+        """Get the data sorted by the remote paths, or the frames sorted by the frame IDs.
+
+        Arguments:
+            is_fusion: Whether the segment is a fusion segment.
+
+        Returns:
+            The sorted data or frames.
+
+        """
+        if self._sorted is not None:
+            return self._sorted
+
+        if not is_fusion:
+            self._sorted = [self.data[path] for path in sorted(self.data)]
+            return self._sorted
+
+        frames: Dict[str, List[Dict[str, Any]]] = {}
+        for contents in self.data.values():
+            frame_id = contents["frameId"]
+            frames.setdefault(frame_id, []).append(
+                {key: value for key, value in contents.items() if key != "frameId"}
+            )
+        self._sorted = [
+            {"frameId": frame_id, "frame": frames[frame_id]} for frame_id in sorted(frames)
+        ]
+        return self._sorted
+
+
+class _Dataset:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    def __init__(self, dataset_id: str, name: str, is_fusion: bool) -> None:
+        self.dataset_id = dataset_id
+        self.name = name
+        self.is_fusion = is_fusion
+        self.description = ""
+        self.is_continuous = False
+        self.catalog: Dict[str, Any] = {}
+        self.segments: Dict[str, _Segment] = {}
+        self.commits: List[str] = []
+
+
+def _get_page(items: List[Any], key: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+    offset = int(query.get("offset", ["0"])[0])
+    limit = int(query.get("limit", ["128"])[0])
+    page = items[offset : offset + limit]
+    return {key: page, "offset": offset, "recordSize": len(page), "totalCount": len(items)}
+
+
+def _get_param(query: Dict[str, List[str]], name: str) -> str:
+    try:
+        return query[name][0]
+    except KeyError as error:
+        raise _FakeError(400, "ParamsMissing", f"Missing parameter '{name}'") from error
+
+
+def _parse_form(content_type: str, body: bytes) -> Dict[str, bytes]:
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+    )
+    form = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True)
+        if isinstance(name, str) and isinstance(payload, bytes):
+            form[name] = payload
+    return form
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    _server_header = "FakeServer"
+
+    def log_message(self, *_: Any) -> None:
+        pass
+
+    def version_string(self) -> str:
+        return self._server_header
+
+    def _send(self, status_code: int, headers: Dict[str, str], content: Any) -> None:
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode()
+            headers.setdefault("Content-Type", "application/json")
+
+        self._server_header = headers.pop("Server", _Handler._server_header)
+        self.send_response(status_code)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        encoding = self.headers.get("Content-Encoding")
+        if encoding:
+            decompress = _DECOMPRESSORS.get(encoding)
+            if not decompress:
+                self._send(415, {}, {"code": "UnsupportedMediaType", "message": encoding})
+                return
+            body = decompress(body)
+
+        self._send(*self.server.fake.handle(self.command, self.path, self.headers, body))
+
+    do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = do_PATCH = _respond
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    fake: "FakeServer"
+
+
+class FakeServer:  # pylint: disable=too-many-instance-attributes
+    """This class defines :class:`FakeServer`.
+
+    Arguments:
+        latency: The seconds every Open API request takes.
+        object_latency: The seconds every object storage request takes.
+        error_rate: The probability that an Open API request fails with ``error_status``.
+        object_error_rate: The probability that an object storage request fails
+            with ``error_status``.
+        error_status: The status code of the injected errors.
+        max_concurrency: The max number of the Open API requests handled at the same time,
+            the exceeding requests are responded with 429. None means no limit.
+        retry_after: The "Retry-After" seconds of the 429 responses.
+        unsupported_sections: The Open API sections responded with 404,
+            such as "multi/callback", for testing the fallback paths of the client.
+        seed: The seed of the random errors.
+
+    Attributes:
+        request_counts: The number of the received requests per (method, section),
+            the object storage requests are counted in the "(object)" section.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        latency: float = 0,
+        object_latency: float = 0,
+        error_rate: float = 0,
+        object_error_rate: float = 0,
+        error_status: int = 500,
+        max_concurrency: Optional[int] = None,
+        retry_after: int = 0,
+        unsupported_sections: Iterable[str] = (),
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.object_latency = object_latency
+        self.error_rate = error_rate
+        self.object_error_rate = object_error_rate
+        self.error_status = error_status
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+        self.unsupported_sections = set(unsupported_sections)
+        self.request_counts: Counter[Tuple[str, str]] = Counter()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._ids = count(1)
+        self._datasets: Dict[str, _Dataset] = {}
+        self._prefixes: Dict[str, Tuple[str, str]] = {}
+        self._objects: Dict[str, Tuple[bytes, str]] = {}
+        self._uploads: Dict[str, Dict[int, bytes]] = {}
+
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+        self._routes: Dict[Tuple[str, str], _Route] = {
+            ("POST", ""): self._commit,
+            ("PATCH", ""): self._update_dataset,
+            ("DELETE", ""): self._delete_dataset,
+            ("GET", "segments"): self._list_segments,
+            ("POST", "segments"): self._create_segment,
+            ("DELETE", "segments"): self._delete_segment,
+            ("GET", "labels/catalogs"): self._get_catalog,
+            ("PUT", "labels/catalogs"): self._put_catalog,
+            ("GET", "policies"): self._get_policy,
+            ("PUT", "callback"): self._callback,
+            ("PUT", "multi/callback"): self._multi_callback,
+            ("PUT", "labels"): self._put_label,
+            ("PUT", "multi/data/labels"): self._put_multi_labels,
+            ("GET", "labels"): self._list_labels,
+            ("GET", "data"): self._list_data,
+            ("DELETE", "data"): self._delete_data,
+            ("GET", "data/urls"): self._get_url,
+            ("POST", "multi/data/urls"): self._get_multi_urls,
+            ("GET", "sensors"): self._list_sensors,
+            ("POST", "sensors"): self._create_sensor,
+            ("DELETE", "sensors"): self._delete_sensor,
+            ("POST", "multipart/uploads"): self._create_multipart_upload,
+            ("GET", "multipart/urls"): self._get_part_urls,
+            ("POST", "multipart/complete"): self._complete_multipart_upload,
+            ("DELETE", "multipart/uploads"): self._abort_multipart_upload,
+        }
+
+    def __enter__(self: _S) -> _S:
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the server socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, method: str, path: str, headers: Any, body: bytes) -> _Response:
+        """Handle a request received by the server.
+
+        Arguments:
+            method: The method of the request.
+            path: The path of the request including the query.
+            headers: The headers of the request.
+            body: The decompressed body of the request.
+
+        Returns:
+            The status code, the headers and the content of the response,
+            the content is dumped as json if it is not bytes.
+
+        """
+        url = urlsplit(path)
+        if url.path.startswith(_OBJECT_PREFIX):
+            self._count(method, "(object)")
+            time.sleep(self.object_latency)
+            if self.object_error_rate:
+                with self._lock:
+                    failed = self._random.random() < self.object_error_rate
+                if failed:
+                    return self.error_status, {}, b"InjectedError"
+            return self._handle_object(method, url, headers, body)
+
+        if url.path.startswith(_OPEN_API_PREFIX):
+            return self._handle_open_api(method, url, headers, body)
+
+        return 404, {}, {"code": "NotFound", "message": url.path}
+
+    def _count(self, method: str, section: str) -> None:
+        with self._lock:
+            self.request_counts[method, section] += 1
+
+    def _handle_open_api(
+        self, method: str, url: SplitResult, headers: Any, body: bytes
+    ) -> _Response:
+        dataset_id, _, section = url.path[len(_OPEN_API_PREFIX) :].lstrip("/").partition("/")
+        self._count(method, section)
+
+        with self._lock:
+            if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+                return 429, {"Retry-After": str(self.retry_after)}, {"code": "TooManyRequests"}
+            self._in_flight += 1
+            failed = self._random.random() < self.error_rate
+
+        try:
+            time.sleep(self.latency)
+            if failed:
+                return self.error_status, {}, {"code": "InjectedError"}
+            if section in self.unsupported_sections:
+                return 404, {}, {"code": "NotFound", "message": section}
+            if not headers.get("X-Token"):
+                return 401, {}, {"code": "Unauthorized"}
+
+            json_data = json.loads(body) if body else None
+            query = parse_qs(url.query)
+            with self._lock:
+                return 200, {}, self._route((method, section), dataset_id, query, json_data)
+        except _FakeError as error:
+            return error.status_code, {}, {"code": error.code, "message": str(error)}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _route(
+        self,
+        key: Tuple[str, str],
+        dataset_id: str,
+        query: Dict[str, List[str]],
+        json_data: Any,
+    ) -> Any:
+        if not dataset_id:
+            if key[0] == "GET":
+                return self._list_datasets(query)
+            if key[0] == "POST":
+                return self._create_dataset(json_data)
+            raise _FakeError(405, "MethodNotAllowed")
+
+        dataset = self._datasets.get(dataset_id)
+        if not dataset:
+            raise _FakeError(404, "DatasetNotFound", dataset_id)
+
+        route = self._routes.get(key)
+        if not route:
+            raise _FakeError(404, "NotFound", " ".join(key))
+        return route(dataset, query, json_data)
+
+    @staticmethod
+    def _get_segment(dataset: _Dataset, name: str) -> _Segment:
+        try:
+            return dataset.segments[name]
+        except KeyError as error:
+            raise _FakeError(404, "SegmentNotFound", name) from error
+
+    @staticmethod
+    def _get_data(segment: _Segment, remote_path: str) -> Dict[str, Any]:
+        try:
+            return segment.data[remote_path]
+        except KeyError as error:
+            raise _FakeError(404, "DataNotFound", remote_path) from error
+
+    def _object_url(self, key: str) -> str:
+        return f"{self.url}{_OBJECT_PREFIX.lstrip('/')}{quote(key)}"
+
+    # Datasets.
+
+    def _list_datasets(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        names = query.get("name")
+        name = names[0] if names else None
+        datasets = [
+            {"id": dataset.dataset_id, "name": dataset.name, "type": int(dataset.is_fusion)}
+            for dataset in self._datasets.values()
+            if name is None or dataset.name == name
+        ]
+        return _get_page(datasets, "datasets", query)
+
+    def _create_dataset(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
+        name = post_data["name"]
+        if any(dataset.name == name for dataset in self._datasets.values()):
+            raise _FakeError(400, "DatasetNameExists", name)
+
+        dataset_id = f"dataset{next(self._ids):08}"
+        self._datasets[dataset_id] = _Dataset(dataset_id, name, bool(post_data.get("type")))
+        return {"id": dataset_id}
+
+    def _commit(self, dataset: _Dataset, *_: Any) -> Dict[str, Any]:
+        commit_id = f"commit{next(self._ids):08}"
+        dataset.commits.append(commit_id)
+        return {"commitId": commit_id}
+
+    @staticmethod
+    def _update_dataset(dataset: _Dataset, _: Any, patch_data: Dict[str, Any]) -> Any:
+        if "name" in patch_data:
+            dataset.name = patch_data["name"]
+        dataset.description = patch_data.get("description", dataset.description)
+        dataset.is_continuous = patch_data.get("isContinuous", dataset.is_continuous)
+        return {}
+
+    def _delete_dataset(self, dataset: _Dataset, *_: Any) -> Any:
+        del self._datasets[dataset.dataset_id]
+        return {}
+
+    # Segments.
+
+    @staticmethod
+    def _list_segments(dataset: _Dataset, query: Dict[str, List[str]], _: Any) -> Any:
+        segments = [{"name": name} for name in dataset.segments]
+        return _get_page(segments, "segments", query)
+
+    def _create_segment(self, dataset: _Dataset, _: Any, post_data: Dict[str, Any]) -> Any:
+        name = post_data["name"]
+        if name in dataset.segments:
+            raise _FakeError(400, "SegmentNameExists", name)
+
+        object_prefix = f"{dataset.dataset_id}/segment{next(self._ids):08}/"
+        dataset.segments[name] = _Segment(name, object_prefix)
+        self._prefixes[object_prefix] = (dataset.dataset_id, name)
+        return {}
+
+    def _delete_segment(self, dataset: _Dataset, _: Any, delete_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, delete_data["segmentName"])
+        del dataset.segments[segment.name]
+        return {}
+
+    # Catalog.
+
+    @staticmethod
+    def _get_catalog(dataset: _Dataset, *_: Any) -> Any:
+        return {"catalog": dataset.catalog}
+
+    @staticmethod
+    def _put_catalog(dataset: _Dataset, _: Any, put_data: Dict[str, Any]) -> Any:
+        dataset.catalog = put_data
+        return {}
+
+    # Uploading.
+
+    def _get_policy(self, dataset: _Dataset, query: Dict[str, List[str]], _: Any) -> Any:
+        segment = self._get_segment(dataset, _get_param(query, "segmentName"))
+        expired = int(query.get("expired", ["60"])[0])
+        return {
+            "result": {
+                "policy": "fake-policy",
+                "signature": "fake-signature",
+                "x:category": "",
+                "x:id": "",
+            },
+            "extra": {
+                "host": self._object_url(""),
+                "objectPrefix": segment.object_prefix,
+            },
+            "expireAt": time.time() + expired,
+        }
+
+    def _synchronize(self, dataset: _Dataset, callback_body: Dict[str, Any]) -> None:
+        key = callback_body["key"]
+        if key not in self._objects:
+            raise _FakeError(404, "ObjectNotFound", key)
+
+        dataset_part, segment_part, remote_path = key.split("/", 2)
+        dataset_id, segment_name = self._prefixes[f"{dataset_part}/{segment_part}/"]
+        if dataset_id != dataset.dataset_id:
+            raise _FakeError(400, "ObjectNotInDataset", key)
+
+        segment = self._get_segment(dataset, segment_name)
+        contents: Dict[str, Any] = {"remotePath": remote_path, "label": {}, "key": key}
+        if dataset.is_fusion:
+            contents["sensorName"] = callback_body["sensorName"]
+            contents["frameId"] = callback_body["frameId"]
+        if "timestamp" in callback_body:
+            contents["timestamp"] = callback_body["timestamp"]
+
+        previous = segment.data.get(remote_path)
+        if previous:
+            contents["label"] = previous["label"]
+        segment.data[remote_path] = contents
+        segment.modify()
+
+    def _callback(self, dataset: _Dataset, _: Any, put_data: Dict[str, Any]) -> Any:
+        self._synchronize(dataset, put_data)
+        return {}
+
+    def _multi_callback(self, dataset: _Dataset, _: Any, put_data: Dict[str, Any]) -> Any:
+        for callback_body in put_data["callbackBodies"]:
+            self._synchronize(dataset, callback_body)
+        return {}
+
+    def _put_label(self, dataset: _Dataset, _: Any, put_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, put_data["segmentName"])
+        self._get_data(segment, put_data["remotePath"])["label"] = put_data["label"]
+        segment.modify()
+        return {}
+
+    def _put_multi_labels(self, dataset: _Dataset, _: Any, put_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, put_data["segmentName"])
+        for label in put_data["objects"]:
+            self._get_data(segment, label["remotePath"])["label"] = label["label"]
+        segment.modify()
+        return {}
+
+    # Listing.
+
+    def _list_items(self, dataset: _Dataset, query: Dict[str, List[str]], key: str) -> Any:
+        segment = self._get_segment(dataset, _get_param(query, "segmentName"))
+        page = _get_page(segment.get_items(dataset.is_fusion), key, query)
+        page[key] = [_public_contents(item) for item in page[key]]
+        return page
+
+    def _list_labels(self, dataset: _Dataset, query: Dict[str, List[str]], _: Any) -> Any:
+        return self._list_items(dataset, query, "labels")
+
+    def _list_data(self, dataset: _Dataset, query: Dict[str, List[str]], _: Any) -> Any:
+        return self._list_items(dataset, query, "data")
+
+    def _delete_data(self, dataset: _Dataset, _: Any, delete_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, delete_data["segmentName"])
+        for remote_path in delete_data["remotePaths"]:
+            segment.data.pop(remote_path, None)
+        segment.modify()
+        return {}
+
+    def _get_url(self, dataset: _Dataset, query: Dict[str, List[str]], _: Any) -> Any:
+        segment = self._get_segment(dataset, _get_param(query, "segmentName"))
+        data = self._get_data(segment, _get_param(query, "remotePath"))
+        return {"url": self._object_url(data["key"])}
+
+    def _get_multi_urls(self, dataset: _Dataset, _: Any, post_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, post_data["segmentName"])
+        urls = []
+        for remote_path in post_data["remotePaths"]:
+            key = self._get_data(segment, remote_path)["key"]
+            urls.append({"remotePath": remote_path, "url": self._object_url(key)})
+        return {"urls": urls}
+
+    # Sensors.
+
+    def _list_sensors(self, dataset: _Dataset, query: Dict[str, List[str]], _: Any) -> Any:
+        segment = self._get_segment(dataset, _get_param(query, "segmentName"))
+        return {"sensors": list(segment.sensors.values())}
+
+    def _create_sensor(self, dataset: _Dataset, _: Any, post_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, post_data.pop("segmentName"))
+        segment.sensors[post_data["name"]] = post_data
+        return {}
+
+    def _delete_sensor(self, dataset: _Dataset, _: Any, delete_data: Dict[str, Any]) -> Any:
+        segment = self._get_segment(dataset, delete_data["segmentName"])
+        segment.sensors.pop(delete_data["sensorName"], None)
+        return {}
+
+    # Multipart uploading.
+
+    def _create_multipart_upload(self, dataset: _Dataset, _: Any, post_data: Any) -> Any:
+        segment = self._get_segment(dataset, post_data["segmentName"])
+        upload_id = f"upload{next(self._ids):08}"
+        self._uploads[upload_id] = {}
+        return {"uploadId": upload_id, "key": segment.object_prefix + post_data["remotePath"]}
+
+    def _get_part_urls(self, _: _Dataset, query: Dict[str, List[str]], __: Any) -> Any:
+        upload_id = _get_param(query, "uploadId")
+        url = self._object_url(_get_param(query, "key"))
+        part_count = int(_get_param(query, "partCount"))
+        urls = [
+            f"{url}?uploadId={upload_id}&partNumber={index}" for index in range(1, part_count + 1)
+        ]
+        return {"urls": urls}
+
+    def _complete_multipart_upload(self, _: _Dataset, __: Any, post_data: Any) -> Any:
+        parts = self._uploads.pop(post_data["uploadId"], None)
+        if parts is None:
+            raise _FakeError(404, "NoSuchUpload", post_data["uploadId"])
+
+        contents = []
+        for part in post_data["parts"]:
+            content = parts.get(part["partNumber"])
+            if content is None or hashlib.md5(content).hexdigest() != part["etag"]:
+                raise _FakeError(400, "InvalidPart", str(part["partNumber"]))
+            contents.append(content)
+
+        digests = b"".join(hashlib.md5(content).digest() for content in contents)
+        etag = f"{hashlib.md5(digests).hexdigest()}-{len(contents)}"
+        version_id = self._put_object(post_data["key"], b"".join(contents), etag)
+        return {"versionId": version_id, "etag": etag}
+
+    def _abort_multipart_upload(self, _: _Dataset, __: Any, delete_data: Any) -> Any:
+        self._uploads.pop(delete_data["uploadId"], None)
+        return {}
+
+    # Object storage.
+
+    def _put_object(self, key: str, content: bytes, etag: str) -> str:
+        version_id = f"version{next(self._ids):08}"
+        self._objects[key] = (content, etag)
+        return version_id
+
+    def _handle_object(self, method: str, url: SplitResult, headers: Any, body: bytes) -> _Response:
+        key = unquote(url.path[len(_OBJECT_PREFIX) :])
+        query = parse_qs(url.query)
+        with self._lock:
+            if method == "POST" and not key:
+                form = _parse_form(headers["Content-Type"], body)
+                key, content = form["key"].decode(), form["file"]
+                etag = hashlib.md5(content).hexdigest()
+                version_id = self._put_object(key, content, etag)
+                response_headers = {
+                    "Server": "AmazonS3",
+                    "x-amz-version-id": version_id,
+                    "ETag": f'"{etag}"',
+                }
+                return 200, response_headers, b""
+
+            if method == "PUT" and "uploadId" in query:
+                parts = self._uploads.get(query["uploadId"][0])
+                if parts is None:
+                    return 404, {}, b"NoSuchUpload"
+                parts[int(query["partNumber"][0])] = body
+                return 200, {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}, b""
+
+            if method in ("GET", "HEAD") and key in self._objects:
+                content, etag = self._objects[key]
+                return 200, {"ETag": f'"{etag}"'}, content
+
+        return 404, {}, b"NoSuchKey"
+
+
+def _public_contents(contents: Dict[str, Any]) -> Dict[str, Any]:
+    if "frame" in contents:
+        return {
+            "frameId": contents["frameId"],
+            "frame": [_public_contents(data) for data in contents["frame"]],
+        }
+    return {key: value for key, value in contents.items() if key != "key"}
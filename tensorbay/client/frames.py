@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Function iter_frame_data and upload_frames.
+
+:meth:`iter_frame_data` gets the sensor data to upload in a frame and their frame info.
+
+:meth:`upload_frames` uploads the frames with the sensor data as the unit of work,
+which is used by :class:`~tensorbay.client.segment.FusionSegmentClient`.
+
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import ulid
+
+from ..dataset import Data, Frame
+from .journal import UploadedFrames
+from .requests import TransferSummary, multithread_upload
+
+_FrameData = Tuple[Data, Dict[str, Any]]
+
+
+def iter_frame_data(
+    frame: Frame,
+    timestamp: Optional[float],
+    segment_name: str,
+    uploaded: Optional[UploadedFrames] = None,
+) -> Iterator[_FrameData]:
+    """Get the sensor data to upload in the frame and their frame info.
+
+    Arguments:
+        frame: The frame to upload.
+        timestamp: The timestamp for generating the frame ID when the frame has no ID.
+        segment_name: The name of the segment which the frame belongs to.
+        uploaded: The uploaded sensor data to skip, a partially uploaded frame
+            without frame ID reuses the frame ID generated in the previous upload.
+
+    Yields:
+        The sensor data and the frame info for the callback.
+
+    Raises:
+        TypeError: When the frame has no frame ID and timestamp, or has both.
+
+    """
+    if timestamp is None:
+        try:
+            frame_id = frame.frame_id
+        except AttributeError as error:
+            raise TypeError(
+                "Lack frame id, please add frame id in frame or give timestamp to the function!"
+            ) from error
+    elif hasattr(frame, "frame_id"):
+        raise TypeError("Frame id conflicts, please do not give timestamp to the function!.")
+    else:
+        previous_id = uploaded.get_frame_id(timestamp) if uploaded else None
+        frame_id = previous_id if previous_id else str(ulid.from_timestamp(timestamp))
+
+    for sensor_name, data in frame.items():
+        if not isinstance(data, Data):
+            continue
+        if uploaded and uploaded.contains(frame_id, sensor_name):
+            continue
+
+        frame_info: Dict[str, Any] = {
+            "segmentName": segment_name,
+            "sensorName": sensor_name,
+            "frameId": frame_id,
+        }
+        if hasattr(data, "timestamp"):
+            frame_info["timestamp"] = data.timestamp
+
+        yield data, frame_info
+
+
+def upload_frames(
+    function: Callable[[Data, Dict[str, Any]], None],
+    frames: Iterable[Tuple[Frame, List[_FrameData]]],
+    *,
+    jobs: Union[int, str] = 1,
+    fail_fast: bool = True,
+) -> TransferSummary[Frame]:
+    """Upload the frames with the sensor data as the unit of work.
+
+    The sensor data of all the frames share the workers, so a frame with many sensors
+    is uploaded by several workers, and the concurrency counts the sensor files
+    instead of the frames. A frame succeeds when all its sensor data are uploaded.
+
+    Arguments:
+        function: The function uploading a sensor data with its frame info.
+        frames: The frames and their sensor data to upload, which are pulled lazily.
+        jobs: The number of the max workers, or "auto" to adjust the concurrency adaptively.
+        fail_fast: Whether to stop and raise the exception when the first upload fails.
+            If False, the failed frames are collected in the returned summary.
+
+    Returns:
+        The :class:`~tensorbay.client.requests.TransferSummary` of the frames.
+
+    """
+    summary: TransferSummary[Frame] = TransferSummary()
+    remaining: Dict[int, int] = {}
+    failed: Set[int] = set()
+    lock = threading.Lock()
+
+    def _iter_work() -> Iterator[Tuple[Frame, Data, Dict[str, Any]]]:
+        for frame, work in frames:
+            with lock:
+                if not work:
+                    summary.succeeded += 1
+                    continue
+                remaining[id(frame)] = len(work)
+            for data, frame_info in work:
+                yield frame, data, frame_info
+
+    def _upload(work: Tuple[Frame, Data, Dict[str, Any]]) -> None:
+        frame, data, frame_info = work
+        frame_key = id(frame)
+        try:
+            function(data, frame_info)
+        except BaseException as error:
+            with lock:
+                if frame_key not in failed:
+                    failed.add(frame_key)
+                    summary.failures.append((frame, error))
+            raise
+        finally:
+            with lock:
+                remaining[frame_key] -= 1
+                if not remaining[frame_key]:
+                    del remaining[frame_key]
+                    if frame_key in failed:
+                        failed.remove(frame_key)
+                    else:
+                        summary.succeeded += 1
+
+    multithread_upload(_upload, _iter_work(), jobs=jobs, fail_fast=fail_fast)
+    return summary
@@ -13,15 +13,21 @@ AccessKey is required when operating with dataset.
 
 """
 
+import os
 import sys
+from functools import partial
+from hashlib import sha1
 from typing import Any, Dict, Iterator, Optional, Tuple, Type, Union, overload
 
 from typing_extensions import Literal
 
-from ..dataset import Dataset, FusionDataset
+from ..dataset import Data, Dataset, FusionDataset
+from ..utility import json_loads
 from .dataset import DatasetClient, FusionDatasetClient
 from .exceptions import GASDatasetError, GASDatasetTypeError
-from .requests import Client, paging_range
+from .names import DatasetNameCache
+from .requests import Client, paging_list
+from .scheduler import UploadProgress, UploadScheduler
 
 DatasetClientType = Union[DatasetClient, FusionDatasetClient]
 
@@ -35,18 +41,38 @@ class GAS:
     Arguments:
         access_key: User's access key.
         url: The host URL of the gas website.
+        dataset_name_cache: The cache of the dataset IDs and types by the dataset names,
+            default is an in-memory :class:`~tensorbay.client.names.DatasetNameCache`.
+        shared_permission: Whether the dataset clients share one upload permission across
+            all the segments of a dataset, only set it when the server issues
+            dataset-wide permissions.
 
     """
 
     _VERSIONS = {1: "COMMUNITY", 2: "ENTERPRISE"}
 
-    def __init__(self, access_key: str, url: str = "") -> None:
+    def __init__(
+        self,
+        access_key: str,
+        url: str = "",
+        *,
+        dataset_name_cache: Optional[DatasetNameCache] = None,
+        shared_permission: bool = False,
+    ) -> None:
         self._client = Client(access_key, url)
+        self._shared_permission = shared_permission
+        self._dataset_name_cache = (
+            dataset_name_cache if dataset_name_cache is not None else DatasetNameCache()
+        )
+        # The access key is hashed, since the cache can be persisted into a file.
+        self._namespace = sha1(f"{url}\n{access_key}".encode("utf-8")).hexdigest()
 
     def _get_dataset(self, name: str, commit_id: Optional[str] = None) -> DatasetClientType:
         dataset_id, is_fusion = self._get_dataset_id_and_type(name)
         ReturnType: Type[DatasetClientType] = FusionDatasetClient if is_fusion else DatasetClient
-        return ReturnType(name, dataset_id, self._client, commit_id)
+        return ReturnType(
+            name, dataset_id, self._client, commit_id, shared_permission=self._shared_permission
+        )
 
     def _list_datasets(
         self,
@@ -56,6 +82,7 @@ class GAS:
         start: int = 0,
         stop: int = sys.maxsize,
         page_size: int = 128,
+        jobs: int = 1,
     ) -> Iterator[Dict[str, Any]]:
 
         params: Dict[str, Any] = {}
@@ -64,11 +91,15 @@ class GAS:
         if need_team_dataset:
             params["needTeamDataset"] = need_team_dataset
 
-        for params["offset"], params["limit"] in paging_range(start, stop, page_size):
-            response = self._client.open_api_do("GET", "", params=params).json()
-            yield from response["datasets"]
-            if response["recordSize"] + response["offset"] >= response["totalCount"]:
-                break
+        def _request(offset: int, limit: int) -> Dict[str, Any]:
+            response = self._client.open_api_do(
+                "GET", "", params={**params, "offset": offset, "limit": limit}
+            )
+            return json_loads(response.content)  # type: ignore[no-any-return]
+
+        return paging_list(
+            _request, "datasets", start=start, stop=stop, page_size=page_size, jobs=jobs
+        )
 
     def _get_dataset_id_and_type(self, name: str) -> Tuple[str, bool]:
         """Get the ID and the type of the TensorBay dataset with the input name.
@@ -86,15 +117,18 @@ class GAS:
         if not name:
             raise GASDatasetError(name)
 
+        cached = self._dataset_name_cache.get(self._namespace, name)
+        if cached:
+            return cached
+
         try:
             info = next(self._list_datasets(name))
         except StopIteration as error:
             raise GASDatasetError(name) from error
 
-        return (
-            info["id"],
-            bool(info["type"]),
-        )
+        dataset_id, is_fusion = info["id"], bool(info["type"])
+        self._dataset_name_cache.set(self._namespace, name, dataset_id, is_fusion)
+        return dataset_id, is_fusion
 
     @overload
     def create_dataset(
@@ -154,8 +188,10 @@ class GAS:
             post_data["region"] = region
 
         response = self._client.open_api_do("POST", "", json=post_data)
+        dataset_id = json_loads(response.content)["id"]
+        self._dataset_name_cache.set(self._namespace, name, dataset_id, is_fusion)
         ReturnType: Type[DatasetClientType] = FusionDatasetClient if is_fusion else DatasetClient
-        return ReturnType(name, response.json()["id"], self._client)
+        return ReturnType(name, dataset_id, self._client, shared_permission=self._shared_permission)
 
     @overload
     def get_dataset(
@@ -197,20 +233,25 @@ class GAS:
         if is_fusion != type_flag:
             raise GASDatasetTypeError(name, type_flag)
         ReturnType: Type[DatasetClientType] = FusionDatasetClient if is_fusion else DatasetClient
-        return ReturnType(name, dataset_id, self._client, commit_id)
+        return ReturnType(
+            name, dataset_id, self._client, commit_id, shared_permission=self._shared_permission
+        )
 
-    def list_dataset_names(self, *, start: int = 0, stop: int = sys.maxsize) -> Iterator[str]:
+    def list_dataset_names(
+        self, *, start: int = 0, stop: int = sys.maxsize, jobs: int = 1
+    ) -> Iterator[str]:
         """List names of all TensorBay datasets.
 
         Arguments:
             start: The index to start.
             stop: The index to stop.
+            jobs: The number of the max workers for requesting pages concurrently.
 
         Yields:
             Names of all datasets.
 
         """
-        yield from (item["name"] for item in self._list_datasets(start=start, stop=stop))
+        yield from (item["name"] for item in self._list_datasets(start=start, stop=stop, jobs=jobs))
 
     def rename_dataset(self, name: str, new_name: str) -> None:
         """Rename a TensorBay Dataset with given name.
@@ -220,17 +261,22 @@ class GAS:
             new_name: New name of the dataset, unique for a user.
 
         """
-        dataset_id, _ = self._get_dataset_id_and_type(name)
+        dataset_id, is_fusion = self._get_dataset_id_and_type(name)
         patch_data: Dict[str, str] = {"name": new_name}
         self._client.open_api_do("PATCH", "", dataset_id, json=patch_data)
+        self._dataset_name_cache.remove(self._namespace, name)
+        self._dataset_name_cache.set(self._namespace, new_name, dataset_id, is_fusion)
 
     @overload
     def upload_dataset(
         self,
         dataset: Dataset,
         *,
-        jobs: int = 1,
+        jobs: Union[int, str] = 1,
         skip_uploaded_files: bool = False,
+        order: Literal["interleave", "sequential", "size"] = "interleave",
+        progress: Optional[UploadProgress] = None,
+        max_bytes_in_flight: Optional[int] = None,
     ) -> DatasetClient:
         ...
 
@@ -239,8 +285,11 @@ class GAS:
         self,
         dataset: FusionDataset,
         *,
-        jobs: int = 1,
+        jobs: Union[int, str] = 1,
         skip_uploaded_files: bool = False,
+        order: Literal["interleave", "sequential", "size"] = "interleave",
+        progress: Optional[UploadProgress] = None,
+        max_bytes_in_flight: Optional[int] = None,
     ) -> FusionDatasetClient:
         ...
 
@@ -249,17 +298,23 @@ class GAS:
         self,
         dataset: Union[Dataset, FusionDataset],
         *,
-        jobs: int = 1,
+        jobs: Union[int, str] = 1,
         skip_uploaded_files: bool = False,
+        order: Literal["interleave", "sequential", "size"] = "interleave",
+        progress: Optional[UploadProgress] = None,
+        max_bytes_in_flight: Optional[int] = None,
     ) -> DatasetClientType:
         ...
 
-    def upload_dataset(
+    def upload_dataset(  # pylint: disable=too-many-arguments
         self,
         dataset: Union[Dataset, FusionDataset],
         *,
-        jobs: int = 1,
+        jobs: Union[int, str] = 1,
         skip_uploaded_files: bool = False,
+        order: Literal["interleave", "sequential", "size"] = "interleave",
+        progress: Optional[UploadProgress] = None,
+        max_bytes_in_flight: Optional[int] = None,
     ) -> DatasetClientType:
         """Upload a local dataset to TensorBay.
 
@@ -271,11 +326,22 @@ class GAS:
             - Upload all :class:`~tensorbay.dataset.segment.Segment`
                 or :class:`~tensorbay.dataset.segment.FusionSegment` in the dataset to TensorBay.
 
+        All the segments and sensors are created before uploading the data,
+        then the data of all the segments are uploaded by the same workers
+        of an :class:`~tensorbay.client.scheduler.UploadScheduler`.
+
         Arguments:
             dataset: The :class:`~tensorbay.dataset.dataset.Dataset` or
                 :class:`~tensorbay.dataset.dataset. FusionDataset` needs to be uploaded.
-            jobs: The number of the max workers in multi-thread upload.
+            jobs: The number of the max workers in multi-thread upload,
+                or "auto" to adjust the concurrency adaptively.
             skip_uploaded_files: Set it to True to skip the uploaded files.
+            order: The order of uploading the data of the segments,
+                see :class:`~tensorbay.client.scheduler.UploadScheduler`.
+            progress: The :class:`~tensorbay.client.scheduler.UploadProgress` to record
+                the per-segment and the total progress into.
+            max_bytes_in_flight: The max total size of the local files being uploaded
+                at the same time, None for no limit.
 
         Returns:
             The :class:`~tensorbay.client.dataset.DatasetClient` or
@@ -288,13 +354,26 @@ class GAS:
         if dataset.catalog:
             dataset_client.upload_catalog(dataset.catalog)
 
+        scheduler = UploadScheduler(order, progress, max_bytes_in_flight=max_bytes_in_flight)
         for segment in dataset:
-            dataset_client.upload_segment(
+            # pylint: disable=protected-access
+            segment_client, function, arguments, total = dataset_client._prepare_upload(
                 segment,  # type: ignore[arg-type]
                 jobs=jobs,
                 skip_uploaded_files=skip_uploaded_files,
             )
+            # The callbacks are flushed by the uploading threads instead of a background thread
+            # of every segment, and the context of a segment is only entered while it is uploaded.
+            scheduler.add(
+                segment.name,
+                function,
+                arguments,
+                _get_local_size,
+                total=total,
+                context=partial(segment_client.batch_callbacks, interval=None),
+            )
 
+        scheduler.run(jobs=jobs)
         return dataset_client
 
     def delete_dataset(self, name: str) -> None:
@@ -306,3 +385,10 @@ class GAS:
         """
         dataset_id, _ = self._get_dataset_id_and_type(name)
         self._client.open_api_do("DELETE", "", dataset_id)
+        self._dataset_name_cache.remove(self._namespace, name)
+
+
+def _get_local_size(argument: Any) -> int:
+    # The argument is the data of a segment, or the data and its frame info of a fusion segment.
+    data: Data = argument[0] if isinstance(argument, tuple) else argument
+    return os.path.getsize(data.path)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class UploadJournal and UploadedFrames.
+
+:class:`UploadJournal` is an append-only local journal of the files uploaded into a segment,
+which allows a crashed upload to be resumed without listing the whole remote segment.
+
+:class:`UploadedFrames` is the uploaded sensor data of the frames in a fusion segment,
+which is loaded from the journal or the remote frame list for resuming a fusion segment upload.
+
+"""
+
+import json
+import os
+import threading
+from hashlib import sha1
+from types import TracebackType
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Set, Tuple, Type
+
+import ulid
+
+
+def default_journal_dir() -> str:
+    """Get the default directory of the upload journals.
+
+    Returns:
+        The default directory of the upload journals.
+
+    """
+    home = "USERPROFILE" if os.name == "nt" else "HOME"
+    return os.path.join(os.environ[home], ".gas", "journals")
+
+
+class UploadJournal:
+    """This class defines :class:`UploadJournal`.
+
+    Every line of the journal file is the JSON string of an uploaded remote path.
+    The lines of a record are appended by one write, and a partial line left by a crash
+    is ignored when the journal is loaded.
+
+    Arguments:
+        dataset_id: The ID of the dataset which the segment belongs to.
+        segment_name: The name of the segment.
+        directory: The directory to save the journals, default is :meth:`default_journal_dir`.
+
+    """
+
+    def __init__(self, dataset_id: str, segment_name: str, directory: Optional[str] = None) -> None:
+        if directory is None:
+            directory = default_journal_dir()
+
+        segment_key = sha1(segment_name.encode("utf-8")).hexdigest()
+        self.path = os.path.join(directory, dataset_id, f"{segment_key}.jsonl")
+        self._file: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "UploadJournal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _open(self) -> BinaryIO:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fp = open(self.path, "ab+")
+        # Terminate the partial line left by a crash, so it does not swallow the next record.
+        if fp.tell():
+            fp.seek(-1, os.SEEK_END)
+            if fp.read(1) != b"\n":
+                fp.write(b"\n")
+        return fp
+
+    def exists(self) -> bool:
+        """Check whether the journal file exists.
+
+        Returns:
+            Whether the journal file exists.
+
+        """
+        return os.path.exists(self.path)
+
+    def load(self) -> Set[str]:
+        """Load the recorded remote paths.
+
+        Returns:
+            The set of the recorded remote paths.
+
+        """
+        remote_paths: Set[str] = set()
+        try:
+            with open(self.path, "rb") as fp:
+                for line in fp:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        remote_paths.add(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+
+        return remote_paths
+
+    def record(self, remote_paths: Iterable[str]) -> None:
+        """Append the uploaded remote paths into the journal.
+
+        Arguments:
+            remote_paths: The uploaded remote paths.
+
+        """
+        lines = "".join(f"{json.dumps(remote_path)}\n" for remote_path in remote_paths)
+        if not lines:
+            return
+
+        with self._lock:
+            if not self._file:
+                self._file = self._open()
+            self._file.write(lines.encode("utf-8"))
+            self._file.flush()
+
+    def close(self) -> None:
+        """Sync the journal file to the disk and close it."""
+        with self._lock:
+            if not self._file:
+                return
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Remove the journal file."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def get_frame_key(frame_id: str, sensor_name: str) -> str:
+    """Get the journal record of the sensor data in a frame.
+
+    Arguments:
+        frame_id: The frame ID, which does not contain "/".
+        sensor_name: The sensor name.
+
+    Returns:
+        The journal record of the sensor data.
+
+    """
+    return f"{frame_id}/{sensor_name}"
+
+
+class UploadedFrames:
+    """This class defines :class:`UploadedFrames`.
+
+    The frames uploaded without frame IDs get the ULIDs generated from their timestamps,
+    so the frame IDs are also indexed by the timestamps of the ULIDs, and a partially uploaded
+    frame is resumed with its original frame ID.
+
+    Arguments:
+        pairs: The (frame ID, sensor name) pairs of the uploaded sensor data.
+
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()) -> None:
+        self._sensors: Dict[str, Set[str]] = {}
+        self._frame_ids: Dict[int, str] = {}
+        for frame_id, sensor_name in pairs:
+            self.add(frame_id, sensor_name)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._sensors.values()))
+
+    @classmethod
+    def from_journal(cls, journal: UploadJournal) -> "UploadedFrames":
+        """Load the uploaded sensor data from the journal.
+
+        Arguments:
+            journal: The journal recorded by :meth:`get_frame_key`.
+
+        Returns:
+            The loaded :class:`UploadedFrames`.
+
+        """
+        return cls(key.split("/", 1) for key in journal.load())  # type: ignore[misc]
+
+    def add(self, frame_id: str, sensor_name: str) -> None:
+        """Add an uploaded sensor data.
+
+        Arguments:
+            frame_id: The frame ID.
+            sensor_name: The sensor name.
+
+        """
+        sensors = self._sensors.get(frame_id)
+        if sensors is None:
+            sensors = self._sensors[frame_id] = set()
+            try:
+                self._frame_ids[ulid.from_str(frame_id).timestamp().int] = frame_id
+            except ValueError:
+                pass
+        sensors.add(sensor_name)
+
+    def contains(self, frame_id: str, sensor_name: str) -> bool:
+        """Check whether the sensor data of the frame is uploaded.
+
+        Arguments:
+            frame_id: The frame ID.
+            sensor_name: The sensor name.
+
+        Returns:
+            Whether the sensor data is uploaded.
+
+        """
+        return sensor_name in self._sensors.get(frame_id, ())
+
+    def get_frame_id(self, timestamp: float) -> Optional[str]:
+        """Get the ID of the uploaded frame whose ULID is generated from the timestamp.
+
+        Arguments:
+            timestamp: The timestamp of the frame.
+
+        Returns:
+            The frame ID, None if no frame of the timestamp is uploaded.
+
+        """
+        return self._frame_ids.get(ulid.from_timestamp(timestamp).timestamp().int)
+
+    def keys(self) -> Iterator[str]:
+        """Get the journal records of the uploaded sensor data.
+
+        Yields:
+            The journal records got by :meth:`get_frame_key`.
+
+        """
+        for frame_id, sensors in self._sensors.items():
+            for sensor_name in sensors:
+                yield get_frame_key(frame_id, sensor_name)
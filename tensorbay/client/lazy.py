@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class PagingList.
+
+:class:`PagingList` is a lazy sequence of the items in a paged Open API listing.
+The pages are requested on demand and the decoded pages are kept in an LRU cache,
+so accessing an item costs at most one page request instead of listing all the items.
+
+"""
+
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
+
+_T = TypeVar("_T")
+
+
+class PagingList(  # pylint: disable=too-many-ancestors, too-many-instance-attributes
+    MutableSequence[_T]
+):
+    """This class defines :class:`PagingList`.
+
+    The length is got from the "totalCount" of the first requested page.
+    The whole list is fetched and copied into a builtin list on the first modification,
+    and all the following operations are served by the copy.
+
+    Arguments:
+        request: The function which takes offset and limit and returns the response json.
+        key: The key of the listed items in the response json.
+        loads: The function which decodes the items in a page.
+        page_size: The page size of the paging request.
+        max_cached_pages: The max number of the decoded pages kept in the cache.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        request: Callable[[int, int], Dict[str, Any]],
+        key: str,
+        loads: Callable[[List[Dict[str, Any]]], List[_T]],
+        *,
+        page_size: int = 128,
+        max_cached_pages: int = 32,
+    ) -> None:
+        self._request = request
+        self._key = key
+        self._loads = loads
+        self._page_size = page_size
+        self._max_cached_pages = max_cached_pages
+
+        self._total_count: Optional[int] = None
+        self._pages: "OrderedDict[int, List[_T]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._data: Optional[List[_T]] = None
+
+    def __len__(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+
+        if self._total_count is None:
+            self._get_page(0)
+        return self._total_count  # type: ignore[return-value]
+
+    @overload
+    def __getitem__(self, index: int) -> _T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[_T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[List[_T], _T]:
+        if self._data is not None:
+            return self._data[index]
+
+        if isinstance(index, slice):
+            return [self._get_item(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        # The page is requested directly without getting the length first,
+        # so a random access costs only one request.
+        if index < 0 or self._total_count is not None and index >= self._total_count:
+            raise IndexError("PagingList index out of range")
+
+        page_index, offset = divmod(index, self._page_size)
+        page = self._get_page(page_index)
+        if offset >= len(page):
+            raise IndexError("PagingList index out of range")
+        return page[offset]
+
+    @overload
+    def __setitem__(self, index: int, value: _T) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[_T]) -> None:
+        ...
+
+    def __setitem__(self, index: Union[int, slice], value: Union[_T, Iterable[_T]]) -> None:
+        self._materialize().__setitem__(index, value)  # type: ignore[index, assignment]
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        self._materialize().__delitem__(index)
+
+    def __iter__(self) -> Iterator[_T]:
+        if self._data is not None:
+            yield from self._data
+            return
+
+        page_index = 0
+        while page_index * self._page_size < len(self):
+            yield from self._get_page(page_index)
+            page_index += 1
+
+    def _get_item(self, index: int) -> _T:
+        page_index, offset = divmod(index, self._page_size)
+        return self._get_page(page_index)[offset]
+
+    def _get_page(self, page_index: int) -> List[_T]:
+        with self._lock:
+            page = self._pages.get(page_index)
+            if page is not None:
+                self._pages.move_to_end(page_index)
+                return page
+
+        offset, limit = page_index * self._page_size, self._page_size
+        response = self._request(offset, limit)
+        total_count = response["totalCount"]
+        contents = []
+        while True:
+            contents.extend(response[self._key])
+            # The server may cap the page size, the rest of a short page is requested again,
+            # so every page except the last one holds ``page_size`` items.
+            record_size = response["recordSize"]
+            if not record_size or record_size >= limit or offset + record_size >= total_count:
+                break
+            offset += record_size
+            limit -= record_size
+            response = self._request(offset, limit)
+        page = self._loads(contents)
+
+        with self._lock:
+            self._total_count = total_count
+            self._pages[page_index] = page
+            while len(self._pages) > self._max_cached_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def _materialize(self) -> List[_T]:
+        if self._data is None:
+            self._data = list(self)
+            self._pages.clear()
+        return self._data
+
+    def insert(self, index: int, value: _T) -> None:
+        """Insert object before index.
+
+        Arguments:
+            index: Position of the list.
+            value: Element to be inserted into the list.
+
+        """
+        self._materialize().insert(index, value)
+
+    def sort(self, *, key: Callable[[_T], Any], reverse: bool = False) -> None:
+        """Sort the list in ascending order and return None.
+
+        Arguments:
+            key: The function to get the sorting key of an item.
+            reverse: The reverse flag can be set as True to sort in descending order.
+
+        """
+        self._materialize().sort(key=key, reverse=reverse)
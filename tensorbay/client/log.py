@@ -140,7 +140,9 @@ def _dump_request(request: PreparedRequest) -> str:
     """
     headers = _dump_headers(request.headers)
     body = "N/A"
-    if "Content-Type" in request.headers:
+    if "Content-Encoding" in request.headers and isinstance(request.body, bytes):
+        body = f"[{len(request.body)} bytes of {request.headers['Content-Encoding']} data]"
+    elif "Content-Type" in request.headers:
         if request.headers["Content-Type"].startswith("multipart/form-data"):
             body = _dump_multipart_encoder(request.body)
         elif isinstance(request.body, bytes):
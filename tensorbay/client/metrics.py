@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class MetricsRegistry.
+
+:class:`MetricsRegistry` records the requests sent by a :class:`~tensorbay.client.requests.Client`
+per endpoint, which is the pair of the request method and the Open API section,
+such as ("GET", "labels") and ("POST", "callback").
+
+The requests sent to the URLs outside the Open API, such as the object storage,
+are recorded in the :data:`EXTERNAL_SECTION`.
+
+The recorded metrics can be got by :meth:`MetricsRegistry.snapshot`,
+or dumped in the Prometheus text format by :meth:`MetricsRegistry.to_prometheus`.
+
+"""
+
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional, Sequence, Tuple
+
+EXTERNAL_SECTION = "(external)"
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_PREFIX = "tensorbay_client"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+class _EndpointMetrics:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    def __init__(self, bucket_count: int) -> None:
+        self.status_codes: DefaultDict[str, int] = defaultdict(int)
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.latency_sum = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.compressed_requests = 0
+        self.compression_saved_bytes = 0
+
+
+class MetricsRegistry:
+    """This class defines :class:`MetricsRegistry`.
+
+    Arguments:
+        buckets: The upper bounds in seconds of the latency histogram buckets.
+
+    """
+
+    def __init__(self, buckets: Sequence[float] = _DEFAULT_BUCKETS) -> None:
+        self._buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], _EndpointMetrics] = {}
+
+    def _get_endpoint(self, method: str, section: str) -> _EndpointMetrics:
+        key = (method, section)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = _EndpointMetrics(len(self._buckets))
+        return metrics
+
+    def record(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        section: str,
+        status: str,
+        latency: float,
+        *,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        retries: int = 0,
+    ) -> None:
+        """Record a finished request.
+
+        Arguments:
+            method: The method of the request.
+            section: The Open API section of the request.
+            status: The status code of the response, "error" if no response is received.
+            latency: The time in seconds spent on the request, including the retries.
+            bytes_sent: The size in bytes of the request body.
+            bytes_received: The size in bytes of the response body.
+            retries: The number of the retries of the request.
+
+        """
+        bucket_index = bisect_left(self._buckets, latency)
+        with self._lock:
+            metrics = self._get_endpoint(method, section)
+            metrics.status_codes[status] += 1
+            metrics.bucket_counts[bucket_index] += 1
+            metrics.latency_sum += latency
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            metrics.retries += retries
+
+    def record_compression(
+        self, method: str, section: str, raw_bytes: int, compressed_bytes: int
+    ) -> None:
+        """Record a request whose body is compressed.
+
+        Arguments:
+            method: The method of the request.
+            section: The Open API section of the request.
+            raw_bytes: The size in bytes of the body before the compression.
+            compressed_bytes: The size in bytes of the compressed body.
+
+        """
+        with self._lock:
+            metrics = self._get_endpoint(method, section)
+            metrics.compressed_requests += 1
+            metrics.compression_saved_bytes += raw_bytes - compressed_bytes
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get a snapshot of the recorded metrics.
+
+        Returns:
+            The dict whose keys are the endpoints like "GET labels", and values are the dicts
+            containing the request count, the status code counts, the latency sum in seconds,
+            the cumulative latency histogram, the bytes sent and received, the retry count,
+            the number of the compressed requests and the bytes saved by the compression.
+
+        """
+        snapshot = {}
+        with self._lock:
+            for (method, section), metrics in sorted(self._endpoints.items()):
+                cumulative_counts = []
+                count = 0
+                for bucket_count in metrics.bucket_counts:
+                    count += bucket_count
+                    cumulative_counts.append(count)
+
+                bounds: List[Optional[float]] = [*self._buckets, None]
+                snapshot[f"{method} {section}"] = {
+                    "method": method,
+                    "section": section,
+                    "count": count,
+                    "statusCodes": dict(metrics.status_codes),
+                    "latencySum": metrics.latency_sum,
+                    "latencyBuckets": list(zip(bounds, cumulative_counts)),
+                    "bytesSent": metrics.bytes_sent,
+                    "bytesReceived": metrics.bytes_received,
+                    "retries": metrics.retries,
+                    "compressedRequests": metrics.compressed_requests,
+                    "compressionSavedBytes": metrics.compression_saved_bytes,
+                }
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Dump the recorded metrics in the Prometheus text format.
+
+        Returns:
+            The metrics in the Prometheus text exposition format.
+
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {_PREFIX}_requests_total The number of the requests.",
+            f"# TYPE {_PREFIX}_requests_total counter",
+        ]
+        for endpoint in snapshot.values():
+            for status, count in sorted(endpoint["statusCodes"].items()):
+                labels = _format_labels(
+                    method=endpoint["method"], section=endpoint["section"], status=status
+                )
+                lines.append(f"{_PREFIX}_requests_total{{{labels}}} {count}")
+
+        name = f"{_PREFIX}_request_duration_seconds"
+        lines.append(f"# HELP {name} The latency of the requests including the retries.")
+        lines.append(f"# TYPE {name} histogram")
+        for endpoint in snapshot.values():
+            labels = _format_labels(method=endpoint["method"], section=endpoint["section"])
+            for bound, count in endpoint["latencyBuckets"]:
+                upper = "+Inf" if bound is None else repr(float(bound))
+                lines.append(f'{name}_bucket{{{labels},le="{upper}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {endpoint['latencySum']!r}")
+            lines.append(f"{name}_count{{{labels}}} {endpoint['count']}")
+
+        for key, metric, description in (
+            ("bytesSent", "sent_bytes_total", "The size in bytes of the request bodies."),
+            ("bytesReceived", "received_bytes_total", "The size in bytes of the response bodies."),
+            ("retries", "retries_total", "The number of the retries."),
+            (
+                "compressedRequests",
+                "compressed_requests_total",
+                "The number of the requests with compressed bodies.",
+            ),
+            (
+                "compressionSavedBytes",
+                "compression_saved_bytes_total",
+                "The size in bytes saved by compressing the request bodies.",
+            ),
+        ):
+            name = f"{_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for endpoint in snapshot.values():
+                labels = _format_labels(method=endpoint["method"], section=endpoint["section"])
+                lines.append(f"{name}{{{labels}}} {endpoint[key]}")
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Remove all the recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
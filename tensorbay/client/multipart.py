@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class MultipartUploader.
+
+:class:`MultipartUploader` uploads a large file as multiple parts concurrently,
+so the transfer is not limited to a single TCP stream and a failed part is retried
+without restarting the whole file.
+
+The multipart upload takes the following Open API requests:
+
+    1. ``POST multipart/uploads`` initiates the upload and returns the upload ID and the key.
+    2. ``GET multipart/urls`` returns the presigned URLs for uploading the parts.
+    3. The parts are uploaded by ``PUT`` requests to the presigned URLs.
+    4. ``POST multipart/complete`` merges the parts into the object.
+    5. ``DELETE multipart/uploads`` aborts the upload when it fails.
+
+"""
+
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from requests.exceptions import RequestException
+
+from ..utility import json_loads
+from .exceptions import GASResponseError
+from .requests import Client, default_config
+
+logger = logging.getLogger(__name__)
+
+
+class MultipartUploader:  # pylint: disable=too-few-public-methods
+    """This class defines :class:`MultipartUploader`.
+
+    The parts are read from a memory-mapped file without being copied,
+    so the memory cost does not grow with the file size.
+
+    Arguments:
+        client: The client used for sending request to TensorBay.
+        dataset_id: Dataset ID.
+        segment_name: Segment name.
+        part_size: The size of every part in bytes except the last one.
+        jobs: The number of the max workers for uploading parts concurrently.
+
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        dataset_id: str,
+        segment_name: str,
+        *,
+        part_size: Optional[int] = None,
+        jobs: Optional[int] = None,
+    ) -> None:
+        self._client = client
+        self._dataset_id = dataset_id
+        self._segment_name = segment_name
+        self._part_size = part_size if part_size is not None else default_config.part_size
+        self._jobs = jobs if jobs is not None else default_config.part_jobs
+
+    def _get_part_urls(self, upload_id: str, key: str, part_count: int) -> List[str]:
+        params = {"uploadId": upload_id, "key": key, "partCount": part_count}
+        response = self._client.open_api_do(
+            "GET", "multipart/urls", self._dataset_id, params=params
+        )
+        return json_loads(response.content)["urls"]  # type: ignore[no-any-return]
+
+    def _upload_part(self, url: str, view: memoryview, index: int) -> str:
+        # The failed part is retried by the retry strategy of the session.
+        part = view[index * self._part_size : (index + 1) * self._part_size]
+        try:
+            response = self._client.do("PUT", url, data=part)
+            return response.headers["ETag"].strip('"')
+        finally:
+            part.release()
+
+    def _upload_parts(self, urls: List[str], view: memoryview) -> List[str]:
+        with ThreadPoolExecutor(self._jobs) as executor:
+            futures = [
+                executor.submit(self._upload_part, url, view, index)
+                for index, url in enumerate(urls)
+            ]
+            try:
+                return [future.result() for future in futures]
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _complete(self, upload_id: str, key: str, etags: List[str]) -> Dict[str, Any]:
+        post_data = {
+            "uploadId": upload_id,
+            "key": key,
+            "parts": [{"partNumber": index, "etag": etag} for index, etag in enumerate(etags, 1)],
+        }
+        response = self._client.open_api_do(
+            "POST", "multipart/complete", self._dataset_id, json=post_data
+        )
+        return json_loads(response.content)  # type: ignore[no-any-return]
+
+    def _abort(self, upload_id: str, key: str) -> None:
+        delete_data = {"uploadId": upload_id, "key": key}
+        try:
+            self._client.open_api_do(
+                "DELETE", "multipart/uploads", self._dataset_id, json=delete_data
+            )
+        except (GASResponseError, RequestException) as error:
+            logger.warning("Failed to abort the multipart upload %s: %s", upload_id, error)
+
+    def upload(self, local_path: str, remote_path: str) -> Tuple[str, str, str]:
+        """Upload a local file by multipart upload.
+
+        Arguments:
+            local_path: The local path of the file to upload.
+            remote_path: The remote path of the file.
+
+        Returns:
+            The key, the version ID and the ETag of the uploaded object.
+
+        Raises:
+            BaseException: When the upload fails, the multipart upload is aborted
+                before the error is raised.
+
+        """
+        size = os.path.getsize(local_path)
+        part_count = max(-(-size // self._part_size), 1)
+
+        post_data = {
+            "segmentName": self._segment_name,
+            "remotePath": remote_path,
+            "partCount": part_count,
+        }
+        response = json_loads(
+            self._client.open_api_do(
+                "POST", "multipart/uploads", self._dataset_id, json=post_data
+            ).content
+        )
+        upload_id, key = response["uploadId"], response["key"]
+
+        try:
+            urls = self._get_part_urls(upload_id, key, part_count)
+            with open(local_path, "rb") as fp:
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        etags = self._upload_parts(urls, view)
+                    finally:
+                        view.release()
+
+            result = self._complete(upload_id, key, etags)
+        except BaseException:
+            self._abort(upload_id, key)
+            raise
+
+        return key, result["versionId"], result["etag"]
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class DatasetNameCache.
+
+:class:`DatasetNameCache` caches the IDs and the types of the TensorBay datasets by their names,
+so getting a dataset by name does not list the datasets every time.
+
+The cached entries expire after a TTL, since the datasets can be renamed or deleted by other
+clients. The cache can be persisted into a JSON file, which is shared by the CLI invocations.
+
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_Entries = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+class DatasetNameCache:
+    """This class defines :class:`DatasetNameCache`.
+
+    The entries are separated by namespaces, so the datasets of different accounts
+    do not conflict in a shared cache file.
+
+    Arguments:
+        path: The path of the JSON file where the cache is persisted, None for an in-memory cache.
+        ttl: The time to live in seconds of a cached entry.
+
+    """
+
+    def __init__(self, path: Optional[str] = None, *, ttl: float = 60) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Optional[_Entries] = None
+
+    def _read(self) -> _Entries:
+        if not self.path:
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as fp:
+                entries = json.load(fp)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logger.warning('Ignore the broken dataset name cache "%s": %s', self.path, error)
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: _Entries) -> None:
+        if not self.path:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            descriptor, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as fp:
+                json.dump(entries, fp)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            logger.warning('Failed to write the dataset name cache "%s": %s', self.path, error)
+
+    def _get_entries(self) -> _Entries:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _update(self, namespace: str, name: str, entry: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            # Merge into the latest file, so the entries written by other processes are kept.
+            entries = self._read() if self.path else self._get_entries()
+            now = time.time()
+            namespace_entries = {
+                key: value
+                for key, value in entries.get(namespace, {}).items()
+                if value["expireAt"] > now
+            }
+            if entry is None:
+                namespace_entries.pop(name, None)
+            else:
+                namespace_entries[name] = entry
+
+            entries[namespace] = namespace_entries
+            self._entries = entries
+            self._write(entries)
+
+    def get(self, namespace: str, name: str) -> Optional[Tuple[str, bool]]:
+        """Get the cached ID and type of a dataset.
+
+        Arguments:
+            namespace: The namespace of the cached entries.
+            name: The name of the dataset.
+
+        Returns:
+            The tuple of dataset ID and type (True for fusion dataset),
+            None if the dataset is not cached or the entry is expired.
+
+        """
+        with self._lock:
+            entry = self._get_entries().get(namespace, {}).get(name)
+
+        if not entry or entry["expireAt"] <= time.time():
+            return None
+        return entry["id"], entry["isFusion"]
+
+    def set(self, namespace: str, name: str, dataset_id: str, is_fusion: bool) -> None:
+        """Cache the ID and type of a dataset.
+
+        Arguments:
+            namespace: The namespace of the cached entries.
+            name: The name of the dataset.
+            dataset_id: The ID of the dataset.
+            is_fusion: Whether the dataset is a fusion dataset, True for fusion dataset.
+
+        """
+        if self.ttl > 0:
+            entry = {"id": dataset_id, "isFusion": is_fusion, "expireAt": time.time() + self.ttl}
+            self._update(namespace, name, entry)
+
+    def remove(self, namespace: str, name: str) -> None:
+        """Remove the cached ID and type of a dataset.
+
+        Arguments:
+            namespace: The namespace of the cached entries.
+            name: The name of the dataset.
+
+        """
+        self._update(namespace, name, None)
+
+    def clear(self) -> None:
+        """Remove all the cached entries."""
+        with self._lock:
+            self._entries = {}
+            self._write({})
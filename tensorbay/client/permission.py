@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class Permission and PermissionManager.
+
+:class:`Permission` is an immutable view of an upload permission (policy) got from TensorBay.
+
+:class:`PermissionManager` caches the upload permissions of the segments in a dataset
+and refreshes them in the background before they expire.
+
+"""
+
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Set
+
+from ..utility import json_loads
+from .requests import Client, default_config
+
+logger = logging.getLogger(__name__)
+
+
+class Permission:
+    """This class defines :class:`Permission`.
+
+    Arguments:
+        contents: The upload permission got from the "policies" Open API.
+
+    Attributes:
+        host: The host to post the files.
+        object_prefix: The prefix of the object keys.
+        expire_at: The expiration timestamp of the permission.
+
+    """
+
+    __slots__ = ("host", "object_prefix", "expire_at", "_result")
+
+    def __init__(self, contents: Dict[str, Any]) -> None:
+        extra = contents["extra"]
+        host = extra["host"]
+        if default_config.is_intern:
+            urlsplit = host.rsplit(".", 2)
+            urlsplit[0] += "-internal"
+            host = ".".join(urlsplit)
+
+        self.host: str = host
+        self.object_prefix: str = extra["objectPrefix"]
+        self.expire_at: float = contents["expireAt"]
+        self._result: Mapping[str, Any] = MappingProxyType(
+            {
+                key: value
+                for key, value in contents["result"].items()
+                if key not in ("x:category", "x:id")
+            }
+        )
+
+    @property
+    def result(self) -> Mapping[str, Any]:
+        """Return the read-only form fields of the permission.
+
+        Returns:
+            The read-only form fields of the permission.
+
+        """
+        return self._result
+
+    def get_post_data(self, remote_path: str) -> Dict[str, Any]:
+        """Get the form fields for posting the file with the given remote path.
+
+        Arguments:
+            remote_path: The remote path of the file.
+
+        Returns:
+            A new dict of the form fields including the object key.
+
+        """
+        post_data = dict(self._result)
+        post_data["key"] = self.object_prefix + remote_path
+        return post_data
+
+
+class PermissionManager:
+    """This class defines :class:`PermissionManager`.
+
+    The permission is only fetched in the calling thread when there is no valid one.
+    When a permission is about to expire, it is still returned while a new one
+    is fetched in a background thread, so the uploading threads are not blocked.
+
+    Arguments:
+        client: The client used for sending request to TensorBay.
+        dataset_id: Dataset ID.
+        shared: Whether to share one permission across all the segments of the dataset,
+            only set it when the server issues dataset-wide permissions.
+
+    """
+
+    _EXPIRED_IN_SECOND = 240
+    _REFRESH_AHEAD_IN_SECOND = 60
+
+    def __init__(self, client: Client, dataset_id: str, *, shared: bool = False) -> None:
+        self._client = client
+        self._dataset_id = dataset_id
+        self._shared = shared
+        self._permissions: Dict[Optional[str], Permission] = {}
+        self._fetch_locks: Dict[Optional[str], threading.Lock] = {}
+        self._refreshing: Set[Optional[str]] = set()
+        self._lock = threading.Lock()
+
+    def _fetch(self, key: Optional[str]) -> Permission:
+        params: Dict[str, Any] = {"expired": self._EXPIRED_IN_SECOND}
+        if key is not None:
+            params["segmentName"] = key
+
+        response = self._client.open_api_do("GET", "policies", self._dataset_id, params=params)
+        return Permission(json_loads(response.content))
+
+    def _refresh(self, key: Optional[str]) -> None:
+        try:
+            self._permissions[key] = self._fetch(key)
+        except Exception as error:  # pylint: disable=broad-except
+            # The permission is fetched again in the uploading thread after it expires.
+            logger.warning("Failed to refresh the upload permission in background: %s", error)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh_in_background(self, key: Optional[str]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(target=self._refresh, args=(key,), daemon=True).start()
+
+    def get(self, segment_name: str) -> Permission:
+        """Get a valid upload permission of the segment.
+
+        Arguments:
+            segment_name: The name of the segment.
+
+        Returns:
+            The upload permission.
+
+        """
+        key = None if self._shared else segment_name
+        permission = self._permissions.get(key)
+        now = time.time()
+        if permission and now < permission.expire_at:
+            if now >= permission.expire_at - self._REFRESH_AHEAD_IN_SECOND:
+                self._refresh_in_background(key)
+            return permission
+
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        with fetch_lock:
+            permission = self._permissions.get(key)
+            if permission and time.time() < permission.expire_at:
+                return permission
+
+            permission = self._fetch(key)
+            self._permissions[key] = permission
+            return permission
+
+    def invalidate(self, permission: Permission) -> None:
+        """Drop the given permission, so the next :meth:`PermissionManager.get` fetches a new one.
+
+        Arguments:
+            permission: The permission to drop.
+
+        """
+        with self._lock:
+            for key, value in list(self._permissions.items()):
+                if value is permission:
+                    del self._permissions[key]
+
+    def discard(self, segment_name: str) -> None:
+        """Drop the cached permission of the segment.
+
+        Arguments:
+            segment_name: The name of the segment.
+
+        """
+        with self._lock:
+            self._permissions.pop(None if self._shared else segment_name, None)
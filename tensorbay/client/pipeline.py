@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class Stage, Pipeline and UploadPipelineConfig.
+
+:class:`Pipeline` runs the items through a chain of :class:`Stage`, every stage has
+its own worker threads and is fed by a bounded queue, so the stages of different items
+overlap, such as reading the local files while the others are being transferred.
+
+:class:`UploadPipelineConfig` is the concurrency settings of the upload stages used by
+:meth:`DatasetClient.upload_segment() <tensorbay.client.dataset.DatasetClient.upload_segment>`
+and :meth:`FusionDatasetClient.upload_segment()
+<tensorbay.client.dataset.FusionDatasetClient.upload_segment>`.
+
+"""
+
+import logging
+import threading
+import time
+from queue import Empty, Queue
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+from .requests import TransferSummary
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_STOP = object()
+
+
+class Stage(Generic[_T]):  # pylint: disable=too-many-instance-attributes
+    """This class defines :class:`Stage`.
+
+    Arguments:
+        name: The name of the stage.
+        function: The function processing an item, or a list of items when ``batch_size``
+            is given. The items are passed to the next stage as they are,
+            so the function stores its results into the items.
+        jobs: The number of the worker threads.
+        queue_size: The max number of the items waiting for the stage.
+        batch_size: The max number of the items processed in one call,
+            None for processing the items one by one.
+        interval: The max seconds to wait for filling up a batch.
+
+    Attributes:
+        processed: The number of the items processed successfully.
+        failed: The number of the items failed in the stage.
+        busy_seconds: The total seconds the workers spent on processing the items.
+        max_queue_depth: The max number of the items waited in the queue.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        function: Callable[[Any], None],
+        *,
+        jobs: int = 1,
+        queue_size: int = 128,
+        batch_size: Optional[int] = None,
+        interval: float = 0.5,
+    ) -> None:
+        if jobs < 1:
+            raise ValueError("The jobs of a stage should be a positive integer")
+
+        self.name = name
+        self.jobs = jobs
+        self.batch_size = batch_size
+        self.interval = interval
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+        self._function = function
+        self._queue: "Queue[Any]" = Queue(queue_size)
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of the items waiting in the queue.
+
+        Returns:
+            The number of the items waiting in the queue.
+
+        """
+        return self._queue.qsize()
+
+    def put(self, item: Any) -> None:
+        """Put an item into the queue of the stage, block when the queue is full.
+
+        Arguments:
+            item: The item to put.
+
+        """
+        self._queue.put(item)
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def get_batch(self) -> List[Any]:
+        """Get the next items to process from the queue.
+
+        The returned list ends with the stop mark when the stage is stopped.
+
+        Returns:
+            The list of one item, or at most ``batch_size`` items for a batch stage.
+
+        """
+        batch = [self._queue.get()]
+        if not self.batch_size or batch[0] is _STOP:
+            return batch
+
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except Empty:
+                break
+            batch.append(item)
+            if item is _STOP:
+                break
+        return batch
+
+    def process(self, items: List[_T]) -> None:
+        """Process the items by the function of the stage and record the statistics.
+
+        Arguments:
+            items: The items to process.
+
+        Raises:
+            BaseException: When the function of the stage fails.
+
+        """
+        start = time.monotonic()
+        try:
+            if self.batch_size:
+                self._function(items)
+            else:
+                self._function(items[0])
+        except BaseException:
+            with self._lock:
+                self.failed += len(items)
+            raise
+        finally:
+            with self._lock:
+                self.busy_seconds += time.monotonic() - start
+
+        with self._lock:
+            self.processed += len(items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the statistics of the stage.
+
+        Returns:
+            The dict of the jobs, the processed and failed item numbers, the busy seconds,
+            the current and the max queue depth of the stage.
+
+        """
+        with self._lock:
+            return {
+                "jobs": self.jobs,
+                "processed": self.processed,
+                "failed": self.failed,
+                "busySeconds": self.busy_seconds,
+                "queueDepth": self.queue_depth,
+                "maxQueueDepth": self.max_queue_depth,
+            }
+
+
+class Pipeline(Generic[_T]):
+    """This class defines :class:`Pipeline`.
+
+    An item leaves the pipeline when it fails in a stage,
+    the items failed in a batch stage are the whole failed batch.
+
+    Arguments:
+        stages: The stages every item goes through in order.
+
+    """
+
+    def __init__(self, stages: Sequence[Stage[_T]]) -> None:
+        if not stages:
+            raise ValueError("A pipeline should have at least one stage")
+
+        self.stages = stages
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._summary: TransferSummary[_T] = TransferSummary()
+        self._fail_fast = True
+
+    def _get_error(self) -> Optional[BaseException]:
+        with self._lock:
+            return self._error
+
+    def _raise_error(self) -> None:
+        error = self._get_error()
+        if error is not None:
+            raise error
+
+    def _fail(self, items: List[_T], error: BaseException) -> None:
+        with self._lock:
+            # The errors other than Exception, such as KeyboardInterrupt,
+            # always stop the pipeline.
+            if self._fail_fast or not isinstance(error, Exception):
+                if self._error is None:
+                    self._error = error
+            else:
+                self._summary.failures.extend((item, error) for item in items)
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            batch = stage.get_batch()
+            stopped = batch[-1] is _STOP
+            items = batch[:-1] if stopped else batch
+            if items and self._get_error() is None:
+                # The worker keeps taking the items until the stop mark even after a failure,
+                # so the upstream workers never block on a full queue.
+                try:
+                    stage.process(items)
+                except BaseException as error:  # pylint: disable=broad-except
+                    logger.error(
+                        "Failed to process %d items in the %s stage: %s",
+                        len(items),
+                        stage.name,
+                        error,
+                    )
+                    self._fail(items, error)
+                else:
+                    if next_stage:
+                        for item in items:
+                            next_stage.put(item)
+                    else:
+                        with self._lock:
+                            self._summary.succeeded += len(items)
+            if stopped:
+                return
+
+    def run(self, items: Iterable[_T], *, fail_fast: bool = True) -> TransferSummary[_T]:
+        """Run the items through the pipeline.
+
+        The items are pulled lazily from the iterable, so at most the queue sizes of the items
+        are held in the pipeline.
+
+        Arguments:
+            items: The items to process.
+            fail_fast: Whether to stop and raise the exception when the first item fails.
+                If False, the failures are collected in the returned summary.
+
+        Returns:
+            The :class:`~tensorbay.client.requests.TransferSummary` of the items.
+
+        Raises:
+            BaseException: When pulling the items fails,
+                or the first error of the items when ``fail_fast`` is True.
+
+        """
+        self._fail_fast = fail_fast
+        self._error = None
+        self._summary = TransferSummary()
+
+        threads = [
+            [
+                threading.Thread(target=self._work, args=(index,), daemon=True)
+                for _ in range(stage.jobs)
+            ]
+            for index, stage in enumerate(self.stages)
+        ]
+        for stage_threads in threads:
+            for thread in stage_threads:
+                thread.start()
+
+        try:
+            for item in items:
+                if self._get_error() is not None:
+                    break
+                self.stages[0].put(item)
+        except BaseException as error:
+            # The workers skip the queued items and exit at the stop marks.
+            with self._lock:
+                if self._error is None:
+                    self._error = error
+            raise
+        finally:
+            # Every stage is stopped after all its upstream workers exit,
+            # so no item is put into a stopped stage.
+            for stage, stage_threads in zip(self.stages, threads):
+                for _ in stage_threads:
+                    stage.put(_STOP)
+                for thread in stage_threads:
+                    thread.join()
+
+        self._raise_error()
+        return self._summary
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the statistics of every stage.
+
+        Returns:
+            The dict whose keys are the stage names and values are :meth:`Stage.get_stats`.
+
+        """
+        return {stage.name: stage.get_stats() for stage in self.stages}
+
+
+class UploadPipelineConfig:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    """This class defines :class:`UploadPipelineConfig`.
+
+    The data is uploaded through four stages:
+
+        - "prepare": Stat and read the local file, guess its MIME type
+          and get the upload permission.
+        - "transfer": Post the file to the object storage, or upload it by multipart upload.
+        - "callback": Synchronize the upload info of the files in multi-callback requests.
+        - "label": Upload the labels in multi-label requests and record the uploaded data.
+
+    Arguments:
+        prepare_jobs: The number of the workers of the "prepare" stage.
+        transfer_jobs: The number of the workers of the "transfer" stage.
+        callback_jobs: The number of the workers of the "callback" stage.
+        label_jobs: The number of the workers of the "label" stage.
+        queue_size: The max number of the items waiting for every stage.
+        batch_size: The max number of the files in a callback or label request.
+        interval: The max seconds to wait for filling up a callback or label batch.
+        max_read_size: The max file size in bytes read into memory by the "prepare" stage,
+            the larger files are read by the "transfer" stage while posting.
+            At most about ``(queue_size + transfer_jobs) * max_read_size`` bytes
+            are held in memory.
+
+    Attributes:
+        stats: The per-stage statistics of the last upload,
+            see :meth:`Pipeline.stats`.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        prepare_jobs: int = 2,
+        transfer_jobs: int = 8,
+        callback_jobs: int = 1,
+        label_jobs: int = 1,
+        queue_size: int = 32,
+        batch_size: int = 128,
+        interval: float = 0.5,
+        max_read_size: int = 1024 * 1024,
+    ) -> None:
+        self.prepare_jobs = prepare_jobs
+        self.transfer_jobs = transfer_jobs
+        self.callback_jobs = callback_jobs
+        self.label_jobs = label_jobs
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_read_size = max_read_size
+        self.stats: Dict[str, Dict[str, Any]] = {}
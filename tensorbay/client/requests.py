@@ -3,18 +3,42 @@
 # Copyright 2021 Graviti. Licensed under MIT License.
 #
 
-"""Class Client and method multithread_upload.
+"""Class Client, method multithread_upload and method paging_list.
 
 :class:`Client` can send POST, PUT, and GET requests to the TensorBay Dataset Open API.
 
 :meth:`multithread_upload` creates a multi-thread framework for uploading.
 
+:meth:`paging_list` iterates the items of a paged Open API listing, serially or concurrently.
+
 """
 
+import gzip
 import logging
-from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+import mmap
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
 from itertools import repeat, zip_longest
-from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from urllib.parse import urljoin
 
 from requests import Session
@@ -23,8 +47,11 @@ from requests.exceptions import RequestException
 from requests.models import PreparedRequest, Response
 from urllib3.util.retry import Retry
 
+from ..utility.codec import json_dumps
+from .concurrency import THROTTLING_STATUS_CODES, AdaptiveConcurrency, current_controller
 from .exceptions import GASResponseError
 from .log import RequestLogging, ResponseLogging
+from .metrics import EXTERNAL_SECTION, MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -37,21 +64,52 @@ logger = logging.getLogger(__name__)
 #     logging.debug(data.decode("utf-8"))
 
 
-class Config:  # pylint: disable=too-few-public-methods
+class Config:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
     """This is a base class defining the concept of Post Config.
 
     Arguments:
         max_retries: Maximum retry times of the post request.
+        backoff_factor: The backoff factor in seconds between the retries, 0 for retrying
+            at once, the "Retry-After" header of the throttling responses takes precedence.
         timeout: Timeout value of the post request in seconds.
         is_intern: Whether the post request is from intern.
+        multipart_threshold: The file size in bytes above which the file is uploaded
+            by multipart upload.
+        part_size: The part size in bytes of the multipart upload.
+        part_jobs: The number of the max workers for uploading the parts of a file.
+        compression: The content encoding for compressing the Open API request bodies,
+            "gzip" or "deflate", None for sending them uncompressed.
+        compression_threshold: The body size in bytes above which the body is compressed.
+        listing_jobs: The number of the max workers for requesting the pages of the listings
+            which are not given the number, such as the listings before an "auto" upload.
 
     """
 
-    def __init__(self, max_retries: int = 3, timeout: int = 15, is_intern: bool = False) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_retries: int = 3,
+        timeout: int = 15,
+        is_intern: bool = False,
+        *,
+        multipart_threshold: int = 256 * 1024 * 1024,
+        part_size: int = 64 * 1024 * 1024,
+        part_jobs: int = 4,
+        backoff_factor: float = 0,
+        compression: Optional[str] = None,
+        compression_threshold: int = 16 * 1024,
+        listing_jobs: int = 4,
+    ) -> None:
 
         self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
         self.timeout = timeout
         self._is_intern = is_intern
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.part_jobs = part_jobs
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.listing_jobs = listing_jobs
 
     @property
     def is_intern(self) -> bool:
@@ -67,6 +125,23 @@ class Config:  # pylint: disable=too-few-public-methods
 default_config = Config()
 
 
+def _get_body_size(body: Any) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, memoryview):
+        return body.nbytes
+    if isinstance(body, (bytes, bytearray, str, mmap.mmap)):
+        return len(body)
+    # The streaming bodies, such as the MultipartEncoder, provide their sizes by "len".
+    return int(getattr(body, "len", 0))
+
+
+_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.compress,
+    "deflate": zlib.compress,
+}
+
+
 class TimeoutHTTPAdapter(HTTPAdapter):
     """This class defines the http adapter for setting the timeout value.
 
@@ -110,6 +185,49 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, stream, timeout, verify, cert, proxies)
 
 
+_retry_counter = threading.local()
+
+
+class _ThrottlingAwareRetry(Retry):
+    """This class reports the throttling responses to the running concurrency controller.
+
+    The retries are also counted in the thread sending the request for the request metrics.
+
+    """
+
+    def increment(  # pylint: disable=too-many-arguments
+        self,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        response: Any = None,
+        error: Optional[Exception] = None,
+        _pool: Any = None,
+        _stacktrace: Any = None,
+    ) -> Retry:
+        """Return a new Retry object with the incremented retry counters.
+
+        Arguments:
+            method: The method of the request.
+            url: The URL of the request.
+            response: The response of the request.
+            error: The error encountered during the request.
+            _pool: The connection pool.
+            _stacktrace: The stacktrace of the error.
+
+        Returns:
+            The new Retry object.
+
+        """
+        if response is not None and response.status in THROTTLING_STATUS_CODES:
+            controller = current_controller()
+            if controller:
+                controller.on_throttle(self.get_retry_after(response))
+
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        _retry_counter.count = getattr(_retry_counter, "count", 0) + 1
+        return retry
+
+
 class UserSession(Session):  # pylint: disable=too-few-public-methods
     """This class defines UserSession."""
 
@@ -117,8 +235,9 @@ class UserSession(Session):  # pylint: disable=too-few-public-methods
         super().__init__()
         # self.session.hooks["response"] = [logging_hook]
 
-        retry_strategy = Retry(
+        retry_strategy = _ThrottlingAwareRetry(
             total=default_config.max_retries,
+            backoff_factor=default_config.backoff_factor,
             status_forcelist=[429, 500, 502, 503, 504],
             method_whitelist=["HEAD", "OPTIONS", "POST", "PUT"],
             raise_on_status=False,
@@ -164,7 +283,7 @@ class UserSession(Session):  # pylint: disable=too-few-public-methods
             raise
 
 
-class Client:
+class Client:  # pylint: disable=too-many-instance-attributes
     """This class defines :class:`Client`.
 
     :class:`Client` defines the client that saves the user and URL information
@@ -192,8 +311,13 @@ class Client:
         self.access_key = access_key
 
         self.session = UserSession()
+        self.metrics = MetricsRegistry()
         self._open_api = urljoin(self.gateway_url, "tensorbay-open-api/v1/")
 
+        self._compression_lock = threading.Lock()
+        self._rejected_encodings: Set[str] = set()
+        self._accepted_encoding: Optional[str] = None
+
     def _url_make(self, section: str, dataset_id: str = "") -> str:
         """Generate Open API URL.
 
@@ -224,15 +348,80 @@ class Client:
             method: The method of the request.
             section: The section of the request.
             dataset_id: Dataset ID.
-            **kwargs: Extra keyword arguments to send in the POST request.
+            **kwargs: Extra keyword arguments to send in the POST request,
+                the "json" argument is encoded by the selected JSON codec.
 
         Returns:
             Response of the request.
 
-        """
-        kwargs.setdefault("headers", {})["X-Token"] = self.access_key
+        Raises:
+            GASResponseError: When the compressed request fails
+                for reasons other than the rejected content encoding.
 
-        return self.do(method=method, url=self._url_make(section, dataset_id), **kwargs)
+        """
+        headers = kwargs.setdefault("headers", {})
+        headers["X-Token"] = self.access_key
+        if kwargs.get("json") is not None:
+            kwargs["data"] = json_dumps(kwargs.pop("json"))
+            headers["Content-Type"] = "application/json"
+
+        url = self._url_make(section, dataset_id)
+        data = kwargs.get("data")
+        if isinstance(data, bytes) and len(data) >= default_config.compression_threshold:
+            encoding = self._get_request_encoding()
+            while encoding:
+                compressed = _COMPRESSORS[encoding](data)
+                if len(compressed) >= len(data):
+                    break
+
+                compressed_kwargs = {
+                    **kwargs,
+                    "data": compressed,
+                    "headers": {**headers, "Content-Encoding": encoding},
+                }
+                try:
+                    response = self._send(method, url, section, **compressed_kwargs)
+                except GASResponseError as error:
+                    if error.status_code != 415:
+                        raise
+                    encoding = self._reject_encoding(encoding, error.response)
+                    continue
+
+                self.metrics.record_compression(method, section, len(data), len(compressed))
+                return response
+
+        return self._send(method, url, section, **kwargs)
+
+    def _get_request_encoding(self) -> Optional[str]:
+        with self._compression_lock:
+            encoding = self._accepted_encoding or default_config.compression
+        if encoding and encoding not in _COMPRESSORS:
+            raise ValueError(f'Unsupported content encoding "{encoding}"')
+        return None if encoding in self._rejected_encodings else encoding
+
+    def _reject_encoding(self, encoding: str, response: Response) -> Optional[str]:
+        # The server rejecting the content encoding responds 415 with the "Accept-Encoding"
+        # header listing the encodings it accepts, see RFC 7694.
+        accepted = (
+            item.split(";")[0].strip()
+            for item in response.headers.get("Accept-Encoding", "").split(",")
+        )
+        with self._compression_lock:
+            self._rejected_encodings.add(encoding)
+            self._accepted_encoding = next(
+                (
+                    item
+                    for item in accepted
+                    if item in _COMPRESSORS and item not in self._rejected_encodings
+                ),
+                None,
+            )
+            logger.warning(
+                'The content encoding "%s" is rejected, fall back to "%s"',
+                encoding,
+                self._accepted_encoding or "identity",
+            )
+            return self._accepted_encoding
 
     def do(self, method: str, url: str, **kwargs: Any) -> Response:  # pylint: disable=invalid-name
         """Send a request.
@@ -246,34 +435,163 @@ class Client:
             Response of the request.
 
         """
-        return self.session.request(method=method, url=url, **kwargs)
+        return self._send(method, url, EXTERNAL_SECTION, **kwargs)
+
+    def _send(self, method: str, url: str, section: str, **kwargs: Any) -> Response:
+        _retry_counter.count = 0
+        start = time.monotonic()
+        response: Optional[Response] = None
+        try:
+            response = self.session.request(method=method, url=url, **kwargs)
+            return response
+        except GASResponseError as error:
+            response = error.response
+            raise
+        finally:
+            status = "error"
+            bytes_sent = bytes_received = 0
+            if response is not None:
+                status = str(response.status_code)
+                bytes_sent = _get_body_size(response.request.body)
+                if kwargs.get("stream"):
+                    bytes_received = int(response.headers.get("Content-Length", 0))
+                else:
+                    bytes_received = len(response.content)
+
+            self.metrics.record(
+                method,
+                section,
+                status,
+                time.monotonic() - start,
+                bytes_sent=bytes_sent,
+                bytes_received=bytes_received,
+                retries=_retry_counter.count,
+            )
 
 
+# The status codes of the responses rejecting a request the server does not support,
+# such as a multi-item endpoint missing in an older server.
+UNSUPPORTED_STATUS_CODES = frozenset((404, 405, 415, 501))
+
 _T = TypeVar("_T")
 
 
+class TransferSummary(Generic[_T]):  # pylint: disable=too-few-public-methods
+    """This class defines the summary of a multi-thread uploading or downloading procession.
+
+    Only the failed arguments are kept, so the memory cost stays constant
+    no matter how many arguments are transferred successfully.
+
+    Attributes:
+        succeeded: The number of the arguments transferred successfully.
+        failures: The list of (argument, exception) pairs of the failed transfers.
+
+    """
+
+    def __init__(self) -> None:
+        self.succeeded = 0
+        self.failures: List[Tuple[_T, BaseException]] = []
+
+    def __bool__(self) -> bool:
+        return not self.failures
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(succeeded={self.succeeded}, failed={len(self.failures)})"
+
+
+def _get_controller(jobs: Union[int, str, AdaptiveConcurrency]) -> Optional[AdaptiveConcurrency]:
+    if isinstance(jobs, AdaptiveConcurrency):
+        return jobs
+    if isinstance(jobs, str):
+        return AdaptiveConcurrency()
+    return None
+
+
 def multithread_upload(
     function: Callable[[_T], None],
     arguments: Iterable[_T],
     *,
-    jobs: int = 1,
-) -> None:
+    jobs: Union[int, str, AdaptiveConcurrency] = 1,
+    max_in_flight: Optional[int] = None,
+    fail_fast: bool = True,
+) -> TransferSummary[_T]:
     """Multi-thread upload framework.
 
+    The arguments are pulled lazily from the iterable, and at most ``max_in_flight``
+    of them are submitted to the workers at the same time, so neither the pending futures
+    nor the arguments pile up in memory.
+
+    When ``jobs`` is "auto" or an :class:`~tensorbay.client.concurrency.AdaptiveConcurrency`,
+    the number of the submitted arguments follows the concurrency adjusted by the controller,
+    and the submission pauses as the "Retry-After" header of the throttling responses requires.
+
     Arguments:
         function: The upload function.
         arguments: The arguments of the upload function.
-        jobs: The number of the max workers in multi-thread uploading procession.
+        jobs: The number of the max workers in multi-thread uploading procession,
+            or "auto" or an :class:`~tensorbay.client.concurrency.AdaptiveConcurrency`
+            to adjust the concurrency adaptively.
+        max_in_flight: The max number of the submitted but unfinished arguments,
+            default is twice the ``jobs``. Ignored when the concurrency is adaptive.
+        fail_fast: Whether to stop submitting and raise the exception when the first upload fails.
+            If False, the failures are collected in the returned summary.
+
+    Returns:
+        The :class:`TransferSummary` of this uploading procession.
+
+    Raises:
+        ValueError: When ``jobs`` is a string other than "auto".
+        BaseException: When pulling the arguments fails,
+            or the first error of the uploads when ``fail_fast`` is True.
 
     """
-    with ThreadPoolExecutor(jobs) as executor:
-        futures = [executor.submit(function, argument) for argument in arguments]
-
-        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
-        for future in not_done:
-            future.cancel()
+    if isinstance(jobs, str) and jobs != "auto":
+        raise ValueError('The "jobs" should be an integer or "auto"')
+
+    controller = _get_controller(jobs)
+    if controller:
+        workers = controller.max_jobs
+        target: Callable[[_T], None] = partial(controller.run, function)
+    else:
+        workers = jobs  # type: ignore[assignment]
+        target = function
+        if max_in_flight is None:
+            max_in_flight = 2 * workers
+        max_in_flight = max(max_in_flight, workers)
+
+    summary: TransferSummary[_T] = TransferSummary()
+    in_flight: Dict["Future[None]", _T] = {}
+
+    def _collect(done: Iterable["Future[None]"]) -> None:
         for future in done:
-            future.result()
+            argument = in_flight.pop(future)
+            error = future.exception()
+            if error is None:
+                summary.succeeded += 1
+            elif fail_fast:
+                raise error
+            else:
+                summary.failures.append((argument, error))
+
+    with ThreadPoolExecutor(workers) as executor:
+        try:
+            for argument in arguments:
+                if controller:
+                    while len(in_flight) >= controller.concurrency:
+                        _collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+                    controller.wait_ready()
+                elif len(in_flight) >= max_in_flight:  # type: ignore[operator]
+                    _collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+                in_flight[executor.submit(target, argument)] = argument
+
+            while in_flight:
+                _collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            raise
+
+    return summary
 
 
 def paging_range(start: int, stop: int, limit: int) -> Iterator[Tuple[int, int]]:
@@ -297,3 +615,81 @@ def paging_range(start: int, stop: int, limit: int) -> Iterator[Tuple[int, int]]
     """
     div, mod = divmod(stop - start, limit)
     yield from zip_longest(range(start, stop, limit), repeat(limit, div), fillvalue=mod)
+
+
+def paging_list(  # pylint: disable=too-many-arguments
+    request: Callable[[int, int], Dict[str, Any]],
+    key: str,
+    *,
+    start: int = 0,
+    stop: int = sys.maxsize,
+    page_size: int = 128,
+    jobs: int = 1,
+) -> Iterator[Any]:
+    """A Generator which yields the items of a paged Open API listing in order.
+
+    The first page is always requested alone. When ``jobs`` is greater than 1, the offsets
+    of the remaining pages are computed from the "totalCount" and the "recordSize"
+    of the first response and the pages are requested concurrently, while the items are
+    still yielded in order. A page returned shorter than requested is completed by
+    the following requests.
+
+    Arguments:
+        request: The function which takes offset and limit and returns the response json.
+        key: The key of the listed items in the response json.
+        start: The index to start.
+        stop: The index to stop.
+        page_size: The page size of the paging request.
+        jobs: The number of the max workers for requesting pages concurrently.
+
+    Yields:
+        The listed items.
+
+    """
+    # The server may return fewer items than the limit, so the next offset
+    # and the page size of the concurrent requests follow the returned record size.
+    offset = start
+    while True:
+        if offset >= stop:
+            return
+        response = request(offset, min(page_size, stop - offset))
+        yield from response[key]
+        record_size = response["recordSize"]
+        offset = response["offset"] + record_size
+        if not record_size or offset >= response["totalCount"]:
+            return
+        if jobs > 1:
+            break
+
+    remaining = paging_range(offset, min(stop, response["totalCount"]), record_size)
+    with ThreadPoolExecutor(jobs) as executor:
+        futures: Deque[Tuple[int, int, "Future[Dict[str, Any]]"]] = deque()
+        try:
+            for offset, limit in remaining:
+                if len(futures) >= 2 * jobs:
+                    yield from _complete_page(request, key, *futures.popleft())
+                futures.append((offset, limit, executor.submit(request, offset, limit)))
+
+            while futures:
+                yield from _complete_page(request, key, *futures.popleft())
+        finally:
+            for _, _, future in futures:
+                future.cancel()
+
+
+def _complete_page(
+    request: Callable[[int, int], Dict[str, Any]],
+    key: str,
+    offset: int,
+    limit: int,
+    future: "Future[Dict[str, Any]]",
+) -> Iterator[Any]:
+    response = future.result()
+    while True:
+        yield from response[key]
+        record_size = response["recordSize"]
+        if not record_size or record_size >= limit:
+            return
+        offset += record_size
+        limit -= record_size
+        response = request(offset, limit)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class UploadProgress and UploadScheduler.
+
+:class:`UploadScheduler` uploads the work of several segments through one shared worker pool,
+which is used by :meth:`GAS.upload_dataset() <tensorbay.client.gas.GAS.upload_dataset>`,
+so the workers keep busy across the segment boundaries instead of draining
+and restarting for every segment.
+
+:class:`UploadProgress` records the per-segment and the total progress of the upload.
+
+"""
+
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sized,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from typing_extensions import Literal
+
+from .concurrency import AdaptiveConcurrency
+from .requests import TransferSummary, multithread_upload
+
+_T = TypeVar("_T")
+
+_ORDERS = ("interleave", "sequential", "size")
+
+_STAT_JOBS = 16
+
+_Work = Tuple[str, Callable[[Any], None], Any, int]
+
+
+class UploadProgress:
+    """This class defines :class:`UploadProgress`.
+
+    The counts are updated by the workers of :class:`UploadScheduler`, so they can be read
+    from another thread while the upload is in progress.
+
+    Arguments:
+        callback: The function called with the segment name and the progress
+            after every work is finished, it is called in the worker threads.
+
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, "UploadProgress"], None]] = None) -> None:
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._segments: Dict[str, Dict[str, int]] = {}
+
+    def add_segment(self, segment_name: str, total: int) -> None:
+        """Add a segment and the number of its work to the progress.
+
+        Arguments:
+            segment_name: The name of the segment.
+            total: The number of the work of the segment.
+
+        """
+        with self._lock:
+            self._segments[segment_name] = {"total": total, "succeeded": 0, "failed": 0}
+
+    def update(self, segment_name: str, succeeded: bool) -> None:
+        """Count a finished work of the segment.
+
+        Arguments:
+            segment_name: The name of the segment.
+            succeeded: Whether the work succeeded.
+
+        """
+        with self._lock:
+            self._segments[segment_name]["succeeded" if succeeded else "failed"] += 1
+
+        if self._callback:
+            self._callback(segment_name, self)
+
+    def get_segment(self, segment_name: str) -> Dict[str, int]:
+        """Get the progress of a segment.
+
+        Arguments:
+            segment_name: The name of the segment.
+
+        Returns:
+            The dict of the total, the succeeded and the failed work numbers of the segment.
+
+        """
+        with self._lock:
+            return self._segments[segment_name].copy()
+
+    def get_total(self) -> Dict[str, int]:
+        """Get the total progress of all the segments.
+
+        Returns:
+            The dict of the total, the succeeded and the failed work numbers.
+
+        """
+        with self._lock:
+            return {
+                key: sum(segment[key] for segment in self._segments.values())
+                for key in ("total", "succeeded", "failed")
+            }
+
+
+class _Segment:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    """The work source and the state of a segment in :class:`UploadScheduler`."""
+
+    __slots__ = (
+        "name",
+        "function",
+        "arguments",
+        "get_size",
+        "context",
+        "stack",
+        "pending",
+        "unscheduled",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        function: Callable[[Any], None],
+        arguments: Iterable[Any],
+        get_size: Optional[Callable[[Any], int]],
+        context: Optional[Callable[[], ContextManager[Any]]],
+        total: int,
+    ) -> None:
+        self.name = name
+        self.function = function
+        self.arguments = arguments
+        self.get_size = get_size
+        self.context = context
+        self.stack: Optional[ExitStack] = None
+        self.pending = 0
+        self.unscheduled = total
+
+
+class UploadScheduler:
+    """This class defines :class:`UploadScheduler`.
+
+    The work of all the segments is submitted to the same workers in the order of:
+
+        - "interleave": Take the work from the segments in turn, so every segment progresses
+          at the same pace and the small segments finish early.
+        - "sequential": Take the work segment by segment,
+          the next segment starts while the last work of the previous segment is in flight.
+        - "size": Take the largest work first from all the segments,
+          so the large files do not form a long tail at the end of the upload.
+          While the largest work waits for ``max_bytes_in_flight``,
+          the smallest work fills the bytes left free at the time it started waiting.
+
+    The arguments of the work are pulled lazily in the "interleave" and "sequential" orders,
+    while the "size" order needs all of them to sort.
+    The sizes of the work are got by multiple threads ahead of the submission,
+    when the order is "size" or ``max_bytes_in_flight`` is given.
+
+    Arguments:
+        order: The order of the work, "interleave", "sequential" or "size".
+        progress: The :class:`UploadProgress` to record the progress into.
+        max_bytes_in_flight: The max total size of the work in flight, None for no limit.
+            A work larger than the limit is submitted alone.
+
+    Raises:
+        ValueError: When the order is unknown.
+
+    """
+
+    def __init__(
+        self,
+        order: Literal["interleave", "sequential", "size"] = "interleave",
+        progress: Optional[UploadProgress] = None,
+        *,
+        max_bytes_in_flight: Optional[int] = None,
+    ) -> None:
+        if order not in _ORDERS:
+            raise ValueError(f'The "order" should be one of {", ".join(_ORDERS)}')
+
+        self.order = order
+        self.progress = progress if progress else UploadProgress()
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self._segments: Dict[str, _Segment] = {}
+        self._condition = threading.Condition()
+        self._bytes_in_flight = 0
+        self._stack = ExitStack()
+
+    def add(  # pylint: disable=too-many-arguments
+        self,
+        segment_name: str,
+        function: Callable[[Any], None],
+        arguments: Iterable[Any],
+        get_size: Optional[Callable[[Any], int]] = None,
+        *,
+        total: Optional[int] = None,
+        context: Optional[Callable[[], ContextManager[Any]]] = None,
+    ) -> None:
+        """Add the work of a segment to the scheduler.
+
+        Arguments:
+            segment_name: The name of the segment.
+            function: The function doing one work.
+            arguments: The arguments of the work, which are pulled lazily.
+            get_size: The function getting the size of the work from its argument,
+                which is required by the "size" order and ``max_bytes_in_flight``.
+            total: The number of the arguments, default is the length of the arguments.
+            context: The function returning the context the work of the segment runs in,
+                such as :meth:`SegmentClientBase.batch_callbacks()
+                <tensorbay.client.segment.SegmentClientBase.batch_callbacks>`.
+                The context is entered before the first work of the segment is submitted,
+                and exited after the last work of the segment is finished.
+
+        Raises:
+            TypeError: When the total is not given and the arguments have no length.
+
+        """
+        if total is None:
+            if not isinstance(arguments, Sized):
+                raise TypeError('The "total" is required when the arguments have no length')
+            total = len(arguments)
+
+        self.progress.add_segment(segment_name, total)
+        self._segments[segment_name] = _Segment(
+            segment_name, function, arguments, get_size, context, total
+        )
+
+    def _iter_until_end(
+        self, segment: _Segment, executor: Optional[ThreadPoolExecutor]
+    ) -> Iterator[_Work]:
+        yield from _iter_segment_work(segment, executor)
+        segment.unscheduled = 0
+        self._close_if_finished(segment)
+
+    def _fits(self, size: int) -> bool:
+        return (
+            self.max_bytes_in_flight is None
+            or not self._bytes_in_flight
+            or self._bytes_in_flight + size <= self.max_bytes_in_flight
+        )
+
+    def _iter_by_size(self, works: List[_Work]) -> Iterator[_Work]:
+        works.sort(key=lambda work: work[3], reverse=True)
+        remaining = deque(works)
+        # The bytes left for the small work to fill while the largest work is waiting,
+        # it is not refilled until the largest work is submitted, so the largest work
+        # is not starved by the small ones.
+        gap: Optional[int] = None
+        limit = self.max_bytes_in_flight or 0
+        while remaining:
+            with self._condition:
+                while True:
+                    if self._fits(remaining[0][3]):
+                        work = remaining.popleft()
+                        gap = None
+                        break
+                    if gap is None:
+                        gap = max(limit - self._bytes_in_flight, 0)
+                    if remaining[-1][3] <= gap:
+                        work = remaining.pop()
+                        gap -= work[3]
+                        break
+                    self._condition.wait()
+                self._bytes_in_flight += work[3]
+            yield work
+
+    def _iter_limited(self, works: Iterable[_Work]) -> Iterator[_Work]:
+        for work in works:
+            with self._condition:
+                while not self._fits(work[3]):
+                    self._condition.wait()
+                self._bytes_in_flight += work[3]
+            yield work
+
+    def _iter_ordered(self, executor: Optional[ThreadPoolExecutor]) -> Iterator[_Work]:
+        segments = self._segments.values()
+        if self.order == "size":
+            works = list(
+                chain.from_iterable(_iter_segment_work(segment, executor) for segment in segments)
+            )
+            counts = Counter(work[0] for work in works)
+            for segment in segments:
+                segment.unscheduled = counts[segment.name]
+            return self._iter_by_size(works)
+
+        sources = [self._iter_until_end(segment, executor) for segment in segments]
+        ordered = (
+            chain.from_iterable(sources) if self.order == "sequential" else _interleave(sources)
+        )
+        return ordered if self.max_bytes_in_flight is None else self._iter_limited(ordered)
+
+    def _iter_work(self, executor: Optional[ThreadPoolExecutor] = None) -> Iterator[_Work]:
+        for work in self._iter_ordered(executor):
+            segment = self._segments[work[0]]
+            context = segment.context
+            stack = None
+            with self._condition:
+                segment.pending += 1
+                segment.unscheduled -= 1
+                if segment.stack is None and context is not None:
+                    stack = segment.stack = ExitStack()
+            if stack and context:
+                self._stack.push(stack)
+                stack.enter_context(context())
+            yield work
+
+    def _close_if_finished(self, segment: _Segment) -> None:
+        with self._condition:
+            if segment.unscheduled > 0 or segment.pending or not segment.stack:
+                return
+            stack, segment.stack = segment.stack, None
+        stack.close()
+
+    def _do(self, work: _Work) -> None:
+        segment_name, function, argument, size = work
+        segment = self._segments[segment_name]
+        try:
+            function(argument)
+        except BaseException:
+            self.progress.update(segment_name, False)
+            raise
+        else:
+            self.progress.update(segment_name, True)
+        finally:
+            with self._condition:
+                self._bytes_in_flight -= size
+                segment.pending -= 1
+                self._condition.notify()
+            self._close_if_finished(segment)
+
+    def run(
+        self, *, jobs: Union[int, str, AdaptiveConcurrency] = 1, fail_fast: bool = True
+    ) -> TransferSummary[_Work]:
+        """Run all the added work by the shared workers.
+
+        Arguments:
+            jobs: The number of the max workers, or "auto" to adjust the concurrency adaptively.
+            fail_fast: Whether to stop and raise the exception when the first work fails.
+                If False, the failures are collected in the returned summary.
+
+        Returns:
+            The :class:`~tensorbay.client.requests.TransferSummary` whose failed arguments are
+            the (segment name, function, argument, size) tuples of the failed work.
+
+        """
+        self._bytes_in_flight = 0
+        need_size = self.order == "size" or self.max_bytes_in_flight is not None
+        with ExitStack() as stack:
+            executor = stack.enter_context(ThreadPoolExecutor(_STAT_JOBS)) if need_size else None
+            # The contexts of the segments which are not finished because of a failure
+            # are exited with the exception.
+            stack.enter_context(self._stack)
+            return multithread_upload(
+                self._do, self._iter_work(executor), jobs=jobs, fail_fast=fail_fast
+            )
+
+
+def _iter_segment_work(
+    segment: _Segment, executor: Optional[ThreadPoolExecutor]
+) -> Iterator[_Work]:
+    if executor and segment.get_size:
+        sized = _map_ahead(executor, segment.get_size, segment.arguments, 4 * _STAT_JOBS)
+    else:
+        sized = ((argument, 0) for argument in segment.arguments)
+
+    for argument, size in sized:
+        yield segment.name, segment.function, argument, size
+
+
+def _map_ahead(
+    executor: ThreadPoolExecutor, function: Callable[[_T], int], items: Iterable[_T], window: int
+) -> Iterator[Tuple[_T, int]]:
+    pending: Deque[Tuple[_T, "Future[int]"]] = deque()
+    for item in items:
+        pending.append((item, executor.submit(function, item)))
+        if len(pending) >= window:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+    while pending:
+        done, future = pending.popleft()
+        yield done, future.result()
+
+
+def _interleave(sources: List[Iterator[_Work]]) -> Iterator[_Work]:
+    iterators = sources
+    while iterators:
+        active = []
+        for iterator in iterators:
+            work = next(iterator, None)
+            if work is not None:
+                active.append(iterator)
+                yield work
+        iterators = active
@@ -23,22 +23,49 @@ for more information.
 
 """
 
+import logging
 import os
 import sys
-import threading
 import time
-from copy import deepcopy
+from contextlib import contextmanager
+from functools import partial
 from itertools import islice
-from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
 import filetype
-import ulid
 from requests_toolbelt import MultipartEncoder
 
 from ..dataset import Data, Frame, RemoteData
 from ..sensor.sensor import Sensor
+from ..utility import json_loads
+from .batch import Batcher, BatchSynchronizer
+from .cache import ContentCache
+from .download import Downloader
 from .exceptions import GASException, GASPathError
-from .requests import Client, default_config, paging_range
+from .frames import iter_frame_data, upload_frames
+from .journal import UploadedFrames, UploadJournal, get_frame_key
+from .lazy import PagingList
+from .multipart import MultipartUploader
+from .permission import Permission, PermissionManager
+from .pipeline import Pipeline, Stage, UploadPipelineConfig
+from .requests import Client, TransferSummary, default_config, multithread_upload, paging_list
+from .snapshot import MetadataSnapshot, make_page_request
+from .urls import URLResolver
+
+logger = logging.getLogger(__name__)
 
 _SERVER_VERSION_MATCH: Dict[str, str] = {
     "AmazonS3": "x-amz-version-id",
@@ -46,7 +73,21 @@ _SERVER_VERSION_MATCH: Dict[str, str] = {
 }
 
 
-class SegmentClientBase:
+class _UploadTask:  # pylint: disable=too-few-public-methods
+    """The data to upload and the intermediate results of the upload stages."""
+
+    __slots__ = ("data", "frame_info", "content", "file_type", "permission", "upload_info")
+
+    def __init__(self, data: Data, frame_info: Optional[Dict[str, Any]] = None) -> None:
+        self.data = data
+        self.frame_info = frame_info
+        self.content: Optional[bytes] = None
+        self.file_type: Optional[str] = None
+        self.permission: Optional[Permission] = None
+        self.upload_info: Dict[str, Any] = {}
+
+
+class SegmentClientBase:  # pylint: disable=too-many-instance-attributes
     """This class defines the basic concept of :class:`SegmentClient`.
 
     A :class:`SegmentClientBase` contains the information needed for determining
@@ -58,10 +99,17 @@ class SegmentClientBase:
         dataset_name: Dataset name.
         client: The client used for sending request to TensorBay.
         commit_id: The commit ID.
+        permission_manager: The manager of the upload permissions, which can be shared
+            by the segment clients of the same dataset.
+        content_cache: The local cache of the remote files, which is used by
+            :meth:`RemoteData.open() <tensorbay.dataset.data.RemoteData.open>`
+            of the listed data when the commit ID is given.
+        snapshot: The local metadata snapshot of the commit, which serves the listing
+            of the labels and the sensors offline.
 
     """
 
-    _EXPIRED_IN_SECOND = 240
+    _journal: Optional[UploadJournal] = None
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -70,18 +118,32 @@ class SegmentClientBase:
         dataset_name: str,
         client: Client,
         commit_id: Optional[str] = None,
+        *,
+        permission_manager: Optional[PermissionManager] = None,
+        content_cache: Optional[ContentCache] = None,
+        snapshot: Optional[MetadataSnapshot] = None,
     ) -> None:
         self._name = name
         self._dataset_id = dataset_id
         self._dataset_name = dataset_name
         self._client = client
         self._commit_id = commit_id
-        self._permission: Dict[str, Any] = {"expireAt": 0}
-        self._permission_lock = threading.Lock()
+        self._permission_manager = (
+            permission_manager if permission_manager else PermissionManager(client, dataset_id)
+        )
+        self._url_resolver = URLResolver(client, dataset_id, name)
+        self._content_cache = content_cache
+        self._snapshot = snapshot
+        self._synchronizer = BatchSynchronizer(client, dataset_id, name)
+        self._label_batcher: Optional[Batcher[Data]] = None
+        self._callback_batcher: Optional[Batcher[Union[Dict[str, Any], Data]]] = None
 
     def _get_url(self, remote_path: str) -> str:
         """Get URL of a specific remote path.
 
+        The URLs of the remote paths listed in the same page are resolved in one request
+        and cached until they expire.
+
         Arguments:
             remote_path: The remote path of the file.
 
@@ -89,15 +151,52 @@ class SegmentClientBase:
             The URL of the remote file.
 
         """
-        params = {
-            "segmentName": self._name,
-            "remotePath": remote_path,
-        }
-        response = self._client.open_api_do("GET", "data/urls", self.dataset_id, params=params)
-        return response.json()["url"]  # type: ignore[no-any-return]
+        return self._url_resolver.get_url(remote_path)
+
+    def _open_cached(self, remote_path: str) -> BinaryIO:
+        def _download(path: str) -> None:
+            data = RemoteData(remote_path, url_getter=self._get_url)
+            Downloader(self._client).download_file(data, path)
+
+        return self._content_cache.open(  # type: ignore[union-attr]
+            self._dataset_id, self._commit_id, remote_path, _download  # type: ignore[arg-type]
+        )
+
+    def _set_remote_hooks(self, data: RemoteData) -> None:
+        # pylint: disable=protected-access
+        data._url_getter = self._get_url
+        if self._content_cache and self._commit_id:
+            data._opener = self._open_cached
+
+    def _make_page_request(self, section: str) -> Callable[[int, int], Dict[str, Any]]:
+        if self._snapshot and section == "labels":
+            return make_page_request(self._snapshot.get_labels(self._name), section)
+
+        params: Dict[str, Any] = {"segmentName": self._name}
+        if self._commit_id:
+            params["commit"] = self._commit_id
+
+        def _request(offset: int, limit: int) -> Dict[str, Any]:
+            page_params = {**params, "offset": offset, "limit": limit}
+            response = self._client.open_api_do("GET", section, self.dataset_id, params=page_params)
+            return json_loads(response.content)  # type: ignore[no-any-return]
+
+        return _request
+
+    def _list_paged(  # pylint: disable=too-many-arguments
+        self, section: str, key: str, start: int, stop: int, page_size: int, jobs: int
+    ) -> Iterator[Dict[str, Any]]:
+        return paging_list(
+            self._make_page_request(section),
+            key,
+            start=start,
+            stop=stop,
+            page_size=page_size,
+            jobs=jobs,
+        )
 
     def _list_labels(
-        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128
+        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128, jobs: int = 1
     ) -> Iterator[Dict[str, Any]]:
         """List labels of the segment in a certain commit.
 
@@ -105,44 +204,13 @@ class SegmentClientBase:
             start: The index to start.
             stop: The index to stop.
             page_size: The page size for the listed labels.
+            jobs: The number of the max workers for requesting pages concurrently.
 
-        Yields:
-            Labels in a segment in a certain commit.
+        Returns:
+            The iterator of labels in a segment in a certain commit.
 
         """
-        params: Dict[str, Any] = {"segmentName": self._name}
-        if self._commit_id:
-            params["commit"] = self._commit_id
-
-        for params["offset"], params["limit"] in paging_range(start, stop, page_size):
-            response = self._client.open_api_do(
-                "GET", "labels", self.dataset_id, params=params
-            ).json()
-            yield from response["labels"]
-            if response["recordSize"] + response["offset"] >= response["totalCount"]:
-                break
-
-    def _get_upload_permission(self) -> Dict[str, Any]:
-        with self._permission_lock:
-            if int(time.time()) >= self._permission["expireAt"]:
-                params = {
-                    "expired": self._EXPIRED_IN_SECOND,
-                    "segmentName": self._name,
-                }
-                self._permission = self._client.open_api_do(
-                    "GET", "policies", self.dataset_id, params=params
-                ).json()
-
-                if default_config.is_intern:
-                    urlsplit = self._permission["extra"]["host"].rsplit(".", 2)
-                    urlsplit[0] += "-internal"
-                    self._permission["extra"]["host"] = ".".join(urlsplit)
-
-            return deepcopy(self._permission)
-
-    def _clear_upload_permission(self) -> None:
-        with self._permission_lock:
-            self._permission = {"expireAt": 0}
+        return self._list_paged("labels", "labels", start, stop, page_size, jobs)
 
     def _post_multipart_formdata(
         self,
@@ -153,15 +221,165 @@ class SegmentClientBase:
     ) -> Tuple[str, str]:
         with open(local_path, "rb") as fp:
             file_type = filetype.guess_mime(local_path)
-            if "x-amz-date" in data:
-                data["Content-Type"] = file_type
-            data["file"] = (remote_path, fp, file_type)
-            multipart = MultipartEncoder(data)
-            response_headers = self._client.do(
-                "POST", url, data=multipart, headers={"Content-Type": multipart.content_type}
-            ).headers
-            version = _SERVER_VERSION_MATCH[response_headers["Server"]]
-            return response_headers[version], response_headers["ETag"].strip('"')
+            return self._post_object(url, fp, remote_path, file_type, data)
+
+    def _post_object(  # pylint: disable=too-many-arguments
+        self,
+        url: str,
+        content: Union[bytes, BinaryIO],
+        remote_path: str,
+        file_type: Optional[str],
+        data: Dict[str, Any],
+    ) -> Tuple[str, str]:
+        if "x-amz-date" in data:
+            data["Content-Type"] = file_type
+        data["file"] = (remote_path, content, file_type)
+        multipart = MultipartEncoder(data)
+        response_headers = self._client.do(
+            "POST", url, data=multipart, headers={"Content-Type": multipart.content_type}
+        ).headers
+        version = _SERVER_VERSION_MATCH[response_headers["Server"]]
+        return response_headers[version], response_headers["ETag"].strip('"')
+
+    def _upload_object(self, local_path: str, remote_path: str) -> Tuple[str, str, str]:
+        """Upload a local file as the object of the remote path.
+
+        The files larger than ``multipart_threshold`` in
+        :class:`~tensorbay.client.requests.Config` are uploaded by multipart upload.
+
+        Arguments:
+            local_path: The local path of the file to upload.
+            remote_path: The remote path of the file.
+
+        Returns:
+            The key, the version ID and the ETag of the uploaded object.
+
+        Raises:
+            GASPathError: When remote_path does not follow linux style.
+            GASException: When uploading the file failed.
+
+        """
+        if "\\" in remote_path:
+            raise GASPathError(remote_path)
+
+        if os.path.getsize(local_path) > default_config.multipart_threshold:
+            uploader = MultipartUploader(self._client, self.dataset_id, self._name)
+            return uploader.upload(local_path, remote_path)
+
+        permission = self._permission_manager.get(self._name)
+        post_data = permission.get_post_data(remote_path)
+        try:
+            version_id, etag = self._post_multipart_formdata(
+                permission.host,
+                local_path,
+                remote_path,
+                post_data,
+            )
+        except GASException:
+            self._permission_manager.invalidate(permission)
+            raise
+
+        return post_data["key"], version_id, etag
+
+    def _prepare_task(self, task: _UploadTask, max_read_size: int) -> None:
+        local_path, remote_path = task.data.path, task.data.target_remote_path
+        if "\\" in remote_path:
+            raise GASPathError(remote_path)
+
+        size = os.path.getsize(local_path)
+        if size > default_config.multipart_threshold:
+            return
+
+        if size <= max_read_size:
+            with open(local_path, "rb") as fp:
+                task.content = fp.read()
+            task.file_type = filetype.guess_mime(task.content)
+        else:
+            task.file_type = filetype.guess_mime(local_path)
+        task.permission = self._permission_manager.get(self._name)
+
+    def _transfer_task(self, task: _UploadTask) -> None:
+        local_path, remote_path = task.data.path, task.data.target_remote_path
+        permission = task.permission
+        if not permission:
+            uploader = MultipartUploader(self._client, self.dataset_id, self._name)
+            key, version_id, etag = uploader.upload(local_path, remote_path)
+        else:
+            # The permission may expire while the task waits in the queue.
+            if time.time() >= permission.expire_at:
+                permission = self._permission_manager.get(self._name)
+            post_data = permission.get_post_data(remote_path)
+            key = post_data["key"]
+            try:
+                if task.content is None:
+                    with open(local_path, "rb") as fp:
+                        version_id, etag = self._post_object(
+                            permission.host, fp, remote_path, task.file_type, post_data
+                        )
+                else:
+                    version_id, etag = self._post_object(
+                        permission.host, task.content, remote_path, task.file_type, post_data
+                    )
+            except GASException:
+                self._permission_manager.invalidate(permission)
+                raise
+            finally:
+                task.content = None
+
+        task.upload_info = {"key": key, "versionId": version_id, "etag": etag}
+        if task.frame_info:
+            task.upload_info.update(task.frame_info)
+
+    def _synchronize_tasks(self, tasks: List[_UploadTask]) -> None:
+        self._synchronize_multi_upload_info([task.upload_info for task in tasks])
+
+    def _upload_task_labels(self, tasks: List[_UploadTask]) -> None:
+        self._flush_labels([task.data for task in tasks])
+
+    def _upload_pipelined(self, tasks: Iterable[_UploadTask], config: UploadPipelineConfig) -> None:
+        """Upload the data through the staged pipeline.
+
+        Arguments:
+            tasks: The upload tasks of the data.
+            config: The concurrency settings of the stages,
+                whose ``stats`` is set to the statistics of the stages after the upload.
+
+        """
+        batch_options = {"batch_size": config.batch_size, "interval": config.interval}
+        pipeline: Pipeline[_UploadTask] = Pipeline(
+            [
+                Stage(
+                    "prepare",
+                    partial(self._prepare_task, max_read_size=config.max_read_size),
+                    jobs=config.prepare_jobs,
+                    queue_size=config.queue_size,
+                ),
+                Stage(
+                    "transfer",
+                    self._transfer_task,
+                    jobs=config.transfer_jobs,
+                    queue_size=config.queue_size,
+                ),
+                Stage(
+                    "callback",
+                    self._synchronize_tasks,
+                    jobs=config.callback_jobs,
+                    queue_size=config.queue_size,
+                    **batch_options,  # type: ignore[arg-type]
+                ),
+                Stage(
+                    "label",
+                    self._upload_task_labels,
+                    jobs=config.label_jobs,
+                    queue_size=config.queue_size,
+                    **batch_options,  # type: ignore[arg-type]
+                ),
+            ]
+        )
+        try:
+            pipeline.run(tasks)
+        finally:
+            config.stats = pipeline.stats()
 
     def _synchronize_upload_info(
         self, key: str, version_id: str, etag: str, frame_info: Optional[Dict[str, Any]] = None
@@ -174,7 +392,42 @@ class SegmentClientBase:
         if frame_info:
             put_data.update(frame_info)
 
-        self._client.open_api_do("PUT", "callback", self.dataset_id, json=put_data)
+        if self._callback_batcher:
+            self._callback_batcher.add(put_data)
+        else:
+            self._synchronize_multi_upload_info([put_data])
+
+    def _synchronize_multi_upload_info(self, callback_bodies: List[Dict[str, Any]]) -> None:
+        try:
+            self._synchronizer.synchronize_upload_info(callback_bodies)
+        except GASException:
+            # The upload permission is fetched again by the next upload, like the failed posting.
+            self._permission_manager.discard(self._name)
+            raise
+
+    def _flush_callbacks(self, items: List[Union[Dict[str, Any], Data]]) -> None:
+        callback_bodies: List[Dict[str, Any]] = []
+        data: List[Data] = []
+        for item in items:
+            if isinstance(item, Data):
+                data.append(item)
+            else:
+                callback_bodies.append(item)
+
+        # The labels are uploaded after the callbacks of the same batch,
+        # because a label can only be attached to a synchronized file.
+        if callback_bodies:
+            self._synchronize_multi_upload_info(callback_bodies)
+        if data:
+            self._flush_labels(data)
+
+    def _flush_labels(self, data: List[Data]) -> None:
+        self._synchronizer.upload_labels(data)
+        self._record_uploaded(data)
+
+    def _record_uploaded(self, data: Iterable[Data]) -> None:
+        if self._journal:
+            self._journal.record(single_data.target_remote_path for single_data in data)
 
     def _upload_label(self, data: Data) -> None:
         label = data.label.dumps()
@@ -187,6 +440,76 @@ class SegmentClientBase:
         }
         self._client.open_api_do("PUT", "labels", self.dataset_id, json=post_data)
 
+    @contextmanager
+    def batch_labels(self, *, batch_size: int = 128) -> Generator[None, None, None]:
+        """Defer the label uploading of the uploaded data into batches.
+
+        Inside the context, :meth:`SegmentClient.upload_data` and
+        :meth:`FusionSegmentClient.upload_frame` only upload the files,
+        their labels are buffered and uploaded by multi-label requests.
+        All the buffered labels are uploaded when leaving the context.
+
+        Examples:
+            >>> with segment_client.batch_labels():
+            ...     for data in segment:
+            ...         segment_client.upload_data(data)
+
+        Arguments:
+            batch_size: The max number of labels in one request.
+
+        Yields:
+            None.
+
+        """
+        previous = self._label_batcher
+        with Batcher(self._flush_labels, batch_size=batch_size) as batcher:
+            self._label_batcher = batcher
+            try:
+                yield
+            finally:
+                self._label_batcher = previous
+
+    @contextmanager
+    def batch_callbacks(
+        self, *, batch_size: int = 128, interval: Optional[float] = 1.0
+    ) -> Generator[None, None, None]:
+        """Defer the upload info synchronization of the uploaded files into batches.
+
+        Inside the context, the callbacks of the uploaded files are buffered and flushed
+        by multi-callback requests in a background thread, so the uploading threads
+        move on to the next file right away.
+        Without ``interval``, no background thread is started,
+        and a batch is flushed by the uploading thread which fills it up.
+        The labels of the uploaded data are deferred as well, since they can only be uploaded
+        after the callbacks.
+        All the buffered callbacks are flushed and the flushing error is raised
+        when leaving the context.
+
+        Arguments:
+            batch_size: The max number of callbacks in one request.
+            interval: The max seconds a callback stays in the buffer,
+                None for flushing the full batches in the uploading threads.
+
+        Yields:
+            None.
+
+        """
+        previous = self._callback_batcher
+        with Batcher(self._flush_callbacks, batch_size=batch_size, interval=interval) as batcher:
+            self._callback_batcher = batcher
+            try:
+                yield
+            finally:
+                self._callback_batcher = previous
+
+    def _upload_or_defer_label(self, data: Data) -> None:
+        if self._callback_batcher:
+            self._callback_batcher.add(data)
+        elif self._label_batcher:
+            self._label_batcher.add(data)
+        else:
+            self._flush_labels([data])
+
     @property
     def name(self) -> str:
         """Return the segment name.
@@ -247,7 +570,7 @@ class SegmentClient(SegmentClientBase):
     """
 
     def _list_data(
-        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128
+        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128, jobs: int = 1
     ) -> Iterator[Dict[str, Any]]:
         """List data in a segment in a certain commit.
 
@@ -255,22 +578,23 @@ class SegmentClient(SegmentClientBase):
             start: The index to start.
             stop: The index to stop.
             page_size: The page size for listed data.
+            jobs: The number of the max workers for requesting pages concurrently.
 
-        Yields:
-            Data in a segment client.
+        Returns:
+            The iterator of data in a segment client.
 
         """
-        params: Dict[str, Any] = {"segmentName": self._name}
-        if self._commit_id:
-            params["commit"] = self._commit_id
+        return self._list_paged("data", "data", start, stop, page_size, jobs)
 
-        for params["offset"], params["limit"] in paging_range(start, stop, page_size):
-            response = self._client.open_api_do(
-                "GET", "data", self.dataset_id, params=params
-            ).json()
-            yield from response["data"]
-            if response["recordSize"] + response["offset"] >= response["totalCount"]:
-                break
+    def _loads_data_page(self, contents: List[Dict[str, Any]]) -> List[RemoteData]:
+        page = [RemoteData.loads(content) for content in contents]
+        self._url_resolver.register(data.path for data in page)
+        for data in page:
+            self._set_remote_hooks(data)
+        return page
+
+    def _upload_data_pipelined(self, data: Iterable[Data], config: UploadPipelineConfig) -> None:
+        self._upload_pipelined(map(_UploadTask, data), config)
 
     def upload_file(self, local_path: str, target_remote_path: str = "") -> None:
         """Upload data with local path to the draft.
@@ -281,7 +605,6 @@ class SegmentClient(SegmentClientBase):
 
         Raises:
             GASPathError: When target_remote_path does not follow linux style.
-            GASException: When uploading data failed.
 
         """
         if not target_remote_path:
@@ -290,25 +613,8 @@ class SegmentClient(SegmentClientBase):
         if "\\" in target_remote_path:
             raise GASPathError(target_remote_path)
 
-        permission = self._get_upload_permission()
-        post_data = permission["result"]
-        post_data["key"] = permission["extra"]["objectPrefix"] + target_remote_path
-
-        del post_data["x:category"]
-        del post_data["x:id"]
-        try:
-            version_id, etag = self._post_multipart_formdata(
-                permission["extra"]["host"],
-                local_path,
-                target_remote_path,
-                post_data,
-            )
-
-            self._synchronize_upload_info(post_data["key"], version_id, etag)
-
-        except GASException:
-            self._clear_upload_permission()
-            raise
+        key, version_id, etag = self._upload_object(local_path, target_remote_path)
+        self._synchronize_upload_info(key, version_id, etag)
 
     def upload_label(self, data: Data) -> None:
         """Upload label with Data object to the draft.
@@ -319,6 +625,19 @@ class SegmentClient(SegmentClientBase):
         """
         self._upload_label(data)
 
+    def upload_labels(self, data: Iterable[Data], *, batch_size: int = 128, jobs: int = 1) -> None:
+        """Upload labels of multiple Data objects to the draft in batches.
+
+        Arguments:
+            data: The data objects whose labels need to be uploaded.
+            batch_size: The max number of labels in one request.
+            jobs: The number of the max workers for uploading batches concurrently.
+
+        """
+        data_iterator = iter(data)
+        batches = iter(lambda: list(islice(data_iterator, batch_size)), [])
+        multithread_upload(self._synchronizer.upload_labels, batches, jobs=jobs)
+
     def upload_data(self, data: Data) -> None:
         """Upload Data object to the draft.
 
@@ -327,36 +646,94 @@ class SegmentClient(SegmentClientBase):
 
         """
         self.upload_file(data.path, data.target_remote_path)
-        self._upload_label(data)
+        self._upload_or_defer_label(data)
 
-    def list_data_paths(self, *, start: int = 0, stop: int = sys.maxsize) -> Iterator[str]:
+    def list_data_paths(
+        self, *, start: int = 0, stop: int = sys.maxsize, jobs: int = 1
+    ) -> Iterator[str]:
         """List required data path in a segment in a certain commit.
 
         Arguments:
             start: The index to start.
             stop: The index to end.
+            jobs: The number of the max workers for requesting pages concurrently.
 
         Yields:
             Required data paths.
 
         """
-        yield from (item["remotePath"] for item in self._list_data(start=start, stop=stop))
+        # The label contents in the metadata snapshot contain the remote paths of all the data.
+        list_items = self._list_labels if self._snapshot else self._list_data
+        yield from (item["remotePath"] for item in list_items(start=start, stop=stop, jobs=jobs))
 
-    def list_data(self, *, start: int = 0, stop: int = sys.maxsize) -> Iterator[RemoteData]:
+    def list_data(
+        self, *, start: int = 0, stop: int = sys.maxsize, jobs: int = 1
+    ) -> Iterator[RemoteData]:
         """List required Data object in a dataset segment.
 
         Arguments:
             start: The index to start.
             stop: The index to stop.
+            jobs: The number of the max workers for requesting pages concurrently.
 
         Yields:
             Required Data object.
 
         """
-        for data_content in self._list_labels(start=start, stop=stop):
-            data = RemoteData.loads(data_content)
-            data._url_getter = self._get_url  # pylint: disable=protected-access
-            yield data
+        data_contents = self._list_labels(start=start, stop=stop, jobs=jobs)
+        while True:
+            page = self._loads_data_page(list(islice(data_contents, 128)))
+            if not page:
+                return
+            yield from page
+
+    def get_paging_data(
+        self, *, page_size: int = 128, max_cached_pages: int = 32
+    ) -> PagingList[RemoteData]:
+        """Get a lazy sequence of the data in the segment in a certain commit.
+
+        The pages of the data are requested on demand, so the random access of a data
+        costs at most one request instead of listing the whole segment.
+
+        Arguments:
+            page_size: The page size of the paging request.
+            max_cached_pages: The max number of the decoded pages kept in the cache.
+
+        Returns:
+            The :class:`~tensorbay.client.lazy.PagingList` of the data.
+
+        """
+        return PagingList(
+            self._make_page_request("labels"),
+            "labels",
+            self._loads_data_page,
+            page_size=page_size,
+            max_cached_pages=max_cached_pages,
+        )
+
+    def download_data(
+        self,
+        directory: str,
+        *,
+        jobs: int = 1,
+        verify_checksum: bool = False,
+        fail_fast: bool = True,
+    ) -> TransferSummary[RemoteData]:
+        """Download all the data in the segment into a local directory.
+
+        Arguments:
+            directory: The local directory to download the data into.
+            jobs: The number of the max workers for downloading files concurrently.
+            verify_checksum: Whether to verify the MD5 of the downloaded content against the ETag.
+            fail_fast: Whether to stop and raise the exception when the first download fails.
+                If False, the failures are collected in the returned summary.
+
+        Returns:
+            The :class:`~tensorbay.client.requests.TransferSummary` of the downloading.
+
+        """
+        downloader = Downloader(self._client, jobs=jobs, verify_checksum=verify_checksum)
+        return downloader.download(self.list_data(), directory, fail_fast=fail_fast)
 
 
 class FusionSegmentClient(SegmentClientBase):
@@ -372,8 +749,36 @@ class FusionSegmentClient(SegmentClientBase):
 
     """
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # The journal records of the sensor data being uploaded,
+        # the records of the data dropped by a failed upload are released with the data.
+        self._journal_keys: "WeakKeyDictionary[Data, str]" = WeakKeyDictionary()
+
+    def _flush_labels(self, data: List[Data]) -> None:
+        try:
+            super()._flush_labels(data)
+        finally:
+            for single_data in data:
+                self._journal_keys.pop(single_data, None)
+
+    def _record_uploaded(self, data: Iterable[Data]) -> None:
+        if self._journal:
+            keys = (self._journal_keys.get(single_data) for single_data in data)
+            self._journal.record(key for key in keys if key)
+
+    def _iter_frame_data(
+        self, frame: Frame, timestamp: Optional[float], uploaded: Optional[UploadedFrames] = None
+    ) -> Iterator[Tuple[Data, Dict[str, Any]]]:
+        for data, frame_info in iter_frame_data(frame, timestamp, self._name, uploaded):
+            if self._journal:
+                self._journal_keys[data] = get_frame_key(
+                    frame_info["frameId"], frame_info["sensorName"]
+                )
+            yield data, frame_info
+
     def _list_frames(
-        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128
+        self, *, start: int = 0, stop: int = sys.maxsize, page_size: int = 128, jobs: int = 1
     ) -> Iterator[Dict[str, Any]]:
         """List all frames in a segment in a certain commit.
 
@@ -381,22 +786,70 @@ class FusionSegmentClient(SegmentClientBase):
             start: The index to start.
             stop: The index to stop.
             page_size: The page size for listed frames.
+            jobs: The number of the max workers for requesting pages concurrently.
 
-        Yields:
-             Required frames.
+        Returns:
+            The iterator of required frames.
 
         """
+        return self._list_paged("data", "data", start, stop, page_size, jobs)
+
+    def _loads_frame_page(self, contents: List[Dict[str, Any]]) -> List[Frame]:
+        frames = [Frame.loads(content) for content in contents]
+        self._url_resolver.register(
+            data.path
+            for frame in frames
+            for data in frame.values()  # pylint: disable=no-member # pylint issue: #3131
+        )
+        for frame in frames:
+            for data in frame.values():  # pylint: disable=no-member # pylint issue: #3131
+                self._set_remote_hooks(data)  # type: ignore[arg-type]
+        return frames
+
+    def _get_sensor_contents(self) -> List[Dict[str, Any]]:
+        if self._snapshot:
+            sensors = self._snapshot.get_sensors(self._name)
+            if sensors is not None:
+                return sensors
+
         params: Dict[str, Any] = {"segmentName": self._name}
         if self._commit_id:
             params["commit"] = self._commit_id
 
-        for params["offset"], params["limit"] in paging_range(start, stop, page_size):
-            response = self._client.open_api_do(
-                "GET", "data", self.dataset_id, params=params
-            ).json()
-            yield from response["data"]
-            if response["recordSize"] + response["offset"] >= response["totalCount"]:
-                break
+        response = self._client.open_api_do("GET", "sensors", self.dataset_id, params=params)
+        return json_loads(response.content)["sensors"]  # type: ignore[no-any-return]
+
+    def _upload_frame_data(self, data: Data, frame_info: Dict[str, Any]) -> None:
+        key, version_id, etag = self._upload_object(data.path, data.target_remote_path)
+        self._synchronize_upload_info(key, version_id, etag, frame_info)
+        self._upload_or_defer_label(data)
+
+    def _upload_frames(
+        self,
+        frames: Iterable[Tuple[Frame, Optional[float]]],
+        *,
+        jobs: Union[int, str] = 1,
+        fail_fast: bool = True,
+        uploaded: Optional[UploadedFrames] = None,
+    ) -> TransferSummary[Frame]:
+        work = (
+            (frame, list(self._iter_frame_data(frame, timestamp, uploaded)))
+            for frame, timestamp in frames
+        )
+        return upload_frames(self._upload_frame_data, work, jobs=jobs, fail_fast=fail_fast)
+
+    def _upload_frames_pipelined(
+        self,
+        frames: Iterable[Tuple[Frame, Optional[float]]],
+        config: UploadPipelineConfig,
+        uploaded: Optional[UploadedFrames] = None,
+    ) -> None:
+        tasks = (
+            _UploadTask(data, frame_info)
+            for frame, timestamp in frames
+            for data, frame_info in self._iter_frame_data(frame, timestamp, uploaded)
+        )
+        self._upload_pipelined(tasks, config)
 
     def list_sensors(self) -> Iterator["Sensor._Type"]:
         """List required sensor object in a segment client.
@@ -405,13 +858,7 @@ class FusionSegmentClient(SegmentClientBase):
             Required sensor objects.
 
         """
-        params: Dict[str, Any] = {"segmentName": self._name}
-        if self._commit_id:
-            params["commit"] = self._commit_id
-
-        response = self._client.open_api_do("GET", "sensors", self.dataset_id, params=params).json()
-
-        for sensor_info in response["sensors"]:
+        for sensor_info in self._get_sensor_contents():
             yield Sensor.loads(sensor_info)
 
     def upload_sensor(self, sensor: Sensor) -> None:
@@ -437,85 +884,97 @@ class FusionSegmentClient(SegmentClientBase):
 
         self._client.open_api_do("DELETE", "sensors", self.dataset_id, json=delete_data)
 
-    def upload_frame(self, frame: Frame, timestamp: Optional[float] = None) -> None:
+    def upload_frame(
+        self, frame: Frame, timestamp: Optional[float] = None, *, jobs: int = 1
+    ) -> None:
         """Upload frame to the draft.
 
+        The frame ID is either given by the frame or generated from the timestamp,
+        a frame with both or neither of them is rejected with :class:`TypeError`.
+
         Arguments:
             frame: The :class:`~tensorbay.dataset.frame.Frame` to upload.
             timestamp: The mark to sort frames, supporting timestamp and float.
-
-        Raises:
-            GASPathError: When remote_path does not follow linux style.
-            GASException: When uploading frame failed.
-            TypeError: When frame id conflicts。                                `
+            jobs: The number of the max workers for uploading the sensor data concurrently.
 
         """
-        if timestamp is None:
-            try:
-                frame_id = frame.frame_id
-            except AttributeError as error:
-                raise TypeError(
-                    "Lack frame id, please add frame id in frame or "
-                    "give timestamp to the function!"
-                ) from error
-        elif hasattr(frame, "frame_id"):
-            raise TypeError("Frame id conflicts, please do not give timestamp to the function!.")
-        else:
-            frame_id = str(ulid.from_timestamp(timestamp))
+        if jobs > 1:
+            self._upload_frames(((frame, timestamp),), jobs=jobs)
+            return
 
-        for sensor_name, data in frame.items():
-            if not isinstance(data, Data):
-                continue
+        for data, frame_info in self._iter_frame_data(frame, timestamp):
+            self._upload_frame_data(data, frame_info)
 
-            remote_path = data.target_remote_path
+    def list_frames(
+        self, *, start: int = 0, stop: int = sys.maxsize, jobs: int = 1
+    ) -> Iterator[Frame]:
+        """List required frames in the segment in a certain commit.
 
-            if "\\" in remote_path:
-                raise GASPathError(remote_path)
+        Arguments:
+            start: The index to start.
+            stop: The index to stop.
+            jobs: The number of the max workers for requesting pages concurrently.
 
-            permission = self._get_upload_permission()
-            post_data = permission["result"]
-            post_data["key"] = permission["extra"]["objectPrefix"] + remote_path
+        Yields:
+            Required :class:`~tensorbay.dataset.frame.Frame`.
 
-            del post_data["x:category"]
-            del post_data["x:id"]
+        """
+        frame_contents = self._list_labels(start=start, stop=stop, jobs=jobs)
+        while True:
+            page = self._loads_frame_page(list(islice(frame_contents, 128)))
+            if not page:
+                return
+            yield from page
 
-            try:
-                version_id, etag = self._post_multipart_formdata(
-                    permission["extra"]["host"],
-                    data.path,
-                    remote_path,
-                    post_data,
-                )
+    def get_paging_frames(
+        self, *, page_size: int = 128, max_cached_pages: int = 32
+    ) -> PagingList[Frame]:
+        """Get a lazy sequence of the frames in the segment in a certain commit.
 
-                frame_info: Dict[str, Any] = {
-                    "segmentName": self._name,
-                    "sensorName": sensor_name,
-                    "frameId": frame_id,
-                }
-                if hasattr(data, "timestamp"):
-                    frame_info["timestamp"] = data.timestamp
+        The pages of the frames are requested on demand, so the random access of a frame
+        costs at most one request instead of listing the whole segment.
 
-                self._synchronize_upload_info(post_data["key"], version_id, etag, frame_info)
+        Arguments:
+            page_size: The page size of the paging request.
+            max_cached_pages: The max number of the decoded pages kept in the cache.
 
-            except GASException:
-                self._clear_upload_permission()
-                raise
-            self._upload_label(data)
+        Returns:
+            The :class:`~tensorbay.client.lazy.PagingList` of the frames.
 
-    def list_frames(self, *, start: int = 0, stop: int = sys.maxsize) -> Iterator[Frame]:
-        """List required frames in the segment in a certain commit.
+        """
+        return PagingList(
+            self._make_page_request("labels"),
+            "labels",
+            self._loads_frame_page,
+            page_size=page_size,
+            max_cached_pages=max_cached_pages,
+        )
+
+    def download_frames(
+        self,
+        directory: str,
+        *,
+        jobs: int = 1,
+        verify_checksum: bool = False,
+        fail_fast: bool = True,
+    ) -> TransferSummary[RemoteData]:
+        """Download the data of all the frames in the segment into a local directory.
 
         Arguments:
-            start: The index to start.
-            stop: The index to stop.
+            directory: The local directory to download the data into.
+            jobs: The number of the max workers for downloading files concurrently.
+            verify_checksum: Whether to verify the MD5 of the downloaded content against the ETag.
+            fail_fast: Whether to stop and raise the exception when the first download fails.
+                If False, the failures are collected in the returned summary.
 
-        Yields:
-            Required :class:`~tensorbay.dataset.frame.Frame`.
+        Returns:
+            The :class:`~tensorbay.client.requests.TransferSummary` of the downloading.
 
         """
-        for frame_content in self._list_labels(start=start, stop=stop):
-            frame = Frame.loads(frame_content)
-            for data in frame.values():  # pylint: disable=no-member # pylint issue: #3131
-                # pylint: disable=protected-access
-                data._url_getter = self._get_url  # type: ignore[union-attr]
-            yield frame
+        downloader = Downloader(self._client, jobs=jobs, verify_checksum=verify_checksum)
+        data = (
+            remote_data
+            for frame in self.list_frames()
+            for remote_data in frame.values()  # pylint: disable=no-member
+        )
+        return downloader.download(data, directory, fail_fast=fail_fast)  # type: ignore[arg-type]
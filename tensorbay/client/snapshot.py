@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class MetadataSnapshot.
+
+:class:`MetadataSnapshot` is a local snapshot of the metadata of a dataset commit,
+including the segments, the labels of the data, the sensors and the catalog.
+A commit is immutable, so the snapshot can serve the listing requests offline.
+
+The snapshot is saved as a gzip compressed JSON file, which keeps the contents
+returned by the Open API as they are.
+
+"""
+
+import gzip
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utility import json_dumps, json_loads
+
+
+def default_snapshot_path(dataset_id: str, commit_id: str) -> str:
+    """Get the default path of the metadata snapshot of a commit.
+
+    Arguments:
+        dataset_id: Dataset ID.
+        commit_id: The commit ID.
+
+    Returns:
+        The default path of the metadata snapshot.
+
+    """
+    home = "USERPROFILE" if os.name == "nt" else "HOME"
+    return os.path.join(os.environ[home], ".gas", "snapshots", dataset_id, f"{commit_id}.json.gz")
+
+
+class MetadataSnapshot:
+    """This class defines :class:`MetadataSnapshot`.
+
+    Arguments:
+        dataset_id: Dataset ID.
+        commit_id: The commit ID.
+        catalog: The catalog contents of the commit.
+        segments: The dict whose keys are the segment names and values are the dicts of
+            the label contents (the "labels" key) and the sensor contents (the "sensors" key,
+            only for fusion segments) of the segments.
+
+    """
+
+    _VERSION = 1
+
+    def __init__(
+        self,
+        dataset_id: str,
+        commit_id: str,
+        catalog: Dict[str, Any],
+        segments: Dict[str, Dict[str, List[Dict[str, Any]]]],
+    ) -> None:
+        self.dataset_id = dataset_id
+        self.commit_id = commit_id
+        self.catalog = catalog
+        self._segments = segments
+
+    @classmethod
+    def load(cls, path: str) -> "MetadataSnapshot":
+        """Load a metadata snapshot from a file.
+
+        Arguments:
+            path: The path of the snapshot file.
+
+        Returns:
+            The loaded :class:`MetadataSnapshot`.
+
+        Raises:
+            ValueError: When the version of the snapshot file is not supported.
+
+        """
+        with gzip.open(path, "rb") as fp:
+            contents = json_loads(fp.read())
+
+        if contents.get("version") != cls._VERSION:
+            raise ValueError(f'Unsupported snapshot version "{contents.get("version")}"')
+
+        return cls(
+            contents["datasetId"],
+            contents["commitId"],
+            contents["catalog"],
+            {segment.pop("name"): segment for segment in contents["segments"]},
+        )
+
+    def dump(self, path: str) -> None:
+        """Save the metadata snapshot into a file atomically.
+
+        Arguments:
+            path: The path of the snapshot file.
+
+        Raises:
+            BaseException: When the writing fails, the temporary file is removed
+                before the error is raised.
+
+        """
+        contents = {
+            "version": self._VERSION,
+            "datasetId": self.dataset_id,
+            "commitId": self.commit_id,
+            "catalog": self.catalog,
+            "segments": [{"name": name, **segment} for name, segment in self._segments.items()],
+        }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(prefix=".", suffix=".snapshot", dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as raw, gzip.open(raw, "wb") as fp:
+                fp.write(json_dumps(contents))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @property
+    def segment_names(self) -> List[str]:
+        """Return the segment names in the snapshot.
+
+        Returns:
+            The segment names in the snapshot.
+
+        """
+        return list(self._segments)
+
+    def get_labels(self, segment_name: str) -> List[Dict[str, Any]]:
+        """Get the label contents of a segment.
+
+        Arguments:
+            segment_name: The segment name.
+
+        Returns:
+            The label contents of the data or the frames in the segment.
+
+        """
+        return self._segments[segment_name]["labels"]
+
+    def get_sensors(self, segment_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the sensor contents of a fusion segment.
+
+        Arguments:
+            segment_name: The segment name.
+
+        Returns:
+            The sensor contents of the segment, None if the segment is not a fusion segment.
+
+        """
+        return self._segments[segment_name].get("sensors")
+
+
+def make_page_request(
+    items: List[Dict[str, Any]], key: str
+) -> Callable[[int, int], Dict[str, Any]]:
+    """Make a paging request function which serves the pages of a list offline.
+
+    Arguments:
+        items: The listed items.
+        key: The key of the listed items in the response json.
+
+    Returns:
+        The function which takes offset and limit and returns the response json.
+
+    """
+
+    def _request(offset: int, limit: int) -> Dict[str, Any]:
+        page = items[offset : offset + limit]
+        return {key: page, "offset": offset, "recordSize": len(page), "totalCount": len(items)}
+
+    return _request
@@ -0,0 +1,5 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+"""Unittests for client module."""
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import threading
+
+import pytest
+
+from ..batch import Batcher
+
+
+class TestBatcher:
+    def test_add(self):
+        batches = []
+        with Batcher(batches.append, batch_size=3) as batcher:
+            for index in range(7):
+                batcher.add(index)
+            assert batches == [[0, 1, 2], [3, 4, 5]]
+
+        assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_flush_on_error(self):
+        batches = []
+        with pytest.raises(KeyError):
+            with Batcher(batches.append, batch_size=3) as batcher:
+                batcher.add(0)
+                raise KeyError
+
+        assert batches == [[0]]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            Batcher(print, batch_size=0)
+
+    def test_background(self):
+        batches = []
+        flushed = threading.Event()
+
+        def flush(batch):
+            batches.append(batch)
+            flushed.set()
+
+        with Batcher(flush, batch_size=3, interval=0.01) as batcher:
+            batcher.add(0)
+            assert flushed.wait(5)
+            assert batches == [[0]]
+
+            for index in range(1, 5):
+                batcher.add(index)
+
+        assert sum(batches, []) == list(range(5))
+        assert all(len(batch) <= 3 for batch in batches)
+
+    def test_background_error(self):
+        def flush(batch):
+            raise KeyError(batch)
+
+        batcher = Batcher(flush, interval=10)
+        batcher.add(0)
+        with pytest.raises(KeyError):
+            batcher.flush()
+        with pytest.raises(KeyError):
+            batcher.add(1)
+        batcher.close()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import os
+import tempfile
+from multiprocessing import Pool
+
+from ..cache import ContentCache
+from ..requests import Client
+from ..segment import SegmentClient
+from .utility import LocalServer
+
+
+def _write_atomically(path, content):
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp", dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as fp:
+        fp.write(content)
+    os.replace(temp_path, path)
+
+
+def _read_in_process(directory):
+    cache = ContentCache(directory, max_bytes=20 * 1000)
+    contents = []
+    for index in range(40):
+        content = bytes([index]) * 1000
+        with cache.open(
+            "dataset_id", "commit_id", f"{index}.bin", lambda path: _write_atomically(path, content)
+        ) as fp:
+            contents.append(fp.read() == content)
+    return all(contents)
+
+
+class TestContentCache:
+    def test_open(self, tmp_path):
+        cache = ContentCache(str(tmp_path))
+        downloads = []
+
+        def _download(path):
+            downloads.append(path)
+            _write_atomically(path, b"content")
+
+        assert cache.get("dataset_id", "commit_id", "a.bin") is None
+        for _ in range(3):
+            with cache.open("dataset_id", "commit_id", "a.bin", _download) as fp:
+                assert fp.read() == b"content"
+        assert len(downloads) == 1
+
+        with cache.open("dataset_id", "another_commit_id", "a.bin", _download) as fp:
+            assert fp.read() == b"content"
+        assert len(downloads) == 2
+
+    def test_evict(self, tmp_path):
+        cache = ContentCache(str(tmp_path), max_bytes=1000)
+        for index in range(3):
+            cache.open(
+                "dataset_id",
+                "commit_id",
+                f"{index}.bin",
+                lambda path: _write_atomically(path, b"0" * 300),
+            ).close()
+            path = cache._get_path("dataset_id", "commit_id", f"{index}.bin")
+            os.utime(path, (index, index))
+
+        # Hitting the oldest file makes it the most recently used one.
+        cache.get("dataset_id", "commit_id", "0.bin").close()
+        cache.open(
+            "dataset_id", "commit_id", "3.bin", lambda path: _write_atomically(path, b"0" * 300)
+        ).close()
+
+        cached = {
+            index for index in range(4) if cache.get("dataset_id", "commit_id", f"{index}.bin")
+        }
+        assert cached == {0, 2, 3}
+
+        cache.clear()
+        assert cache.get("dataset_id", "commit_id", "3.bin") is None
+
+    def test_multiprocess(self, tmp_path):
+        with Pool(4) as pool:
+            assert all(pool.map(_read_in_process, [str(tmp_path)] * 4))
+
+        filenames = [filename for _, _, filenames in os.walk(tmp_path) for filename in filenames]
+        assert not [filename for filename in filenames if filename.startswith(".tmp")]
+        assert ".lock" in filenames
+        assert len(filenames) < 40 + 1
+
+    def test_remote_data_open(self, tmp_path):
+        downloaded = []
+
+        def _handle(method, path, query, headers, body):
+            if path.endswith("/labels"):
+                labels = [{"remotePath": "a.bin", "label": {}}]
+                return 200, {}, {"labels": labels, "offset": 0, "recordSize": 1, "totalCount": 1}
+            if path.endswith("/data/urls"):
+                return 200, {}, {"url": f"{server.url}objects/a.bin"}
+            downloaded.append(path)
+            return 200, {}, b"content"
+
+        with LocalServer(_handle) as server:
+            client = Client("Accesskey-test", server.url)
+            segment_client = SegmentClient(
+                "test",
+                "dataset_id",
+                "dataset",
+                client,
+                "commit_id",
+                content_cache=ContentCache(str(tmp_path)),
+            )
+            for _ in range(2):
+                for data in segment_client.list_data():
+                    with data.open() as fp:
+                        assert fp.read() == b"content"
+
+        assert len(downloaded) == 1
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import threading
+import time
+
+import pytest
+
+from ..concurrency import AdaptiveConcurrency
+from ..requests import Client, multithread_upload
+from .utility import LocalServer
+
+
+class _ThrottlingServer:
+    def __init__(self, capacity):
+        self.throttled = 0
+        self._capacity = capacity
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, query, headers, body):
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                self.throttled += 1
+                return 429, {"Retry-After": "0"}, {}
+            self._in_flight += 1
+        time.sleep(0.01)
+        with self._lock:
+            self._in_flight -= 1
+        return 200, {}, {}
+
+
+class TestAdaptiveConcurrency:
+    def test_increase(self):
+        controller = AdaptiveConcurrency(initial_jobs=2, max_jobs=8)
+        summary = multithread_upload(lambda _: time.sleep(0.005), range(200), jobs=controller)
+
+        assert summary.succeeded == 200
+        assert controller.concurrency > 2
+        assert controller.throughput > 0
+
+    def test_throttle(self):
+        controller = AdaptiveConcurrency(initial_jobs=8, max_jobs=8)
+        controller.on_throttle()
+        assert controller.concurrency == 4
+        # Only one decrease in a window.
+        controller.on_throttle()
+        assert controller.concurrency == 4
+        assert controller.get_metrics()["throttledCount"] == 2
+
+        controller.on_throttle(0.05)
+        start = time.monotonic()
+        controller.wait_ready()
+        assert time.monotonic() - start > 0.02
+
+    def test_base_latency(self):
+        controller = AdaptiveConcurrency(initial_jobs=1, max_jobs=1)
+        controller._on_complete(0.01)
+        assert controller.get_metrics()["baseLatency"] == 0.01
+
+        for _ in range(100):
+            controller._on_complete(0.1)
+        assert controller.get_metrics()["baseLatency"] == pytest.approx(0.1, abs=1e-3)
+
+    def test_throttling_server(self):
+        stub = _ThrottlingServer(capacity=3)
+        with LocalServer(stub.handle) as server:
+            client = Client("Accesskey-test", server.url)
+            controller = AdaptiveConcurrency(initial_jobs=8, max_jobs=16)
+            concurrencies = []
+
+            def _request(_):
+                client.do("GET", server.url)
+                concurrencies.append(controller.concurrency)
+
+            summary = multithread_upload(_request, range(100), jobs=controller, fail_fast=False)
+
+        assert summary.succeeded + len(summary.failures) == 100
+        assert stub.throttled > 0
+        assert controller.get_metrics()["throttledCount"] > 0
+        # The concurrency may grow back after the throttling stops.
+        assert min(concurrencies) < 8
+
+    def test_invalid_jobs(self):
+        with pytest.raises(ValueError):
+            multithread_upload(print, range(3), jobs="many")
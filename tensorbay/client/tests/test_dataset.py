@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import json
+import time
+
+import pytest
+
+from ...dataset import Data, Frame, FusionSegment, Segment
+from ...sensor import Lidar
+from ..dataset import DatasetClient
+from ..exceptions import GASSegmentError
+from ..fake import FakeServer
+from ..gas import GAS
+from ..requests import Client
+from ..snapshot import make_page_request
+from .utility import LocalServer
+
+
+class _SegmentServer:
+    def __init__(self, segment_names):
+        self.requests = []
+        self._segment_names = list(segment_names)
+
+    def handle(self, method, path, query, headers, body):
+        section = path.split("/datasets/dataset_id", 1)[-1].lstrip("/")
+        self.requests.append((method, section))
+
+        if section == "segments":
+            if method == "POST":
+                self._segment_names.append(json.loads(body)["name"])
+                return 200, {}, {}
+            if method == "DELETE":
+                self._segment_names.remove(json.loads(body)["segmentName"])
+                return 200, {}, {}
+            segments = [{"name": name} for name in self._segment_names]
+            offset, limit = int(query["offset"][0]), int(query["limit"][0])
+            return 200, {}, make_page_request(segments, "segments")(offset, limit)
+
+        if method == "POST" and section == "":
+            return 200, {}, {"commitId": "commit_id"}
+        if section == "policies":
+            return 200, {}, {
+                "result": {"policy": "policy", "x:category": "", "x:id": ""},
+                "extra": {"host": "https://host", "objectPrefix": "prefix/"},
+                "expireAt": time.time() + 240,
+            }
+        return 200, {}, {}
+
+
+class TestDatasetClient:
+    def test_segment_names(self):
+        stub = _SegmentServer(f"segment{index}" for index in range(300))
+        with LocalServer(stub.handle) as server:
+            dataset_client = DatasetClient(
+                "test", "dataset_id", Client("Accesskey-test", server.url)
+            )
+            for index in range(300):
+                assert dataset_client.get_segment(f"segment{index}").name == f"segment{index}"
+            assert stub.requests.count(("GET", "segments")) == 3
+
+            dataset_client.get_or_create_segment("segment0")
+            dataset_client.get_or_create_segment("new")
+            dataset_client.get_segment("new")
+            dataset_client.delete_segment("segment0")
+            with pytest.raises(GASSegmentError):
+                dataset_client.get_segment("segment0")
+            assert stub.requests.count(("GET", "segments")) == 3
+            assert stub.requests.count(("POST", "segments")) == 1
+
+            # The segment names are listed again in the new commit.
+            dataset_client.commit("commit")
+            dataset_client.get_segment("new")
+            assert stub.requests.count(("GET", "segments")) == 6
+
+    def test_shared_permission(self):
+        stub = _SegmentServer(["train", "test"])
+        with LocalServer(stub.handle) as server:
+            dataset_client = DatasetClient(
+                "test", "dataset_id", Client("Accesskey-test", server.url), shared_permission=True
+            )
+            permissions = [
+                dataset_client.get_segment(name)._permission_manager.get(name)
+                for name in ("train", "test")
+            ]
+            assert permissions[0] is permissions[1]
+            assert stub.requests.count(("GET", "policies")) == 1
+
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url, shared_permission=True)
+            assert gas.create_dataset("test")._permission_manager._shared
+            assert gas.get_dataset("test")._permission_manager._shared
+
+    def test_missing_journal(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        segment = Segment("train")
+        for index in range(3):
+            local_path = tmp_path / f"{index}.png"
+            local_path.write_bytes(b"png")
+            segment.append(Data(str(local_path)))
+
+        with FakeServer() as server:
+            dataset_client = GAS("Accesskey-fake", server.url).create_dataset("test")
+            dataset_client.upload_segment(segment)
+
+            # The remote segment is listed when the journal does not exist yet.
+            dataset_client.upload_segment(segment, skip_uploaded_files=True, journal_dir=True)
+            assert server.request_counts["POST", "(object)"] == 3
+            assert server.request_counts["GET", "data"] == 1
+
+            dataset_client.upload_segment(segment, skip_uploaded_files=True, journal_dir=True)
+            assert server.request_counts["POST", "(object)"] == 3
+            assert server.request_counts["GET", "data"] == 1
+            assert (tmp_path / ".gas" / "journals").is_dir()
+
+
+def _fusion_segment(directory):
+    segment = FusionSegment("train")
+    for sensor_name in ("lidar", "radar"):
+        segment.sensors.add(Lidar(sensor_name))
+    for index in range(5):
+        frame = Frame()
+        for sensor_name in ("lidar", "radar"):
+            local_path = directory / f"{index}_{sensor_name}.bin"
+            if (index, sensor_name) != (2, "radar"):
+                local_path.write_bytes(b"bin")
+            frame[sensor_name] = Data(str(local_path))
+        segment.append(frame)
+    return segment
+
+
+class TestFusionDatasetClient:
+    @pytest.mark.parametrize("use_journal", [False, True])
+    def test_resume(self, tmp_path, use_journal):
+        journal_dir = str(tmp_path / "journals") if use_journal else None
+        segment = _fusion_segment(tmp_path)
+        with FakeServer() as server:
+            dataset_client = GAS("Accesskey-fake", server.url).create_dataset("test", True)
+            with pytest.raises(FileNotFoundError):
+                dataset_client.upload_segment(segment, journal_dir=journal_dir)
+            assert server.request_counts["POST", "(object)"] < 10
+
+            (tmp_path / "2_radar.bin").write_bytes(b"bin")
+            segment_client = dataset_client.upload_segment(
+                segment, skip_uploaded_files=True, journal_dir=journal_dir
+            )
+            assert server.request_counts["POST", "(object)"] == 10
+            assert server.request_counts["POST", "sensors"] == 2
+
+            frames = list(segment_client.list_frames())
+            assert len(frames) == 5
+            assert all(len(frame) == 2 for frame in frames)
+            assert server.request_counts["GET", "data"] == (0 if use_journal else 1)
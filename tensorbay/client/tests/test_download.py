@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import hashlib
+import os
+
+import pytest
+
+from ...dataset import RemoteData
+from ..download import Downloader
+from ..exceptions import GASChecksumError, GASPathError
+from ..requests import Client, default_config
+from ..segment import SegmentClient
+from .utility import LocalServer
+
+
+class _Storage:
+    def __init__(self, objects, corrupted=()):
+        self.objects = objects
+        self.url = ""
+        self.downloaded = []
+        self._corrupted = set(corrupted)
+
+    def handle(self, method, path, query, headers, body):
+        if path.endswith("/labels"):
+            offset, limit = int(query["offset"][0]), int(query["limit"][0])
+            paths = sorted(self.objects)
+            data = [
+                {"remotePath": remote_path, "label": {}}
+                for remote_path in paths[offset : offset + limit]
+            ]
+            return (
+                200,
+                {},
+                {
+                    "labels": data,
+                    "offset": offset,
+                    "recordSize": len(data),
+                    "totalCount": len(paths),
+                },
+            )
+
+        if path.endswith("/data/urls"):
+            return 200, {}, {"url": f"{self.url}objects/{query['remotePath'][0]}"}
+
+        remote_path = path.split("/objects/", 1)[1]
+        content = self.objects[remote_path]
+        self.downloaded.append(remote_path)
+        etag = hashlib.md5(content).hexdigest()
+        if remote_path in self._corrupted:
+            content = content[::-1]
+        return 200, {"ETag": f'"{etag}"'}, content
+
+
+class TestDownloader:
+    def test_download_data(self, tmp_path):
+        objects = {f"dir/{index}.bin": os.urandom(1000 + index) for index in range(20)}
+        storage = _Storage(objects)
+        with LocalServer(storage.handle) as server:
+            storage.url = server.url
+            client = Client("Accesskey-test", server.url)
+            segment_client = SegmentClient("test", "dataset_id", "dataset", client)
+            summary = segment_client.download_data(str(tmp_path), jobs=4, verify_checksum=True)
+
+        assert summary.succeeded == 20
+        for remote_path, content in objects.items():
+            assert (tmp_path / remote_path).read_bytes() == content
+        assert sorted(os.listdir(tmp_path / "dir")) == sorted(
+            remote_path.split("/")[1] for remote_path in objects
+        )
+
+    def test_checksum_mismatch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(default_config, "backoff_factor", 0)
+        storage = _Storage({"a.bin": b"abc", "b.bin": b"def"}, corrupted=["b.bin"])
+        with LocalServer(storage.handle) as server:
+            storage.url = server.url
+            client = Client("Accesskey-test", server.url)
+            data = [
+                RemoteData(path, url_getter=lambda path: f"{server.url}objects/{path}")
+                for path in storage.objects
+            ]
+            summary = Downloader(client, verify_checksum=True).download(
+                data, str(tmp_path), fail_fast=False
+            )
+
+        assert summary.succeeded == 1
+        ((remote_data, error),) = summary.failures
+        assert remote_data.path == "b.bin"
+        assert isinstance(error, GASChecksumError)
+        assert storage.downloaded.count("b.bin") == default_config.max_retries + 1
+        assert os.listdir(tmp_path) == ["a.bin"]
+
+    def test_invalid_path(self, tmp_path):
+        downloader = Downloader(Client("Accesskey-test", "http://127.0.0.1/"))
+        data = RemoteData("../escape.bin", url_getter=lambda path: path)
+        with pytest.raises(GASPathError):
+            downloader.download([data], str(tmp_path))
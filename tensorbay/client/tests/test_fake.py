@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import pytest
+
+from ...dataset import Data, Dataset, Frame, FusionDataset
+from ...label import Classification
+from ...sensor import Lidar
+from ..exceptions import GASResponseError
+from ..fake import FakeServer
+from ..gas import GAS
+from ..requests import Client, default_config
+
+
+def _make_dataset(directory, count):
+    dataset = Dataset("test")
+    segment = dataset.create_segment("train")
+    for index in range(count):
+        local_path = directory / f"{index:03}.png"
+        local_path.write_bytes(b"png" * index)
+        data = Data(str(local_path))
+        data.label.classification = Classification(str(index))
+        segment.append(data)
+    return dataset
+
+
+class TestFakeServer:
+    def test_upload_and_list(self, tmp_path):
+        with FakeServer(unsupported_sections=("multi/data/urls",)) as server:
+            gas = GAS("Accesskey-fake", server.url)
+            gas.create_dataset("test")
+            dataset_client = gas.upload_dataset(_make_dataset(tmp_path, 200), jobs=4)
+            dataset_client.commit("commit")
+
+            segment_client = dataset_client.get_segment("train")
+            data = list(segment_client.list_data(jobs=2))
+            assert [single_data.path for single_data in data] == [
+                f"{index:03}.png" for index in range(200)
+            ]
+            assert data[5].label.classification.category == "5"
+            assert data[5].open().read() == b"png" * 5
+
+            assert server.request_counts["POST", "(object)"] == 200
+            assert server.request_counts["PUT", "multi/callback"] > 0
+            assert server.request_counts["POST", "multi/data/urls"] == 1
+            assert server.request_counts["GET", "data/urls"] == 128
+
+            summary = segment_client.download_data(
+                str(tmp_path / "download"), jobs=4, verify_checksum=True
+            )
+            assert not summary.failures
+            assert (tmp_path / "download" / "199.png").read_bytes() == b"png" * 199
+
+    def test_fusion(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(default_config, "multipart_threshold", 1024)
+        monkeypatch.setattr(default_config, "part_size", 512)
+
+        dataset = FusionDataset("fusion")
+        segment = dataset.create_segment("train")
+        segment.sensors.add(Lidar("lidar"))
+        for index in range(3):
+            local_path = tmp_path / f"{index}.bin"
+            local_path.write_bytes(bytes(range(256)) * (index * 3 + 1))
+            frame = Frame()
+            frame["lidar"] = Data(str(local_path), timestamp=index)
+            segment.append(frame)
+
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url)
+            gas.create_dataset("fusion", is_fusion=True)
+            segment_client = gas.upload_dataset(dataset).get_segment("train")
+
+            assert [sensor.name for sensor in segment_client.list_sensors()] == ["lidar"]
+            frames = list(segment_client.list_frames())
+            assert [frame["lidar"].path for frame in frames] == ["0.bin", "1.bin", "2.bin"]
+            assert frames[2]["lidar"].open().read() == bytes(range(256)) * 7
+            assert server.request_counts["POST", "multipart/complete"] == 1
+
+    def test_error_injection(self, monkeypatch):
+        monkeypatch.setattr(default_config, "backoff_factor", 0)
+        with FakeServer(error_rate=1, error_status=503) as server:
+            client = Client("Accesskey-fake", server.url)
+            with pytest.raises(GASResponseError) as error:
+                client.open_api_do("POST", "", json={"name": "test"})
+            assert error.value.status_code == 503
+            assert server.request_counts["POST", ""] == default_config.max_retries + 1
+
+    def test_throttling(self):
+        with FakeServer(max_concurrency=0, retry_after=0) as server:
+            client = Client("Accesskey-fake", server.url)
+            with pytest.raises(GASResponseError) as error:
+                client.open_api_do("GET", "", params={"offset": 0, "limit": 128})
+            assert error.value.status_code == 429
+            assert error.value.response.headers["Retry-After"] == "0"
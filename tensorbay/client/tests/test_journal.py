@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import ulid
+
+from ..journal import UploadedFrames, UploadJournal, get_frame_key
+
+
+class TestUploadJournal:
+    def test_record_and_load(self, tmp_path):
+        with UploadJournal("dataset_id", "train", str(tmp_path)) as journal:
+            assert journal.load() == set()
+            journal.record(["a.png", "dir/b\nc.png"])
+            journal.record([])
+            journal.record(["d.png"])
+
+        assert UploadJournal("dataset_id", "train", str(tmp_path)).load() == {
+            "a.png",
+            "dir/b\nc.png",
+            "d.png",
+        }
+        assert UploadJournal("dataset_id", "test", str(tmp_path)).load() == set()
+
+    def test_partial_line(self, tmp_path):
+        journal = UploadJournal("dataset_id", "train", str(tmp_path))
+        journal.record(["a.png"])
+        journal.close()
+        with open(journal.path, "ab") as fp:
+            fp.write(b'"b.pn')
+
+        assert journal.load() == {"a.png"}
+
+        journal.record(["c.png"])
+        journal.close()
+        assert journal.load() == {"a.png", "c.png"}
+
+    def test_remove(self, tmp_path):
+        journal = UploadJournal("dataset_id", "train", str(tmp_path))
+        journal.record(["a.png"])
+        assert journal.exists()
+        journal.remove()
+        assert not journal.exists()
+        assert journal.load() == set()
+        journal.remove()
+
+
+class TestUploadedFrames:
+    def test_uploaded_frames(self, tmp_path):
+        frame_id = str(ulid.from_timestamp(20))
+        journal = UploadJournal("dataset_id", "train", str(tmp_path))
+        journal.record([get_frame_key(frame_id, "lidar"), get_frame_key("frame/0", "camera")])
+
+        uploaded = UploadedFrames.from_journal(journal)
+        assert len(uploaded) == 2
+        assert uploaded.contains(frame_id, "lidar")
+        assert not uploaded.contains(frame_id, "camera")
+        assert uploaded.contains("frame", "0/camera")
+        assert uploaded.get_frame_id(20) == frame_id
+        assert uploaded.get_frame_id(30) is None
+        assert sorted(uploaded.keys()) == sorted(journal.load())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import pytest
+
+from ...dataset import Segment
+from ..lazy import PagingList
+
+
+class _Pages:
+    def __init__(self, total_count, max_limit=None):
+        self.requests = []
+        self._total_count = total_count
+        self._max_limit = max_limit
+
+    def request(self, offset, limit):
+        self.requests.append(offset)
+        if self._max_limit:
+            limit = min(limit, self._max_limit)
+        items = list(range(offset, min(offset + limit, self._total_count)))
+        return {"items": items, "recordSize": len(items), "totalCount": self._total_count}
+
+    def paging_list(self, **kwargs):
+        return PagingList(
+            self.request, "items", lambda items: [str(item) for item in items], **kwargs
+        )
+
+
+class _SegmentClient:
+    def __init__(self, pages):
+        self._pages = pages
+
+    def get_paging_data(self):
+        return self._pages.paging_list(page_size=10)
+
+
+class _DatasetClient:
+    def __init__(self, pages):
+        self._pages = pages
+
+    def get_segment(self, name):
+        return _SegmentClient(self._pages)
+
+
+class TestPagingList:
+    def test_random_access(self):
+        pages = _Pages(1000)
+        paging_list = pages.paging_list(page_size=100, max_cached_pages=2)
+
+        assert paging_list[123] == "123"
+        assert pages.requests == [100]
+        assert paging_list[150] == "150"
+        assert len(paging_list) == 1000
+        assert pages.requests == [100]
+
+        assert paging_list[-1] == "999"
+        assert paging_list[250:253] == ["250", "251", "252"]
+        assert pages.requests == [100, 900, 200]
+
+        # The least recently used page is evicted.
+        assert paging_list[101] == "101"
+        assert pages.requests == [100, 900, 200, 100]
+
+        with pytest.raises(IndexError):
+            paging_list[1000]
+        with pytest.raises(IndexError):
+            paging_list[-1001]
+
+    def test_iteration(self):
+        pages = _Pages(250)
+        paging_list = pages.paging_list(page_size=100)
+        assert list(paging_list) == [str(index) for index in range(250)]
+        assert pages.requests == [0, 100, 200]
+
+        assert list(pages.paging_list(page_size=100)[:0]) == []
+        assert list(_Pages(0).paging_list()) == []
+
+    def test_capped_page_size(self):
+        pages = _Pages(300, max_limit=100)
+        paging_list = pages.paging_list(page_size=128)
+        assert paging_list[110] == "110"
+        assert pages.requests == [0, 100]
+        assert paging_list[299] == "299"
+        assert list(paging_list) == [str(index) for index in range(300)]
+
+    def test_modification(self):
+        pages = _Pages(25)
+        paging_list = pages.paging_list(page_size=10)
+        paging_list.append("25")
+        assert len(paging_list) == 26
+        assert paging_list[-1] == "25"
+
+        paging_list.sort(key=int, reverse=True)
+        assert paging_list[0] == "25"
+        del paging_list[0]
+        assert paging_list[0] == "24"
+        assert pages.requests == [0, 10, 20]
+
+    def test_segment(self):
+        pages = _Pages(100)
+        segment = Segment("test", _DatasetClient(pages))
+        assert pages.requests == []
+        assert segment[42] == "42"
+        assert pages.requests == [40]
+        assert len(segment) == 100
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import pytest
+
+from ..exceptions import GASResponseError
+from ..metrics import MetricsRegistry
+from ..requests import Client, default_config
+from .utility import LocalServer
+
+
+def _handle(method, path, query, headers, body):
+    if path.endswith("callback"):
+        return 503, {}, {}
+    if path.endswith("labels"):
+        return 200, {}, {"labels": [], "totalCount": 0}
+    return 200, {}, b"x" * 100
+
+
+class TestMetricsRegistry:
+    def test_client(self, monkeypatch):
+        monkeypatch.setattr(default_config, "backoff_factor", 0)
+        with LocalServer(_handle) as server:
+            client = Client("Accesskey-test", server.url)
+            client.open_api_do("GET", "labels", "dataset_id")
+            client.open_api_do("PUT", "labels", "dataset_id", json={"label": {}})
+            with pytest.raises(GASResponseError):
+                client.open_api_do("POST", "callback", "dataset_id", json={})
+            client.do("GET", f"{server.url}object")
+
+        snapshot = client.metrics.snapshot()
+        assert list(snapshot) == ["GET (external)", "GET labels", "POST callback", "PUT labels"]
+        assert snapshot["GET labels"]["statusCodes"] == {"200": 1}
+        assert snapshot["GET labels"]["bytesReceived"] > 0
+        assert snapshot["PUT labels"]["bytesSent"] == len(b'{"label":{}}')
+        assert snapshot["POST callback"]["statusCodes"] == {"503": 1}
+        assert snapshot["POST callback"]["retries"] == default_config.max_retries
+        assert snapshot["GET (external)"]["bytesReceived"] == 100
+        assert snapshot["GET (external)"]["latencyBuckets"][-1] == (None, 1)
+
+    def test_prometheus(self):
+        registry = MetricsRegistry(buckets=(0.1, 1))
+        registry.record("GET", "labels", "200", 0.05, bytes_received=10)
+        registry.record("GET", "labels", "500", 0.5, retries=2)
+        registry.record("POST", 'a"b', "error", 5)
+
+        lines = registry.to_prometheus().splitlines()
+        assert (
+            'tensorbay_client_requests_total{method="GET",section="labels",status="200"} 1' in lines
+        )
+        assert (
+            'tensorbay_client_requests_total{method="POST",section="a\\"b",status="error"} 1'
+            in lines
+        )
+        name = "tensorbay_client_request_duration_seconds"
+        labels = 'method="GET",section="labels"'
+        assert f'{name}_bucket{{{labels},le="0.1"}} 1' in lines
+        assert f'{name}_bucket{{{labels},le="1.0"}} 2' in lines
+        assert f'{name}_bucket{{{labels},le="+Inf"}} 2' in lines
+        assert f"{name}_count{{{labels}}} 2" in lines
+        assert 'tensorbay_client_retries_total{method="GET",section="labels"} 2' in lines
+        assert 'tensorbay_client_received_bytes_total{method="GET",section="labels"} 10' in lines
+
+        registry.clear()
+        assert registry.snapshot() == {}
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import hashlib
+
+import pytest
+
+from ..exceptions import GASResponseError
+from ..fake import FakeServer
+from ..gas import GAS
+from ..multipart import MultipartUploader
+from ..requests import default_config
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    content = bytes(range(256)) * 41
+    path = tmp_path / "lidar.bin"
+    path.write_bytes(content)
+    return str(path), content
+
+
+def _etag(content, part_size):
+    parts = [content[index : index + part_size] for index in range(0, len(content), part_size)]
+    digests = b"".join(hashlib.md5(part).digest() for part in parts)
+    return f"{hashlib.md5(digests).hexdigest()}-{len(parts)}"
+
+
+class TestMultipartUploader:
+    def test_upload(self, local_file, monkeypatch):
+        local_path, content = local_file
+        monkeypatch.setattr(default_config, "backoff_factor", 0)
+        monkeypatch.setattr(default_config, "max_retries", 10)
+        with FakeServer(object_error_rate=0.2, error_status=503, seed=1) as server:
+            dataset_client = GAS("Accesskey-fake", server.url).create_dataset("test")
+            segment_client = dataset_client.get_or_create_segment("train")
+            uploader = MultipartUploader(
+                segment_client._client, dataset_client.dataset_id, "train", part_size=1000, jobs=4
+            )
+            key, version_id, etag = uploader.upload(local_path, "lidar.bin")
+
+            assert key.endswith("/lidar.bin")
+            assert version_id
+            assert etag == _etag(content, 1000)
+            assert server._objects[key] == (content, etag)
+            assert server.request_counts["PUT", "(object)"] > 11
+            assert not server._uploads
+
+    def test_abort(self, local_file, monkeypatch):
+        local_path, _ = local_file
+        monkeypatch.setattr(default_config, "backoff_factor", 0)
+        with FakeServer(object_error_rate=1, error_status=503) as server:
+            dataset_client = GAS("Accesskey-fake", server.url).create_dataset("test")
+            segment_client = dataset_client.get_or_create_segment("train")
+            uploader = MultipartUploader(
+                segment_client._client, dataset_client.dataset_id, "train", part_size=1000
+            )
+            with pytest.raises(GASResponseError):
+                uploader.upload(local_path, "lidar.bin")
+
+            assert server.request_counts["DELETE", "multipart/uploads"] == 1
+            assert not server._uploads
+            assert not server._objects
+
+    def test_segment_upload_file(self, local_file, monkeypatch):
+        local_path, content = local_file
+        monkeypatch.setattr(default_config, "multipart_threshold", 1000)
+        monkeypatch.setattr(default_config, "part_size", 4096)
+        with FakeServer() as server:
+            segment_client = (
+                GAS("Accesskey-fake", server.url)
+                .create_dataset("test")
+                .get_or_create_segment("train")
+            )
+            segment_client.upload_file(local_path, "sweeps/lidar.bin")
+
+            assert server.request_counts["POST", "multipart/complete"] == 1
+            assert server.request_counts["PUT", "callback"] == 1
+            data = next(segment_client.list_data())
+            assert data.path == "sweeps/lidar.bin"
+            assert data.open().read() == content
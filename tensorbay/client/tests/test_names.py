@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import json
+
+import pytest
+
+from ..exceptions import GASDatasetError
+from ..gas import GAS
+from ..names import DatasetNameCache
+from .utility import LocalServer
+
+
+class _DatasetServer:
+    def __init__(self):
+        self.requests = []
+        self._datasets = {"existing": {"id": "existing_id", "type": 1}}
+
+    def handle(self, method, path, query, headers, body):
+        dataset_id = path.split("/datasets", 1)[-1].strip("/")
+        self.requests.append(method)
+
+        if method == "GET":
+            name = query["name"][0]
+            datasets = [{"name": name, **self._datasets[name]}] if name in self._datasets else []
+            return (
+                200,
+                {},
+                {
+                    "datasets": datasets,
+                    "offset": 0,
+                    "recordSize": len(datasets),
+                    "totalCount": len(datasets),
+                },
+            )
+
+        if method == "POST":
+            contents = json.loads(body)
+            self._datasets[contents["name"]] = {"id": f"{contents['name']}_id", "type": 0}
+            return 200, {}, {"id": f"{contents['name']}_id"}
+
+        name = next(key for key, value in self._datasets.items() if value["id"] == dataset_id)
+        dataset = self._datasets.pop(name)
+        if method == "PATCH":
+            self._datasets[json.loads(body)["name"]] = dataset
+        return 200, {}, {}
+
+
+class TestDatasetNameCache:
+    def test_gas(self):
+        stub = _DatasetServer()
+        with LocalServer(stub.handle) as server:
+            gas = GAS("Accesskey-test", server.url)
+            assert gas.get_dataset("existing", True).dataset_id == "existing_id"
+            assert gas.get_dataset("existing", True).dataset_id == "existing_id"
+            assert stub.requests == ["GET"]
+
+            gas.create_dataset("new")
+            gas.rename_dataset("new", "renamed")
+            assert gas.get_dataset("renamed").dataset_id == "new_id"
+            gas.delete_dataset("renamed")
+            assert stub.requests == ["GET", "POST", "PATCH", "DELETE"]
+
+            with pytest.raises(GASDatasetError):
+                gas.get_dataset("renamed")
+            with pytest.raises(GASDatasetError):
+                gas.get_dataset("new")
+
+    def test_persistence(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        cache = DatasetNameCache(path)
+        cache.set("namespace", "test", "test_id", False)
+        cache.set("other_namespace", "test", "other_id", True)
+
+        # Another process sees the entries written into the cache file.
+        other_cache = DatasetNameCache(path)
+        assert other_cache.get("namespace", "test") == ("test_id", False)
+        assert other_cache.get("other_namespace", "test") == ("other_id", True)
+        other_cache.remove("namespace", "test")
+        assert DatasetNameCache(path).get("namespace", "test") is None
+
+        expired_cache = DatasetNameCache(path, ttl=0)
+        expired_cache.set("namespace", "expired", "expired_id", False)
+        assert expired_cache.get("namespace", "expired") is None
+
+        with open(path, "w") as fp:
+            fp.write("broken")
+        assert DatasetNameCache(path).get("namespace", "test") is None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import json
+import threading
+import time
+
+import pytest
+
+from ..permission import Permission, PermissionManager
+
+
+class _Response:
+    def __init__(self, contents):
+        self.content = json.dumps(contents).encode()
+
+
+class _PolicyClient:
+    def __init__(self, expired_in):
+        self.params = []
+        self.fetched = threading.Event()
+        self._expired_in = expired_in
+
+    def open_api_do(self, method, section, dataset_id="", **kwargs):
+        assert (method, section) == ("GET", "policies")
+        self.params.append(kwargs["params"])
+        self.fetched.set()
+        return _Response(
+            {
+                "result": {"policy": str(len(self.params)), "x:category": "", "x:id": ""},
+                "extra": {"host": "https://host", "objectPrefix": "prefix/"},
+                "expireAt": time.time() + self._expired_in,
+            }
+        )
+
+
+class TestPermission:
+    def test_get_post_data(self):
+        permission = Permission(
+            {
+                "result": {"policy": "1", "x:category": "", "x:id": ""},
+                "extra": {"host": "https://host", "objectPrefix": "prefix/"},
+                "expireAt": 0,
+            }
+        )
+        assert permission.host == "https://host"
+        assert permission.get_post_data("a.png") == {"policy": "1", "key": "prefix/a.png"}
+        assert dict(permission.result) == {"policy": "1"}
+        with pytest.raises(TypeError):
+            permission.result["policy"] = "2"
+
+
+class TestPermissionManager:
+    def test_cache(self):
+        client = _PolicyClient(expired_in=240)
+        manager = PermissionManager(client, "dataset_id")
+        permission = manager.get("train")
+        assert manager.get("train") is permission
+        assert manager.get("test") is not permission
+        assert [params["segmentName"] for params in client.params] == ["train", "test"]
+
+        manager.invalidate(permission)
+        assert manager.get("train") is not permission
+        assert len(client.params) == 3
+
+    def test_refresh_ahead(self):
+        client = _PolicyClient(expired_in=30)
+        manager = PermissionManager(client, "dataset_id")
+        permission = manager.get("train")
+        client.fetched.clear()
+
+        assert manager.get("train") is permission
+        assert client.fetched.wait(5)
+        for _ in range(100):
+            if manager.get("train") is not permission:
+                break
+            time.sleep(0.01)
+        assert manager.get("train").result["policy"] != "1"
+
+    def test_shared(self):
+        client = _PolicyClient(expired_in=240)
+        manager = PermissionManager(client, "dataset_id", shared=True)
+        permission = manager.get("train")
+        assert manager.get("test") is permission
+        assert client.params == [{"expired": 240}]
+
+        manager.discard("test")
+        assert manager.get("train") is not permission
+        assert len(client.params) == 2
+
+    def test_discard(self):
+        client = _PolicyClient(expired_in=240)
+        manager = PermissionManager(client, "dataset_id")
+        permission = manager.get("train")
+        manager.discard("test")
+        assert manager.get("train") is permission
+        manager.discard("train")
+        assert manager.get("train") is not permission
+        assert client.params == [{"expired": 240, "segmentName": "train"}] * 2
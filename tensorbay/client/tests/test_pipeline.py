@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import threading
+
+import pytest
+
+from ...dataset import Data, Dataset, Frame, FusionDataset
+from ...label import Classification
+from ...sensor import Lidar
+from ..fake import FakeServer
+from ..gas import GAS
+from ..pipeline import Pipeline, Stage, UploadPipelineConfig
+
+
+class TestPipeline:
+    def test_run(self):
+        results = []
+        lock = threading.Lock()
+
+        def _double(item):
+            item["value"] *= 2
+
+        def _collect(items):
+            with lock:
+                results.append([item["value"] for item in items])
+
+        pipeline = Pipeline(
+            [
+                Stage("double", _double, jobs=4, queue_size=2),
+                Stage("collect", _collect, batch_size=10, interval=10),
+            ]
+        )
+        summary = pipeline.run({"value": index} for index in range(25))
+
+        assert summary.succeeded == 25
+        assert sorted(value for batch in results for value in batch) == list(range(0, 50, 2))
+        assert all(len(batch) <= 10 for batch in results)
+
+        stats = pipeline.stats()
+        assert stats["double"]["processed"] == 25
+        assert stats["double"]["jobs"] == 4
+        assert stats["double"]["maxQueueDepth"] <= 2
+        assert stats["collect"]["processed"] == 25
+        assert stats["collect"]["queueDepth"] == 0
+
+    def test_failures(self):
+        def _check(item):
+            if item % 3 == 0:
+                raise ValueError(item)
+
+        pipeline = Pipeline([Stage("check", _check, jobs=2), Stage("pass", lambda _: None)])
+        summary = pipeline.run(range(10), fail_fast=False)
+        assert summary.succeeded == 6
+        assert sorted(item for item, _ in summary.failures) == [0, 3, 6, 9]
+        assert pipeline.stats()["check"]["failed"] == 4
+
+        with pytest.raises(ValueError):
+            pipeline.run(range(1000))
+
+    def test_interrupt(self):
+        def _interrupt(item):
+            if item == 3:
+                raise KeyboardInterrupt
+
+        pipeline = Pipeline([Stage("interrupt", _interrupt, jobs=2, queue_size=2)])
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.run(range(1000), fail_fast=False)
+
+        def _items():
+            yield from range(5)
+            raise ValueError
+
+        pipeline = Pipeline([Stage("pass", lambda _: None, queue_size=2)])
+        with pytest.raises(ValueError):
+            pipeline.run(_items(), fail_fast=False)
+
+
+class TestUploadPipeline:
+    def test_upload_segment(self, tmp_path):
+        dataset = Dataset("test")
+        segment = dataset.create_segment("train")
+        for index in range(50):
+            local_path = tmp_path / f"{index:02}.png"
+            local_path.write_bytes(b"png" * index)
+            data = Data(str(local_path))
+            data.label.classification = Classification(str(index))
+            segment.append(data)
+
+        config = UploadPipelineConfig(transfer_jobs=4, batch_size=16, max_read_size=64)
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url)
+            dataset_client = gas.create_dataset("test")
+            segment_client = dataset_client.upload_segment(segment, pipeline=config)
+
+            data = list(segment_client.list_data())
+            assert [single_data.path for single_data in data] == [
+                f"{index:02}.png" for index in range(50)
+            ]
+            assert data[49].label.classification.category == "49"
+            assert data[49].open().read() == b"png" * 49
+            assert server.request_counts["PUT", "callback"] == 0
+            assert server.request_counts["PUT", "labels"] == 0
+
+        assert set(config.stats) == {"prepare", "transfer", "callback", "label"}
+        assert all(stats["processed"] == 50 for stats in config.stats.values())
+
+    def test_upload_fusion_segment(self, tmp_path):
+        dataset = FusionDataset("fusion")
+        segment = dataset.create_segment("train")
+        segment.sensors.add(Lidar("lidar"))
+        segment.sensors.add(Lidar("lidar2"))
+        for index in range(10):
+            frame = Frame()
+            for sensor_name in ("lidar", "lidar2"):
+                local_path = tmp_path / f"{sensor_name}_{index}.bin"
+                local_path.write_bytes(b"bin" * index)
+                frame[sensor_name] = Data(str(local_path))
+            segment.append(frame)
+
+        config = UploadPipelineConfig(transfer_jobs=4)
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url)
+            dataset_client = gas.create_dataset("fusion", is_fusion=True)
+            segment_client = dataset_client.upload_segment(segment, pipeline=config)
+
+            frames = list(segment_client.list_frames())
+            assert len(frames) == 10
+            assert frames[3]["lidar2"].path == "lidar2_3.bin"
+            assert frames[3]["lidar2"].open().read() == b"bin" * 3
+
+        assert config.stats["transfer"]["processed"] == 20
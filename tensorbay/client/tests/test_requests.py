@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import gzip
+import json
+import mmap
+import threading
+from array import array
+
+import pytest
+
+from ...utility import get_json_codec, json_loads, set_json_codec
+from ..requests import (
+    Client,
+    _get_body_size,
+    default_config,
+    multithread_upload,
+    paging_list,
+    paging_range,
+)
+from .utility import LocalServer
+
+
+def _tracked_arguments(count, consumed):
+    for index in range(count):
+        consumed.append(index)
+        yield index
+
+
+def _request_getter(total, requested, max_limit=None):
+    def _request(offset, limit):
+        requested.append(offset)
+        if max_limit:
+            limit = min(limit, max_limit)
+        items = list(range(offset, min(offset + limit, total)))
+        return {"items": items, "offset": offset, "recordSize": len(items), "totalCount": total}
+
+    return _request
+
+
+def test_paging_range():
+    assert list(paging_range(0, 10, 3)) == [(0, 3), (3, 3), (6, 3), (9, 1)]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_paging_list(jobs):
+    requested = []
+    request = _request_getter(1000, requested)
+    assert list(paging_list(request, "items", page_size=7, jobs=jobs)) == list(range(1000))
+    assert sorted(requested) == list(range(0, 1000, 7))
+
+    requested.clear()
+    items = paging_list(request, "items", start=10, stop=100, page_size=7, jobs=jobs)
+    assert list(items) == list(range(10, 100))
+    assert sorted(requested) == list(range(10, 100, 7))
+
+    requested.clear()
+    assert list(paging_list(request, "items", start=1000, page_size=7, jobs=jobs)) == []
+    assert requested == [1000]
+
+    requested.clear()
+    request = _request_getter(100, requested, max_limit=5)
+    assert list(paging_list(request, "items", page_size=7, jobs=jobs)) == list(range(100))
+    assert sorted(requested) == list(range(0, 100, 5))
+
+
+class TestMultithreadUpload:
+    def test_summary(self):
+        results = []
+        lock = threading.Lock()
+
+        def upload(argument):
+            with lock:
+                results.append(argument)
+
+        summary = multithread_upload(upload, range(100), jobs=4)
+        assert summary.succeeded == 100
+        assert summary.failures == []
+        assert bool(summary) == True
+        assert sorted(results) == list(range(100))
+
+    def test_bounded_in_flight(self):
+        consumed = []
+        finished = []
+        lock = threading.Lock()
+        max_pending = []
+
+        def upload(argument):
+            with lock:
+                max_pending.append(len(consumed) - len(finished))
+                finished.append(argument)
+
+        multithread_upload(upload, _tracked_arguments(50, consumed), jobs=2, max_in_flight=4)
+        assert len(finished) == 50
+        # The iterable is pulled one item ahead of the in-flight window.
+        assert max(max_pending) <= 5
+
+    def test_fail_fast(self):
+        consumed = []
+
+        def upload(argument):
+            if argument == 3:
+                raise ValueError(argument)
+
+        with pytest.raises(ValueError):
+            multithread_upload(upload, _tracked_arguments(10000, consumed), jobs=2)
+        assert len(consumed) < 10000
+
+    def test_collect_failures(self):
+        def upload(argument):
+            if argument % 10 == 0:
+                raise ValueError(argument)
+
+        summary = multithread_upload(upload, range(100), jobs=4, fail_fast=False)
+        assert summary.succeeded == 90
+        assert sorted(argument for argument, _ in summary.failures) == list(range(0, 100, 10))
+        assert all(isinstance(error, ValueError) for _, error in summary.failures)
+        assert bool(summary) == False
+
+
+@pytest.fixture(params=["stdlib", "orjson", "ujson"])
+def json_codec(request):
+    pytest.importorskip(request.param if request.param != "stdlib" else "json")
+    name = get_json_codec()
+    set_json_codec(request.param)
+    yield request.param
+    set_json_codec(name)
+
+
+def test_json_codec(json_codec):
+    def handle(method, path, query, headers, body):
+        if path.endswith("invalid"):
+            return 200, {"Content-Type": "application/json"}, b"{invalid"
+        assert headers["Content-Type"] == "application/json"
+        return 200, {}, {"echo": json.loads(body)}
+
+    contents = {"label": {"box2d": [{"box2d": {"xmin": 1.5}, "category": "\u732b/cat"}]}}
+    with LocalServer(handle) as server:
+        client = Client("Accesskey-test", server.url)
+        response = client.open_api_do("POST", "echo", "dataset_id", json=contents)
+        assert json_loads(response.content) == {"echo": contents}
+
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(client.open_api_do("GET", "invalid", "dataset_id").content)
+
+
+def test_get_body_size(tmp_path):
+    assert _get_body_size(None) == 0
+    assert _get_body_size(b"abcd") == 4
+    assert _get_body_size(bytearray(b"abcd")) == 4
+    assert _get_body_size(memoryview(array("i", range(4)))[1:]) == 3 * array("i").itemsize
+
+    path = tmp_path / "body"
+    path.write_bytes(b"x" * 10)
+    with open(path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert _get_body_size(mapped) == 10
+
+
+def test_compression(monkeypatch):
+    requests = []
+
+    def handle(method, path, query, headers, body):
+        encoding = headers.get("Content-Encoding")
+        requests.append(encoding)
+        if encoding == "deflate":
+            return 415, {"Accept-Encoding": "br, gzip;q=0.5"}, {}
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        return 200, {}, json.loads(body)
+
+    monkeypatch.setattr(default_config, "compression", "deflate")
+    monkeypatch.setattr(default_config, "compression_threshold", 1024)
+    monkeypatch.setattr(default_config, "max_retries", 0)
+    contents = {"keypoints2d": [{"x": 1.0, "y": 2.0, "v": 2}] * 1000}
+    with LocalServer(handle) as server:
+        client = Client("Accesskey-test", server.url)
+        assert client.open_api_do("PUT", "labels", "dataset_id", json=contents).json() == contents
+        assert client.open_api_do("PUT", "labels", "dataset_id", json=contents).json() == contents
+        assert client.open_api_do("PUT", "labels", "dataset_id", json={"small": 1}).json()
+
+    assert requests == ["deflate", "gzip", "gzip", None]
+    metrics = client.metrics.snapshot()["PUT labels"]
+    assert metrics["compressedRequests"] == 2
+    assert metrics["compressionSavedBytes"] > metrics["bytesSent"] * 5
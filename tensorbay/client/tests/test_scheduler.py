@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+
+import pytest
+
+from ...dataset import Data, Dataset, Frame, FusionDataset
+from ...sensor import Lidar
+from ..fake import FakeServer
+from ..gas import GAS
+from ..scheduler import UploadProgress, UploadScheduler
+
+
+def _make_scheduler(order, sizes, max_bytes_in_flight=None):
+    done = []
+    lock = threading.Lock()
+
+    def _do(argument):
+        with lock:
+            done.append(argument)
+
+    scheduler = UploadScheduler(order, max_bytes_in_flight=max_bytes_in_flight)
+    for segment_name, segment_sizes in sizes.items():
+        scheduler.add(
+            segment_name,
+            _do,
+            [(segment_name, size) for size in segment_sizes],
+            lambda argument: argument[1],
+        )
+    return scheduler, done
+
+
+class TestUploadScheduler:
+    @pytest.mark.parametrize(
+        "order, expected",
+        [
+            ("interleave", [("a", 1), ("b", 5), ("a", 2), ("b", 6), ("a", 3)]),
+            ("sequential", [("a", 1), ("a", 2), ("a", 3), ("b", 5), ("b", 6)]),
+            ("size", [("b", 6), ("b", 5), ("a", 3), ("a", 2), ("a", 1)]),
+        ],
+    )
+    def test_order(self, order, expected):
+        scheduler, done = _make_scheduler(order, {"a": [1, 2, 3], "b": [5, 6]})
+        summary = scheduler.run()
+        assert summary.succeeded == 5
+        assert done == expected
+        assert scheduler.progress.get_segment("b") == {"total": 2, "succeeded": 2, "failed": 0}
+        assert scheduler.progress.get_total() == {"total": 5, "succeeded": 5, "failed": 0}
+
+    def test_max_bytes_in_flight(self):
+        in_flight = []
+        peaks = []
+        done = []
+        lock = threading.Lock()
+
+        def _do(argument):
+            with lock:
+                in_flight.append(argument)
+                peaks.append(sum(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(argument)
+                done.append(argument)
+
+        scheduler = UploadScheduler("size", max_bytes_in_flight=10)
+        scheduler.add("a", _do, [1, 9], int)
+        scheduler.add("b", _do, [2, 1, 3, 8, 12], int)
+        summary = scheduler.run(jobs=4)
+
+        assert summary.succeeded == 7
+        assert done[0] == 12
+        assert max(peaks) == 12
+        assert max(peaks[1:]) <= 10
+
+    def test_size_gap(self):
+        scheduler, _ = _make_scheduler("size", {"a": [6, 5, 1, 1, 1, 1]}, 7)
+        works = scheduler._iter_work(ThreadPoolExecutor(2))
+        assert next(works)[2] == ("a", 6)
+        # Only the 1 byte left under the limit is filled while the 5 bytes work is waiting,
+        # which is submitted as soon as the first work is finished.
+        assert next(works)[2] == ("a", 1)
+        finished = threading.Timer(0.1, scheduler._do, [("a", lambda _: None, None, 6)])
+        finished.start()
+        assert next(works)[2] == ("a", 5)
+        finished.join()
+
+    @pytest.mark.parametrize("order", ["interleave", "sequential", "size"])
+    def test_context(self, order):
+        events = []
+        lock = threading.Lock()
+
+        def _context(segment_name):
+            @contextmanager
+            def _open():
+                with lock:
+                    events.append(("enter", segment_name))
+                yield
+                with lock:
+                    events.append(("exit", segment_name))
+
+            return _open
+
+        def _do(argument):
+            with lock:
+                events.append(argument)
+
+        scheduler = UploadScheduler(order)
+        for segment_name, count in (("a", 3), ("b", 2)):
+            scheduler.add(
+                segment_name,
+                _do,
+                zip(repeat(segment_name), range(count)),
+                lambda argument: argument[1],
+                total=count,
+                context=_context(segment_name),
+            )
+        assert scheduler.run(jobs=2).succeeded == 5
+
+        for segment_name, count in (("a", 3), ("b", 2)):
+            indexes = [index for index, event in enumerate(events) if event[0] == segment_name]
+            assert len(indexes) == count
+            assert events.count(("enter", segment_name)) == 1
+            assert events.index(("enter", segment_name)) < min(indexes)
+            assert events.index(("exit", segment_name)) > max(indexes)
+
+        if order == "sequential":
+            assert events.index(("exit", "a")) < events.index(("exit", "b"))
+
+        with pytest.raises(TypeError):
+            scheduler.add("c", _do, iter(()))
+
+    def test_failures(self):
+        updates = []
+
+        def _do(argument):
+            if argument % 2:
+                raise ValueError(argument)
+
+        scheduler = UploadScheduler(progress=UploadProgress(lambda name, _: updates.append(name)))
+        scheduler.add("a", _do, range(4))
+        scheduler.add("b", _do, range(3))
+        summary = scheduler.run(jobs=2, fail_fast=False)
+
+        assert summary.succeeded == 4
+        assert sorted((name, argument) for (name, _, argument, _), _ in summary.failures) == [
+            ("a", 1),
+            ("a", 3),
+            ("b", 1),
+        ]
+        assert scheduler.progress.get_segment("a") == {"total": 4, "succeeded": 2, "failed": 2}
+        assert sorted(updates) == ["a"] * 4 + ["b"] * 3
+
+        with pytest.raises(ValueError):
+            UploadScheduler("random")
+
+    @pytest.mark.parametrize("order", ["interleave", "size"])
+    def test_upload_dataset(self, tmp_path, order):
+        dataset = Dataset("test")
+        for segment_name, count in (("small", 2), ("large", 20)):
+            segment = dataset.create_segment(segment_name)
+            for index in range(count):
+                local_path = tmp_path / f"{segment_name}_{index:02}.bin"
+                local_path.write_bytes(b"bin" * index)
+                segment.append(Data(str(local_path)))
+
+        progress = UploadProgress()
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url)
+            gas.create_dataset("test")
+            dataset_client = gas.upload_dataset(
+                dataset, jobs=4, order=order, progress=progress, max_bytes_in_flight=64
+            )
+
+            assert server.request_counts["POST", "segments"] == 2
+            assert server.request_counts["POST", "(object)"] == 22
+            assert [data.path for data in dataset_client.get_segment("small").list_data()] == [
+                "small_00.bin",
+                "small_01.bin",
+            ]
+            assert len(list(dataset_client.get_segment("large").list_data())) == 20
+
+        assert progress.get_segment("small") == {"total": 2, "succeeded": 2, "failed": 0}
+        assert progress.get_total() == {"total": 22, "succeeded": 22, "failed": 0}
+
+    def test_upload_fusion_dataset(self, tmp_path):
+        dataset = FusionDataset("fusion")
+        for segment_name in ("train", "test"):
+            segment = dataset.create_segment(segment_name)
+            segment.sensors.add(Lidar("lidar"))
+            segment.sensors.add(Lidar("lidar2"))
+            for index in range(3):
+                frame = Frame()
+                for sensor_name in ("lidar", "lidar2"):
+                    local_path = tmp_path / f"{segment_name}_{sensor_name}_{index}.bin"
+                    local_path.write_bytes(b"bin")
+                    frame[sensor_name] = Data(str(local_path))
+                segment.append(frame)
+
+        progress = UploadProgress()
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url)
+            gas.create_dataset("fusion", is_fusion=True)
+            dataset_client = gas.upload_dataset(dataset, jobs=4, progress=progress)
+
+            frames = list(dataset_client.get_segment("test").list_frames())
+            assert len(frames) == 3
+            assert frames[2]["lidar2"].path == "test_lidar2_2.bin"
+
+            gas.upload_dataset(dataset, jobs=4, skip_uploaded_files=True)
+            assert server.request_counts["POST", "(object)"] == 12
+
+        assert progress.get_total() == {"total": 12, "succeeded": 12, "failed": 0}
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import pytest
+from requests.models import Response
+
+from ...dataset import Data, Frame
+from ...label import Classification
+from ..batch import BatchSynchronizer
+from ..exceptions import GASResponseError
+from ..fake import FakeServer
+from ..gas import GAS
+from ..journal import UploadJournal
+from ..permission import Permission
+from ..segment import SegmentClient
+
+
+class _RecordingClient:
+    def __init__(self, reject_sections=(), status_code=404):
+        self.requests = []
+        self._reject_sections = reject_sections
+        self._status_code = status_code
+
+    def open_api_do(self, method, section, dataset_id="", **kwargs):
+        self.requests.append((method, section, kwargs.get("json")))
+        if section in self._reject_sections:
+            response = Response()
+            response.status_code = self._status_code
+            raise GASResponseError(response)
+        return Response()
+
+
+class _PermissionManager:
+    def __init__(self):
+        self.discarded = []
+
+    def discard(self, segment_name):
+        self.discarded.append(segment_name)
+
+
+def _labeled_data(count, directory=None):
+    for index in range(count):
+        if directory:
+            local_path = directory / f"{index}.png"
+            local_path.write_bytes(b"png")
+            data = Data(str(local_path))
+        else:
+            data = Data(f"{index}.png")
+        data.label.classification = Classification(str(index))
+        yield data
+
+
+class TestSegmentClient:
+    def test_upload_labels(self):
+        client = _RecordingClient()
+        segment_client = SegmentClient("train", "dataset_id", "dataset", client)
+        segment_client.upload_labels(_labeled_data(300), batch_size=128, jobs=2)
+
+        assert [section for _, section, _ in client.requests] == ["multi/data/labels"] * 3
+        remote_paths = sorted(
+            label["remotePath"]
+            for _, _, put_data in client.requests
+            for label in put_data["objects"]
+        )
+        assert remote_paths == sorted(f"{index}.png" for index in range(300))
+
+    def test_upload_labels_fallback(self):
+        client = _RecordingClient(reject_sections=("multi/data/labels",))
+        segment_client = SegmentClient("train", "dataset_id", "dataset", client)
+        segment_client.upload_labels(_labeled_data(10), batch_size=4)
+
+        sections = [section for _, section, _ in client.requests]
+        assert sections == ["multi/data/labels"] + ["labels"] * 10
+        assert client.requests[1][2] == {
+            "segmentName": "train",
+            "remotePath": "0.png",
+            "label": {"CLASSIFICATION": {"category": "0"}},
+        }
+
+    def test_upload_labels_error(self):
+        client = _RecordingClient(reject_sections=("multi/data/labels",), status_code=503)
+        segment_client = SegmentClient("train", "dataset_id", "dataset", client)
+        for _ in range(2):
+            with pytest.raises(GASResponseError):
+                segment_client.upload_labels(_labeled_data(10), batch_size=10)
+
+        assert [section for _, section, _ in client.requests] == ["multi/data/labels"] * 2
+
+    def test_batch_labels(self):
+        client = _RecordingClient()
+        segment_client = SegmentClient("train", "dataset_id", "dataset", client)
+        segment_client.upload_file = lambda *_: None
+
+        with segment_client.batch_labels(batch_size=4):
+            for data in _labeled_data(6):
+                segment_client.upload_data(data)
+            assert len(client.requests) == 1
+
+        assert [len(put_data["objects"]) for _, _, put_data in client.requests] == [4, 2]
+
+        segment_client.upload_data(next(_labeled_data(1)))
+        assert client.requests[-1][1] == "labels"
+
+        with segment_client.batch_labels(batch_size=4):
+            with segment_client.batch_labels(batch_size=4):
+                segment_client.upload_data(next(_labeled_data(1)))
+            requests = len(client.requests)
+            segment_client.upload_data(next(_labeled_data(1)))
+            assert len(client.requests) == requests
+        assert len(client.requests) == requests + 1
+
+    def test_batch_callbacks(self, tmp_path):
+        client = _RecordingClient()
+        segment_client = SegmentClient("train", "dataset_id", "dataset", client)
+        segment_client._journal = UploadJournal("dataset_id", "train", str(tmp_path))
+        segment_client._permission_manager.get = lambda _: Permission(
+            {
+                "result": {"x:category": "", "x:id": ""},
+                "extra": {"host": "", "objectPrefix": "prefix/"},
+                "expireAt": 0,
+            }
+        )
+        segment_client._post_multipart_formdata = lambda *_: ("version", "etag")
+
+        with segment_client.batch_callbacks(batch_size=8, interval=10):
+            for data in _labeled_data(2, tmp_path):
+                segment_client.upload_data(data)
+            assert client.requests == []
+            assert segment_client._journal.load() == set()
+
+        assert [section for _, section, _ in client.requests] == [
+            "multi/callback",
+            "multi/data/labels",
+        ]
+        assert client.requests[0][2]["callbackBodies"][1] == {
+            "key": "prefix/1.png",
+            "versionId": "version",
+            "etag": "etag",
+        }
+        assert segment_client._journal.load() == {"0.png", "1.png"}
+
+        with segment_client.batch_callbacks(batch_size=8, interval=10):
+            with segment_client.batch_callbacks(batch_size=8, interval=10):
+                pass
+            segment_client.upload_data(next(_labeled_data(1, tmp_path)))
+            assert len(client.requests) == 2
+        assert len(client.requests) == 4
+
+    def test_batch_callbacks_error(self):
+        client = _RecordingClient(reject_sections=("multi/callback",), status_code=500)
+        synchronizer = BatchSynchronizer(client, "dataset_id", "train")
+        with pytest.raises(GASResponseError):
+            synchronizer.synchronize_upload_info([{"key": "0"}, {"key": "1"}])
+        assert synchronizer._multi_callback_supported
+
+    def test_callback_error(self):
+        client = _RecordingClient(reject_sections=("callback",), status_code=500)
+        manager = _PermissionManager()
+        segment_client = SegmentClient(
+            "train", "dataset_id", "dataset", client, permission_manager=manager
+        )
+        with pytest.raises(GASResponseError):
+            segment_client._synchronize_upload_info("key", "version", "etag")
+        assert manager.discarded == ["train"]
+
+
+def _frame(directory, index, sensor_count):
+    frame = Frame()
+    for sensor_index in range(sensor_count):
+        local_path = directory / f"{index}_{sensor_index}.bin"
+        local_path.write_bytes(b"bin" * sensor_index)
+        frame[f"sensor{sensor_index}"] = Data(str(local_path))
+    return frame
+
+
+class TestFusionSegmentClient:
+    def test_upload_frame(self, tmp_path):
+        with FakeServer(object_latency=0.05) as server:
+            gas = GAS("Accesskey-fake", server.url)
+            segment_client = gas.create_dataset("test", True).get_or_create_segment("train")
+            segment_client.upload_frame(_frame(tmp_path, 0, 12), 1, jobs=12)
+
+            frame = next(segment_client.list_frames())
+            assert len(frame) == 12
+            assert frame["sensor11"].open().read() == b"bin" * 11
+
+    def test_upload_frames(self, tmp_path):
+        frames = [(_frame(tmp_path, index, 3), index + 1) for index in range(10)]
+        (tmp_path / "4_1.bin").unlink()
+        with FakeServer() as server:
+            gas = GAS("Accesskey-fake", server.url)
+            segment_client = gas.create_dataset("test", True).get_or_create_segment("train")
+            summary = segment_client._upload_frames(frames, jobs=4, fail_fast=False)
+
+            assert summary.succeeded == 9
+            assert [frame for frame, _ in summary.failures] == [frames[4][0]]
+            assert isinstance(summary.failures[0][1], FileNotFoundError)
+            assert len(list(segment_client.list_frames())) == 10
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import pytest
+
+from ..dataset import DatasetClient, FusionDatasetClient
+from ..requests import Client
+from ..snapshot import MetadataSnapshot, make_page_request
+from .utility import LocalServer
+
+_CATALOG = {"CLASSIFICATION": {"categories": [{"name": "cat"}]}}
+_SENSORS = [{"name": "lidar", "type": "LIDAR"}]
+
+
+class _MetadataServer:
+    def __init__(self, is_fusion=False):
+        self.requests = []
+        self._is_fusion = is_fusion
+
+    @staticmethod
+    def _get_labels(segment_name):
+        return [
+            {"remotePath": f"{segment_name}/{index:04}.jpg", "label": {}} for index in range(300)
+        ]
+
+    def _get_frames(self, segment_name):
+        return [
+            {"frameId": f"frame{index}", "frame": [{"sensorName": "lidar", **label}]}
+            for index, label in enumerate(self._get_labels(segment_name))
+        ]
+
+    def handle(self, method, path, query, headers, body):
+        section = path.split("/datasets/dataset_id/", 1)[-1]
+        self.requests.append(section)
+        assert section == "labels/catalogs" or query["commit"] == ["commit_id"]
+
+        if section == "labels/catalogs":
+            return 200, {}, {"catalog": _CATALOG}
+        if section == "sensors":
+            return 200, {}, {"sensors": _SENSORS}
+
+        if section == "segments":
+            items = [{"name": "test0"}, {"name": "test1"}]
+        else:
+            segment_name = query["segmentName"][0]
+            get_items = self._get_frames if self._is_fusion else self._get_labels
+            items = get_items(segment_name)
+        offset, limit = int(query["offset"][0]), int(query["limit"][0])
+        return 200, {}, make_page_request(items, section)(offset, limit)
+
+
+class TestMetadataSnapshot:
+    def test_dataset(self, tmp_path):
+        path = str(tmp_path / "snapshot.json.gz")
+        stub = _MetadataServer()
+        with LocalServer(stub.handle) as server:
+            client = Client("Accesskey-test", server.url)
+            dataset_client = DatasetClient("test", "dataset_id", client, "commit_id")
+            assert dataset_client.save_snapshot(path, jobs=2) == path
+
+        assert stub.requests.count("labels") == 6
+        stub.requests.clear()
+
+        # The server is closed, all the metadata is served from the snapshot.
+        dataset_client = DatasetClient("test", "dataset_id", client, "commit_id")
+        dataset_client.load_snapshot(path)
+        assert list(dataset_client.list_segment_names()) == ["test0", "test1"]
+        assert dataset_client.get_catalog().dumps() == _CATALOG
+
+        segment_client = dataset_client.get_segment("test1")
+        paths = [data.path for data in segment_client.list_data()]
+        assert paths == [label["remotePath"] for label in stub._get_labels("test1")]
+        assert list(segment_client.list_data_paths(start=10, stop=12)) == [
+            "test1/0010.jpg",
+            "test1/0011.jpg",
+        ]
+        assert segment_client.get_paging_data()[200].path == "test1/0200.jpg"
+        assert stub.requests == []
+
+    def test_fusion_dataset(self, tmp_path):
+        path = str(tmp_path / "snapshot.json.gz")
+        stub = _MetadataServer(is_fusion=True)
+        with LocalServer(stub.handle) as server:
+            client = Client("Accesskey-test", server.url)
+            dataset_client = FusionDatasetClient("test", "dataset_id", client, "commit_id")
+            dataset_client.save_snapshot(path)
+
+        snapshot = MetadataSnapshot.load(path)
+        assert snapshot.segment_names == ["test0", "test1"]
+        assert snapshot.get_sensors("test0") == _SENSORS
+
+        stub.requests.clear()
+        dataset_client = FusionDatasetClient("test", "dataset_id", client, "commit_id")
+        dataset_client.load_snapshot(path)
+        segment_client = dataset_client.get_segment("test0")
+        assert [sensor.dumps() for sensor in segment_client.list_sensors()] == _SENSORS
+        frames = list(segment_client.list_frames())
+        assert len(frames) == 300
+        assert frames[299]["lidar"].path == "test0/0299.jpg"
+        assert stub.requests == []
+
+    def test_mismatch(self, tmp_path):
+        path = str(tmp_path / "snapshot.json.gz")
+        MetadataSnapshot("dataset_id", "commit_id", _CATALOG, {}).dump(path)
+
+        client = Client("Accesskey-test", "http://127.0.0.1/")
+        with pytest.raises(ValueError):
+            DatasetClient("test", "dataset_id", client, "other_commit_id").load_snapshot(path)
+        with pytest.raises(ValueError):
+            DatasetClient("test", "dataset_id", client).save_snapshot(path)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ..exceptions import GASResponseError
+from ..requests import Client
+from ..segment import SegmentClient
+from ..urls import URLResolver, _get_expire_at
+from .utility import LocalServer
+
+
+class _URLServer:
+    def __init__(self, multi_supported=True, delay=0, status_code=404, omitted=()):
+        self.requests = []
+        self._multi_supported = multi_supported
+        self._status_code = status_code
+        self._omitted = omitted
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, query, headers, body):
+        section = path.split("/datasets/dataset_id/", 1)[-1]
+        with self._lock:
+            self.requests.append(section)
+        time.sleep(self._delay)
+
+        if section == "labels":
+            offset, limit = int(query["offset"][0]), int(query["limit"][0])
+            paths = [f"{index:04}.jpg" for index in range(300)][offset : offset + limit]
+            labels = [{"remotePath": remote_path, "label": {}} for remote_path in paths]
+            return (
+                200,
+                {},
+                {"labels": labels, "offset": offset, "recordSize": len(labels), "totalCount": 300},
+            )
+
+        if section == "multi/data/urls":
+            if not self._multi_supported:
+                return self._status_code, {}, {}
+            remote_paths = [p for p in json.loads(body)["remotePaths"] if p not in self._omitted]
+            return 200, {}, {"urls": [{"remotePath": p, "url": f"url/{p}"} for p in remote_paths]}
+
+        return 200, {}, {"url": f"url/{query['remotePath'][0]}"}
+
+
+class TestURLResolver:
+    def test_bulk(self):
+        stub = _URLServer()
+        with LocalServer(stub.handle) as server:
+            segment_client = SegmentClient(
+                "test", "dataset_id", "dataset", Client("Accesskey-test", server.url)
+            )
+            for data in segment_client.list_data():
+                assert data.get_url() == f"url/{data.path}"
+                assert data.get_url() == f"url/{data.path}"
+
+        assert stub.requests.count("multi/data/urls") == 3
+        assert "data/urls" not in stub.requests
+
+    def test_fallback(self):
+        stub = _URLServer(multi_supported=False)
+        with LocalServer(stub.handle) as server:
+            resolver = URLResolver(Client("Accesskey-test", server.url), "dataset_id", "test")
+            resolver.register(["a", "b", "c"])
+            assert resolver.get_url("b") == "url/b"
+            assert resolver.get_url("a") == "url/a"
+            assert resolver.get_url("d") == "url/d"
+
+        assert stub.requests == [
+            "multi/data/urls",
+            "data/urls",
+            "data/urls",
+            "data/urls",
+            "data/urls",
+        ]
+
+    def test_fallback_error(self):
+        stub = _URLServer(multi_supported=False, status_code=500)
+        with LocalServer(stub.handle) as server:
+            resolver = URLResolver(Client("Accesskey-test", server.url), "dataset_id", "test")
+            resolver.register(["a", "b"])
+            with pytest.raises(GASResponseError):
+                resolver.get_url("a")
+
+        assert resolver._multi_supported
+        assert not resolver._resolving
+
+    def test_omitted(self):
+        stub = _URLServer(omitted=("b",))
+        with LocalServer(stub.handle) as server:
+            resolver = URLResolver(Client("Accesskey-test", server.url), "dataset_id", "test")
+            resolver.register(["a", "b", "c"])
+            assert resolver.get_url("b") == "url/b"
+            assert resolver.get_url("c") == "url/c"
+
+        assert stub.requests == ["multi/data/urls", "data/urls"]
+
+    def test_register_bounded(self):
+        resolver = URLResolver(
+            Client("Accesskey-test", "http://127.0.0.1/"), "dataset_id", "test", max_size=4
+        )
+        resolver.register(["a", "b", "c"])
+        resolver.register(["d", "e"])
+        assert list(resolver._groups) == ["b", "c", "d", "e"]
+
+    def test_dedup(self):
+        stub = _URLServer(delay=0.1)
+        with LocalServer(stub.handle) as server:
+            resolver = URLResolver(Client("Accesskey-test", server.url), "dataset_id", "test")
+            with ThreadPoolExecutor(8) as executor:
+                urls = list(executor.map(resolver.get_url, ["a"] * 8))
+
+        assert urls == ["url/a"] * 8
+        assert stub.requests == ["data/urls"]
+
+    def test_expiry(self):
+        assert _get_expire_at("https://oss/a.jpg?Expires=1620000000&Signature=x", 0) == 1620000000
+        assert (
+            _get_expire_at("https://s3/a.jpg?X-Amz-Date=20210503T000000Z&X-Amz-Expires=600", 0)
+            == 1620000600
+        )
+        assert _get_expire_at("https://s3/a.jpg?X-Amz-Expires=600", 100) == 700
+        assert _get_expire_at("https://host/a.jpg", 100) is None
+
+        resolver = URLResolver(Client("Accesskey-test", "http://127.0.0.1/"), "dataset_id", "test")
+        resolver._cache["a"] = ("url/a", time.time() + 30)
+        assert resolver._get_cached("a", time.time()) is None
+        resolver._cache["b"] = ("url/b", time.time() + 300)
+        assert resolver._get_cached("b", time.time()) == "url/b"
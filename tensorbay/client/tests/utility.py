@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Utilities for the client unittests."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+_Handle = Callable[[str, str, Dict[str, List[str]], Any, bytes], Tuple[int, Dict[str, str], Any]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, *_: Any) -> None:
+        pass
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        status_code, headers, content = self.server.handle_function(
+            self.command, url.path, parse_qs(url.query), self.headers, body
+        )
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode()
+            headers.setdefault("Content-Type", "application/json")
+
+        self.send_response(status_code)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_PUT = do_POST = do_DELETE = do_PATCH = _respond
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    handle_function: _Handle
+
+
+class LocalServer:
+    """A local HTTP server running in a background thread.
+
+    Arguments:
+        handle: The function which takes (method, path, query, headers, body) of the request
+            and returns (status_code, headers, content) of the response,
+            the content is dumped as json if it is not bytes.
+
+    """
+
+    def __init__(self, handle: _Handle) -> None:
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.handle_function = handle
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "LocalServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""Class URLResolver.
+
+:class:`URLResolver` resolves the signed URLs of the remote files in a segment.
+
+The remote paths listed together are registered as a group, and the first URL requested
+in a group resolves the URLs of the whole group in one request. The resolved URLs are cached
+until shortly before their signatures expire. Both the registered remote paths and the cached
+URLs are bounded, the oldest ones are dropped first.
+
+"""
+
+import logging
+import threading
+import time
+from calendar import timegm
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..utility import json_loads
+from .exceptions import GASResponseError
+from .requests import UNSUPPORTED_STATUS_CODES, Client
+
+logger = logging.getLogger(__name__)
+
+
+def _get_expire_at(url: str, now: float) -> Optional[float]:
+    """Get the expiration timestamp from the query of a signed URL.
+
+    Both the "Expires" of Aliyun OSS and the "X-Amz-Date" and "X-Amz-Expires" of AWS S3
+    are supported.
+
+    Arguments:
+        url: The signed URL.
+        now: The timestamp when the URL is got.
+
+    Returns:
+        The expiration timestamp, None if the URL does not contain it.
+
+    """
+    query = parse_qs(urlsplit(url).query)
+    try:
+        if "Expires" in query:
+            return float(query["Expires"][0])
+        if "X-Amz-Expires" in query:
+            signed_at = query.get("X-Amz-Date")
+            start = timegm(time.strptime(signed_at[0], "%Y%m%dT%H%M%SZ")) if signed_at else now
+            return start + float(query["X-Amz-Expires"][0])
+    except ValueError:
+        pass
+    return None
+
+
+class URLResolver:  # pylint: disable=too-many-instance-attributes
+    """This class defines :class:`URLResolver`.
+
+    Arguments:
+        client: The client used for sending request to TensorBay.
+        dataset_id: Dataset ID.
+        segment_name: Segment name.
+        batch_size: The max number of the URLs resolved in one request.
+        max_size: The max number of the cached URLs and the registered remote paths.
+
+    """
+
+    _EXPIRE_MARGIN_IN_SECOND = 60
+    _DEFAULT_TTL_IN_SECOND = 240
+
+    def __init__(
+        self,
+        client: Client,
+        dataset_id: str,
+        segment_name: str,
+        *,
+        batch_size: int = 128,
+        max_size: int = 4096,
+    ) -> None:
+        self._client = client
+        self._dataset_id = dataset_id
+        self._segment_name = segment_name
+        self._batch_size = batch_size
+        self._max_size = max_size
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._groups: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._resolving: Dict[str, threading.Event] = {}
+        self._multi_supported = True
+
+    def _request_url(self, remote_path: str) -> str:
+        params = {"segmentName": self._segment_name, "remotePath": remote_path}
+        response = self._client.open_api_do("GET", "data/urls", self._dataset_id, params=params)
+        return json_loads(response.content)["url"]  # type: ignore[no-any-return]
+
+    def _request_urls(self, remote_paths: List[str]) -> Dict[str, str]:
+        urls: Dict[str, str] = {}
+        if self._multi_supported and len(remote_paths) > 1:
+            post_data = {"segmentName": self._segment_name, "remotePaths": remote_paths}
+            try:
+                response = self._client.open_api_do(
+                    "POST", "multi/data/urls", self._dataset_id, json=post_data
+                )
+                urls = {
+                    item["remotePath"]: item["url"]
+                    for item in json_loads(response.content)["urls"]
+                }
+            except GASResponseError as error:
+                if error.status_code not in UNSUPPORTED_STATUS_CODES:
+                    raise
+                logger.warning("Multi-URL request rejected, fall back to single ones: %s", error)
+                self._multi_supported = False
+
+        # The paths missing in the multi-URL response are requested one by one.
+        for remote_path in remote_paths:
+            if remote_path not in urls:
+                urls[remote_path] = self._request_url(remote_path)
+        return urls
+
+    def _get_cached(self, remote_path: str, now: float) -> Optional[str]:
+        cached = self._cache.get(remote_path)
+        if not cached:
+            return None
+
+        url, expire_at = cached
+        if expire_at - self._EXPIRE_MARGIN_IN_SECOND <= now:
+            del self._cache[remote_path]
+            return None
+
+        self._cache.move_to_end(remote_path)
+        return url
+
+    def _take_batch(self, remote_path: str, now: float) -> List[str]:
+        group = self._groups.pop(remote_path, [remote_path])
+        batch = [remote_path]
+        for path in group:
+            if len(batch) >= self._batch_size:
+                break
+            if path == remote_path or path in self._resolving:
+                continue
+            self._groups.pop(path, None)
+            if self._get_cached(path, now) is None:
+                batch.append(path)
+        return batch
+
+    def register(self, remote_paths: Iterable[str]) -> None:
+        """Register the remote paths whose URLs are resolved together.
+
+        Arguments:
+            remote_paths: The remote paths listed together, such as the paths in a page.
+
+        """
+        group = list(remote_paths)
+        with self._lock:
+            for remote_path in group:
+                self._groups[remote_path] = group
+                self._groups.move_to_end(remote_path)
+            while len(self._groups) > self._max_size:
+                self._groups.popitem(last=False)
+
+    def get_url(self, remote_path: str) -> str:
+        """Get the signed URL of a remote file.
+
+        Concurrent calls for the same remote path share one request.
+
+        Arguments:
+            remote_path: The remote path of the file.
+
+        Returns:
+            The signed URL of the file.
+
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                url = self._get_cached(remote_path, now)
+                if url:
+                    return url
+
+                event = self._resolving.get(remote_path)
+                if not event:
+                    event = threading.Event()
+                    batch = self._take_batch(remote_path, now)
+                    for path in batch:
+                        self._resolving[path] = event
+                    break
+
+            # Another thread is resolving the URL, take it from the cache after it is done,
+            # or resolve it again if that thread failed.
+            event.wait()
+
+        try:
+            urls = self._request_urls(batch)
+            now = time.time()
+            with self._lock:
+                for path, url in urls.items():
+                    expire_at = _get_expire_at(url, now)
+                    if expire_at is None:
+                        expire_at = now + self._DEFAULT_TTL_IN_SECOND
+                    self._cache[path] = (url, expire_at)
+                    self._cache.move_to_end(path)
+                while len(self._cache) > self._max_size:
+                    self._cache.popitem(last=False)
+        finally:
+            with self._lock:
+                for path in batch:
+                    del self._resolving[path]
+            event.set()
+
+        return urls[remote_path]
+
+    def clear(self) -> None:
+        """Clear the cached URLs and the registered remote paths."""
+        with self._lock:
+            self._cache.clear()
+            self._groups.clear()
@@ -15,7 +15,7 @@ all of which are stored in :attr:`Data.label`.
 
 import os
 from http.client import HTTPResponse
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Type, TypeVar, Union
 from urllib.request import urlopen
 
 from _io import BufferedReader
@@ -337,6 +337,8 @@ class RemoteData(DataBase):
         remote_path: The file remote path.
         timestamp: The timestamp for the file.
         url_getter: The url getter of the remote file.
+        opener: The function opening the remote file by its path,
+            which replaces opening the url got by ``url_getter``.
 
     Attributes:
         path: The file remote path.
@@ -349,15 +351,19 @@ class RemoteData(DataBase):
 
     _PATH_KEY = "remotePath"
 
+    _opener: Optional[Callable[[str], BinaryIO]] = None
+
     def __init__(
         self,
         remote_path: str,
         *,
         timestamp: Optional[float] = None,
         url_getter: Optional[Callable[[str], str]] = None,
+        opener: Optional[Callable[[str], BinaryIO]] = None,
     ) -> None:
         super().__init__(remote_path, timestamp=timestamp)
         self._url_getter = url_getter
+        self._opener = opener
 
     @classmethod
     def loads(cls: Type[_T], contents: Dict[str, Any]) -> _T:
@@ -403,15 +409,19 @@ class RemoteData(DataBase):
 
         return self._url_getter(self.path)
 
-    def open(self) -> HTTPResponse:
+    def open(self) -> Union[HTTPResponse, BinaryIO]:
         """Return the binary file pointer of this file.
 
-        The remote file pointer will be obtained by ``urllib.request.urlopen()``.
+        The remote file pointer will be obtained by ``urllib.request.urlopen()``,
+        unless the data is listed from a client with a content cache,
+        in which case the file pointer of the cached local file is returned.
 
         Returns:
-            The remote file pointer for this data.
+            The remote file pointer or the cached local file pointer for this data.
 
         """
+        if self._opener:
+            return self._opener(self.path)
         return urlopen(self.get_url())  # type: ignore[no-any-return]
 
     def dumps(self) -> Dict[str, Any]:
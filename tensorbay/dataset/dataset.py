@@ -20,11 +20,10 @@ It consists of a list of :class:`~tensorbay.dataset.segment.FusionSegment`.
 
 """
 
-import json
 from typing import Sequence, TypeVar, Union, overload
 
 from ..label import Catalog
-from ..utility import NameMixin, NameSortedList, ReprType
+from ..utility import NameMixin, NameSortedList, ReprType, json_loads
 from .segment import FusionSegment, Segment
 
 _T = TypeVar("_T", FusionSegment, Segment)
@@ -94,8 +93,8 @@ class DatasetBase(NameMixin, Sequence[_T]):  # pylint: disable=too-many-ancestor
             filepath: The path of the json file which contains the catalog information.
 
         """
-        with open(filepath, "r") as fp:
-            contents = json.load(fp)
+        with open(filepath, "rb") as fp:
+            contents = json_loads(fp.read())
         self._catalog = Catalog.loads(contents)
 
     def get_segment_by_name(self, name: str) -> _T:
@@ -16,7 +16,7 @@ along with multiple :class:`~tensorbay.sensor.sensor.Sensor`.
 
 """
 
-from typing import TYPE_CHECKING, Any, Callable, List, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, TypeVar, Union
 
 from ..sensor import Sensor
 from ..utility import NameMixin, NameSortedDict, ReprType, UserMutableSequence
@@ -25,6 +25,7 @@ from .frame import Frame
 
 if TYPE_CHECKING:
     from ..client.dataset import DatasetClient, FusionDatasetClient
+    from ..client.lazy import PagingList
 
 
 class Segment(NameMixin, UserMutableSequence["DataBase._Type"]):
@@ -61,10 +62,10 @@ class Segment(NameMixin, UserMutableSequence["DataBase._Type"]):
     def __init__(self, name: str = "", client: Optional["DatasetClient"] = None) -> None:
         super().__init__(name)
 
-        self._data: List[DataBase._Type]
+        self._data: Union[List[DataBase._Type], "PagingList[DataBase._Type]"]
         if client:
             self._client = client.get_segment(name)
-            self._data = list(self._client.list_data())
+            self._data = self._client.get_paging_data()  # type: ignore[assignment]
         else:
             self._data = []
 
@@ -132,10 +133,10 @@ class FusionSegment(NameMixin, UserMutableSequence[Frame]):
         super().__init__(name)
         self.sensors: NameSortedDict[Sensor] = NameSortedDict()
 
-        self._data: List[Frame]
+        self._data: Union[List[Frame], "PagingList[Frame]"]
         if client:
             self._client = client.get_segment(name)
-            self._data = list(self._client.list_frames())
+            self._data = self._client.get_paging_frames()
             for sensor in self._client.list_sensors():
                 self.sensors.add(sensor)
         else:
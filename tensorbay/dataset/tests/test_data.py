@@ -111,6 +111,12 @@ class TestRemoteData:
         with pytest.raises(ValueError):
             remote_data.get_url()
 
+    def test_open(self):
+        opened = []
+        remote_data = RemoteData("A/test.json", opener=opened.append)
+        remote_data.open()
+        assert opened == ["A/test.json"]
+
     def test_loads(self):
         data = RemoteData.loads(_REMOTE_DATA)
         assert data.path == _REMOTE_DATA["remotePath"]
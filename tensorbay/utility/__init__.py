@@ -5,6 +5,7 @@
 
 """Utility classes."""
 
+from .codec import get_json_codec, json_dumps, json_loads, set_json_codec
 from .loads import common_loads
 from .name import NameMixin, NameOrderedDict, NameSortedDict, NameSortedList
 from .repr import ReprMixin, ReprType, repr_config
@@ -31,4 +32,8 @@ __all__ = [
     "ReprType",
     "repr_config",
     "common_loads",
+    "get_json_codec",
+    "json_dumps",
+    "json_loads",
+    "set_json_codec",
 ]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+#
+# Copyright 2021 Graviti. Licensed under MIT License.
+#
+
+"""JSON codec methods.
+
+:meth:`json_loads` and :meth:`json_dumps` decode and encode JSON with the selected codec.
+The "stdlib" codec uses the builtin :mod:`json` module, the "orjson" and "ujson" codecs use
+the faster third-party packages, which are optional.
+
+The fastest installed codec is selected by default, and it can be changed by
+:meth:`set_json_codec`. All the codecs raise :class:`json.JSONDecodeError` for the invalid
+documents, and encode into UTF-8 bytes.
+
+"""
+
+import json
+from typing import Any, Callable, Dict, Tuple, Union
+
+_Loads = Callable[[Union[str, bytes]], Any]
+_Dumps = Callable[[Any], bytes]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+def _stdlib_codec() -> Tuple[_Loads, _Dumps]:
+    return json.loads, _stdlib_dumps
+
+
+def _orjson_codec() -> Tuple[_Loads, _Dumps]:
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)  # pylint: disable=no-member
+        except TypeError:
+            # orjson rejects the integers beyond 64 bits and the non-string keys.
+            return _stdlib_dumps(obj)
+
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError.
+    return orjson.loads, _dumps  # pylint: disable=no-member
+
+
+def _ujson_codec() -> Tuple[_Loads, _Dumps]:
+    import ujson  # pylint: disable=import-outside-toplevel
+
+    def _loads(document: Union[str, bytes]) -> Any:
+        try:
+            return ujson.loads(document)
+        except ValueError as error:
+            if isinstance(document, bytes):
+                document = document.decode("utf-8", "replace")
+            raise json.JSONDecodeError(str(error), document, 0) from error
+
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return ujson.dumps(  # type: ignore[no-any-return]
+                obj, ensure_ascii=False, escape_forward_slashes=False
+            ).encode("utf-8")
+        except (TypeError, OverflowError):
+            return _stdlib_dumps(obj)
+
+    return _loads, _dumps
+
+
+_CODECS: Dict[str, Callable[[], Tuple[_Loads, _Dumps]]] = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "stdlib": _stdlib_codec,
+}
+
+_codec_name = ""  # pylint: disable=invalid-name
+_loads: _Loads = json.loads
+_dumps: _Dumps = _stdlib_dumps
+
+
+def set_json_codec(name: str = "auto") -> None:
+    """Select the JSON codec.
+
+    Arguments:
+        name: The name of the codec, "stdlib", "orjson" or "ujson",
+            "auto" for the fastest installed one.
+
+    Raises:
+        ValueError: When the codec name is not supported.
+        ImportError: When the package of the required codec is not installed.
+
+    """
+    global _codec_name, _loads, _dumps  # pylint: disable=global-statement, invalid-name
+
+    if name == "auto":
+        for codec_name, get_codec in _CODECS.items():
+            try:
+                _loads, _dumps = get_codec()
+            except ImportError:
+                continue
+            _codec_name = codec_name
+            return
+
+    if name not in _CODECS:
+        raise ValueError(f'Unsupported JSON codec "{name}"')
+
+    try:
+        _loads, _dumps = _CODECS[name]()
+    except ImportError as error:
+        raise ImportError(f'The package of the JSON codec "{name}" is not installed') from error
+    _codec_name = name
+
+
+def get_json_codec() -> str:
+    """Get the name of the selected JSON codec.
+
+    Returns:
+        The name of the selected JSON codec.
+
+    """
+    return _codec_name
+
+
+def json_loads(document: Union[str, bytes]) -> Any:
+    """Decode a JSON document with the selected codec.
+
+    Arguments:
+        document: The JSON document.
+
+    Returns:
+        The decoded object.
+
+    """
+    return _loads(document)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode an object into a JSON document with the selected codec.
+
+    Arguments:
+        obj: The object to be encoded.
+
+    Returns:
+        The UTF-8 encoded JSON document.
+
+    """
+    return _dumps(obj)
+
+
+set_json_codec()